@@ -3,6 +3,8 @@ Configuration Management
 Pydantic settings for environment variables
 """
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
 
@@ -26,6 +28,21 @@ class Settings(BaseSettings):
     # Vector Database
     qdrant_host: str = "localhost"
     qdrant_port: int = 6333
+    qdrant_grpc_port: int = 6334
+    qdrant_prefer_grpc: bool = False  # gRPC is cheaper than REST for large vectors
+    qdrant_timeout_seconds: int = 10
+    # Collection or alias to use (migrate_dimensions.py creates <name>_live on first migration)
+    qdrant_collection: str = "events"
+    qdrant_upsert_batch_size: int = 256
+    # Search-time HNSW beam width (None = Qdrant default, ef_construct); exact = brute force
+    qdrant_hnsw_ef: Optional[int] = None
+    qdrant_exact_search: bool = False
+    # Storage for a collection the gateway creates: quantization none | scalar | binary,
+    # float32 originals on disk. Quantized searches rescore against the originals.
+    qdrant_quantization: str = "none"
+    qdrant_vectors_on_disk: bool = False
+    qdrant_quantization_rescore: bool = True
+    qdrant_quantization_oversampling: float = 2.0
 
     @property
     def qdrant_url(self) -> str:
@@ -36,6 +53,9 @@ class Settings(BaseSettings):
     valkey_host: str = "localhost"
     valkey_port: int = 6379
     valkey_db: int = 0
+    valkey_codec: str = "orjson"  # json | orjson | msgpack
+    valkey_compression: str = "zstd"  # none | zstd | zlib
+    valkey_compress_min_bytes: int = 1024
 
     # External APIs
     openrouter_api_key: str = ""
@@ -43,12 +63,109 @@ class Settings(BaseSettings):
     langfuse_public_key: str = ""
     langfuse_secret_key: str = ""
 
+    # Embeddings (OpenRouter, OpenAI-compatible API)
+    embedding_provider: str = "openrouter"  # openrouter (remote API) | local (CPU model)
+    embedding_api_url: str = "https://openrouter.ai/api/v1"
+    embedding_model: str = "openai/text-embedding-3-small"
+    # Shortened (Matryoshka) output size, e.g. 512 or 256; None = model default (1536).
+    # Must match the Qdrant collection (see qdrant/migrate_dimensions.py)
+    embedding_dimensions: Optional[int] = None
+    embedding_timeout_seconds: float = 30.0
+    embedding_max_connections: int = 20
+    embedding_batch_window_ms: float = 5.0  # 0 disables micro-batching
+    embedding_max_batch_size: int = 64
+    embedding_cache_size: int = 2048  # in-process LRU entries (0 disables)
+    embedding_cache_ttl: int = 604800  # Valkey tier TTL (7 days)
+    # Local provider: sentence-transformers model name or path (pre-download for offline use)
+    local_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    local_embedding_backend: str = "torch"  # torch | onnx | openvino
+    local_embedding_workers: int = 1  # inference threads (each batch already uses all cores)
+
     # Zep Cloud (Long-term Memory)
     zep_api_key: str = ""
     zep_project_id: str = ""
     zep_memory_enabled: bool = True
     zep_memory_url: str = "https://api.zep.com"
 
+    # /remember per-layer write timeouts (seconds)
+    remember_zep_timeout_seconds: float = 10.0
+    remember_qdrant_timeout_seconds: float = 15.0
+    remember_valkey_timeout_seconds: float = 2.0
+    remember_pgvector_timeout_seconds: float = 5.0
+
+    # /remember/batch
+    remember_batch_max_items: int = 500
+    remember_batch_timeout_seconds: float = 120.0
+
+    # Write-behind outbox worker (/remember write_mode=async)
+    outbox_worker_enabled: bool = True
+    outbox_poll_interval_seconds: float = 2.0
+    outbox_batch_size: int = 20
+    outbox_lease_seconds: float = 60.0
+    outbox_max_attempts: int = 8
+    outbox_retry_base_seconds: float = 2.0
+
+    # /recall search strategy
+    # fallback (Zep, then Qdrant) | parallel (hedged) | hybrid (full-text + Qdrant, RRF)
+    # | lexical (full-text only, no embedding call)
+    recall_mode: str = "fallback"
+    recall_zep_deadline_ms: float = 300.0  # parallel: stop waiting on Zep if Qdrant has results
+    recall_budget_ms: float = 2000.0  # parallel: hard cap on waiting for any source
+    recall_hybrid_candidates: int = 30  # hybrid: results fetched per retriever before fusion
+    recall_rrf_k: int = 60  # hybrid: RRF rank constant (higher = flatter rank weighting)
+
+    # Qdrant returns IDs only; bodies come from Valkey MGET, then Postgres
+    recall_hydrate_from_cache: bool = True
+
+    # /recall semantic cache
+    recall_cache_similarity: float = 0.95  # cosine threshold for a cache hit
+    recall_cache_entries: int = 32  # recent queries indexed per client/filter/mode
+    recall_cache_ttl: int = 3600
+
+    # /recall request coalescing
+    recall_singleflight_enabled: bool = True  # share one search among identical in-flight recalls
+    recall_lock_enabled: bool = False  # also coalesce across replicas with a Valkey lock
+    recall_lock_ttl_ms: int = 5000
+    recall_lock_wait_ms: int = 2000  # how long a replica waits on another's lock
+    recall_lock_poll_ms: int = 50
+
+    # Recall reranking: none | lexical (term overlap + similarity) | cross-encoder (local CPU
+    # model, needs requirements-local.txt). The top recall_rerank_candidates are rescored,
+    # with recency and salience boosts, then truncated to k
+    recall_rerank: str = "none"
+    recall_rerank_candidates: int = 30
+    recall_rerank_budget_ms: float = 150.0  # over budget: keep retriever order
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_recency_weight: float = 0.1
+    rerank_recency_half_life_days: float = 30.0
+    rerank_salience_weight: float = 0.1
+
+    # Recall scoring: similarity (cosine order) | weighted (similarity + exponential time
+    # decay + salience/confidence over the top recall_scoring_candidates, NumPy post-pass)
+    recall_scoring: str = "similarity"
+    recall_scoring_candidates: int = 50
+    scoring_similarity_weight: float = 1.0
+    scoring_recency_weight: float = 0.3
+    scoring_recency_half_life_days: float = 30.0
+    scoring_salience_weight: float = 0.2
+
+    # Vector stores: qdrant | pgvector (memory_entries). /remember writes to both when
+    # both are in use; /recall uses the fallback store when the primary fails
+    vector_store: str = "qdrant"
+    vector_fallback_store: Optional[str] = None
+    pgvector_probes: int = 10  # ivfflat lists scanned per query (~sqrt(lists))
+    pgvector_ef_search: int = 40  # HNSW beam width per query (after reindex_vectors.py --method hnsw)
+    pgvector_ttl_days: Optional[int] = None  # memory_entries expiry (None = never)
+
+    # Metrics: Prometheus /metrics endpoint (layer latency, cache hit counters, pool gauges)
+    metrics_enabled: bool = True
+
+    # Tracing: OpenTelemetry spans exported over OTLP/HTTP (e.g. a local collector on :4318)
+    otel_enabled: bool = False
+    otel_service_name: str = "memory-gateway"
+    otel_exporter_otlp_endpoint: str = "http://localhost:4318"
+    otel_sample_ratio: float = 1.0  # root spans only; requests with a traceparent follow the caller
+
     # Logging
     log_level: str = "INFO"
 
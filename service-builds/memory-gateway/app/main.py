@@ -4,14 +4,28 @@ Main FastAPI application for unified memory API
 """
 
 import logging
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import Settings
 from app.routes import memory, health
-from app.services import postgres, qdrant, valkey, zep
+from app.routes import metrics as metrics_routes
+from app.services import (
+    embeddings,
+    layers,
+    metrics,
+    outbox,
+    pgvector,
+    postgres,
+    qdrant,
+    rerank,
+    tracing,
+    valkey,
+    zep,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,13 +48,27 @@ async def lifespan(app: FastAPI):
         await valkey.initialize()
         logger.info("✓ Valkey cache initialized")
 
+        await embeddings.initialize()
+        logger.info("✓ Embedding client initialized")
+
         await qdrant.initialize()
         logger.info("✓ Qdrant client initialized")
 
+        if "pgvector" in layers.vector_stores():
+            await pgvector.initialize()
+            logger.info("✓ pgvector store checked")
+
         if settings.zep_memory_enabled:
             await zep.initialize()
             logger.info("✓ Zep Cloud client initialized")
 
+        if settings.recall_rerank == "cross-encoder":
+            await rerank.initialize()
+            logger.info("✓ Rerank model loaded")
+
+        await outbox.start()
+        logger.info("✓ Outbox worker started")
+
         logger.info("✓ Memory Gateway ready")
     except Exception as e:
         logger.error(f"✗ Startup failed: {e}")
@@ -51,10 +79,15 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Memory Gateway shutting down...")
     try:
+        await outbox.stop()
         await postgres.close()
         await valkey.close()
+        await qdrant.close()
+        await embeddings.close()
+        await rerank.close()
         if settings.zep_memory_enabled:
             await zep.close()
+        tracing.close()
         logger.info("✓ Connections closed")
     except Exception as e:
         logger.error(f"✗ Shutdown error: {e}")
@@ -68,6 +101,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Tracing instruments the app and httpx before any request or client exists
+tracing.initialize(app)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -78,24 +114,46 @@ app.add_middleware(
 )
 
 
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Record request latency by route template (not raw path) and status"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.REQUEST_SECONDS.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status)
+        ).observe(time.perf_counter() - start)
+
+
 # Include routers
 app.include_router(health.router, tags=["health"])
 app.include_router(memory.router, prefix="/api/v1/memory", tags=["memory"])
+if settings.metrics_enabled:
+    app.include_router(metrics_routes.router, tags=["metrics"])
 
 
 @app.get("/", tags=["root"])
 async def root():
     """Root endpoint"""
+    endpoints = {
+        "health": "/health",
+        "api": "/api/v1",
+        "docs": "/docs",
+        "openapi": "/openapi.json",
+    }
+    if settings.metrics_enabled:
+        endpoints["metrics"] = "/metrics"
     return {
         "service": "Memory Gateway",
         "version": "0.1.0",
         "status": "ready",
-        "endpoints": {
-            "health": "/health",
-            "api": "/api/v1",
-            "docs": "/docs",
-            "openapi": "/openapi.json",
-        },
+        "endpoints": endpoints,
     }
 
 
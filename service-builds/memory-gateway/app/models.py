@@ -3,7 +3,7 @@ Data Models
 Pydantic schemas for request/response validation
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -26,8 +26,8 @@ class HealthCheckResponse(BaseModel):
 # ============================================================================
 
 
-class MemoryPayload(BaseModel):
-    """Memory storage request"""
+class MemoryItem(BaseModel):
+    """Single memory to store"""
 
     client_id: int = Field(..., description="Client/user ID")
     content: str = Field(..., description="Memory content to store")
@@ -39,6 +39,15 @@ class MemoryPayload(BaseModel):
     tags: Optional[List[str]] = Field(default=None, description="Search tags")
 
 
+class MemoryPayload(MemoryItem):
+    """Memory storage request"""
+
+    write_mode: Literal["sync", "async"] = Field(
+        default="sync",
+        description="sync: write all layers before responding; async: commit Postgres + outbox, replicate in background",
+    )
+
+
 class MemoryResponse(BaseModel):
     """Memory storage response"""
 
@@ -48,6 +57,47 @@ class MemoryResponse(BaseModel):
         default=[],
         description="Storage layers used: postgres, qdrant, valkey, mem0",
     )
+    pending_in: List[str] = Field(
+        default=[],
+        description="Layers queued for background replication (write_mode=async)",
+    )
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+class BatchMemoryPayload(BaseModel):
+    """Batch memory storage request"""
+
+    memories: List[MemoryItem] = Field(..., description="Memories to store")
+    write_mode: Literal["sync", "async"] = Field(
+        default="sync",
+        description="sync: write all layers before responding; async: commit Postgres + outbox, replicate in background",
+    )
+
+
+class BatchMemoryItemResult(BaseModel):
+    """Per-item result of a batch store"""
+
+    index: int = Field(..., description="Position of the item in the request")
+    memory_id: int = Field(..., description="Unique memory ID")
+    client_id: int = Field(..., description="Client ID")
+    stored_in: List[str] = Field(default=[], description="Storage layers used")
+    pending_in: List[str] = Field(
+        default=[],
+        description="Layers queued for background replication (write_mode=async)",
+    )
+    failed_in: List[str] = Field(default=[], description="Layers that failed for this item")
+    unknown_in: List[str] = Field(
+        default=[],
+        description="Layers whose write timed out and may have landed (do not retry)",
+    )
+
+
+class BatchMemoryResponse(BaseModel):
+    """Batch memory storage response"""
+
+    results: List[BatchMemoryItemResult] = Field(default=[], description="Per-item results")
+    stored_count: int = Field(..., description="Items stored in Postgres")
+    elapsed_ms: float = Field(..., description="Batch duration in milliseconds")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -75,6 +125,14 @@ class MemoryHit(BaseModel):
     )
     stored_at: datetime = Field(..., description="When memory was stored")
     metadata: Optional[Dict[str, Any]] = Field(default=None)
+    rerank_score: Optional[float] = Field(
+        default=None,
+        description="Rerank score (relevance + recency/salience boosts), when reranked",
+    )
+    weighted_score: Optional[float] = Field(
+        default=None,
+        description="Similarity + time decay + salience score, with weighted scoring",
+    )
 
 
 class RecallResponse(BaseModel):
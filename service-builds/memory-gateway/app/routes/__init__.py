@@ -1,5 +1,5 @@
 """Routes module"""
 
-from . import health, memory
+from . import health, memory, metrics
 
-__all__ = ["health", "memory"]
+__all__ = ["health", "memory", "metrics"]
@@ -5,7 +5,7 @@ Health Check Routes
 import logging
 from fastapi import APIRouter
 from app.models import HealthCheckResponse
-from app.services import postgres, qdrant, valkey
+from app.services import embeddings, layers, pgvector, postgres, qdrant, valkey
 
 logger = logging.getLogger(__name__)
 
@@ -30,18 +30,18 @@ async def detailed_health():
     """
     Detailed health check with dependency status
     """
-    pg_ok = await postgres.check_connection()
-    qdrant_ok = await qdrant.check_connection()
-    valkey_ok = await valkey.check_connection()
+    checks = {"postgres": await postgres.check_connection()}
+    # Only the vector stores in use (VECTOR_STORE / VECTOR_FALLBACK_STORE)
+    vector_checks = {"qdrant": qdrant.check_connection, "pgvector": pgvector.check_connection}
+    for store in layers.vector_stores():
+        checks[store] = await vector_checks[store]()
+    checks["valkey"] = await valkey.check_connection()
 
-    status = "ready" if all([pg_ok, qdrant_ok, valkey_ok]) else "degraded"
+    status = "ready" if all(checks.values()) else "degraded"
 
     return {
         "status": status,
         "version": "0.1.0",
-        "dependencies": {
-            "postgres": "ok" if pg_ok else "failed",
-            "qdrant": "ok" if qdrant_ok else "failed",
-            "valkey": "ok" if valkey_ok else "failed",
-        },
+        "dependencies": {name: "ok" if ok else "failed" for name, ok in checks.items()},
+        "embedding_cache": embeddings.get_cache_stats(),
     }
@@ -3,20 +3,39 @@ Memory API Routes
 /remember and /recall endpoints for memory operations
 """
 
+import hashlib
 import logging
 import time
+from typing import Literal, Optional
 from fastapi import APIRouter, Query, HTTPException
+from pydantic import ValidationError
 
 from app.config import Settings
 from app.models import (
     MemoryPayload,
     MemoryResponse,
+    BatchMemoryPayload,
+    BatchMemoryItemResult,
+    BatchMemoryResponse,
     RecallQuery,
+    MemoryHit,
     RecallResponse,
     FactPayload,
     FactResponse,
 )
-from app.services import postgres, qdrant, valkey, zep
+from app.services import (
+    embeddings,
+    layers,
+    metrics,
+    outbox,
+    postgres,
+    recall_cache,
+    singleflight,
+    zep,
+)
+from app.services import recall as recall_service
+from app.services import rerank as rerank_service
+from app.services import scoring as scoring_service
 
 settings = Settings()
 logger = logging.getLogger(__name__)
@@ -34,6 +53,13 @@ async def remember(payload: MemoryPayload):
     - Qdrant: Vector embeddings for semantic search
     - Valkey: Short-term cache for frequently accessed memories
 
+    Postgres is written first (it assigns memory_id); Zep, Qdrant and Valkey
+    are then written concurrently, each under its own timeout.
+
+    With write_mode="async", only the Postgres row and an outbox record are
+    committed (one transaction) and the response returns immediately; the
+    outbox worker replicates to the other layers with retries.
+
     Args:
         payload: Memory content with client_id, content, memory_type, metadata, tags
 
@@ -44,6 +70,32 @@ async def remember(payload: MemoryPayload):
         start_time = time.time()
         stored_in = []
 
+        # Write-behind: commit Postgres + outbox record, replicate in background
+        if payload.write_mode == "async":
+            pending_in = layers.default_layers()
+            try:
+                memory_id = await postgres.store_memory_with_outbox(
+                    client_id=payload.client_id,
+                    content=payload.content,
+                    memory_type=payload.memory_type,
+                    metadata=payload.metadata,
+                    layers=pending_in,
+                )
+            except Exception as e:
+                logger.error(f"Failed to store in Postgres: {e}")
+                raise HTTPException(status_code=500, detail="Database storage failed")
+
+            outbox.notify()
+            elapsed_ms = (time.time() - start_time) * 1000
+            logger.info(f"Memory {memory_id} queued for {pending_in} ({elapsed_ms:.1f}ms)")
+
+            return MemoryResponse(
+                memory_id=memory_id,
+                client_id=payload.client_id,
+                stored_in=["postgres"],
+                pending_in=pending_in,
+            )
+
         # 1. Store in Postgres (primary storage)
         try:
             memory_id = await postgres.store_memory(
@@ -58,60 +110,18 @@ async def remember(payload: MemoryPayload):
             logger.error(f"Failed to store in Postgres: {e}")
             raise HTTPException(status_code=500, detail="Database storage failed")
 
-        # 2. Store in Zep Cloud (if enabled)
-        zep_session_id = None
-        if settings.zep_memory_enabled:
-            try:
-                zep_session_id = f"client_{payload.client_id}"
-                success = await zep.add_memory(
-                    session_id=zep_session_id,
-                    content=payload.content,
-                    metadata={
-                        "memory_id": memory_id,
-                        "memory_type": payload.memory_type,
-                        **payload.metadata,
-                    },
-                )
-                if success:
-                    stored_in.append("zep")
-                    logger.info(f"Memory {memory_id} stored in Zep Cloud")
-            except Exception as e:
-                logger.error(f"Failed to store in Zep Cloud: {e}")
-                # Don't fail the request, Zep is supplementary
-                logger.warning("Continuing without Zep Cloud storage")
-
-        # 3. Store vector in Qdrant (semantic search)
-        try:
-            await qdrant.store_memory_vector(
-                memory_id=memory_id,
-                content=payload.content,
-                client_id=payload.client_id,
-                memory_type=payload.memory_type,
-                metadata=payload.metadata,
-            )
-            stored_in.append("qdrant")
-            logger.info(f"Memory {memory_id} stored in Qdrant")
-        except Exception as e:
-            logger.error(f"Failed to store in Qdrant: {e}")
-            # Don't fail the request, Qdrant is supplementary
-            logger.warning("Continuing without Qdrant storage")
+        # 2. Fan out to Zep, Qdrant and Valkey concurrently (each only needs memory_id)
+        layer_results = await layers.replicate(
+            memory_id=memory_id,
+            client_id=payload.client_id,
+            content=payload.content,
+            memory_type=payload.memory_type,
+            metadata=payload.metadata,
+        )
+        stored_in.extend(layer for layer, ok in layer_results.items() if ok)
 
-        # 4. Cache in Valkey (optional)
-        try:
-            cache_key = f"memory:{payload.client_id}:{memory_id}"
-            await valkey.set_cache(
-                cache_key,
-                {
-                    "memory_id": memory_id,
-                    "content": payload.content,
-                    "memory_type": payload.memory_type,
-                    "metadata": payload.metadata,
-                    "zep_session_id": zep_session_id,
-                },
-            )
-            stored_in.append("valkey")
-        except Exception as e:
-            logger.warning(f"Failed to cache in Valkey: {e}")
+        # 3. Make the new memory visible to /recall (O(1) cache invalidation)
+        await recall_cache.invalidate([payload.client_id])
 
         elapsed_ms = (time.time() - start_time) * 1000
         logger.info(f"Memory {memory_id} stored in {len(stored_in)} layers ({elapsed_ms:.1f}ms)")
@@ -129,6 +139,87 @@ async def remember(payload: MemoryPayload):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/remember/batch", response_model=BatchMemoryResponse)
+async def remember_batch(payload: BatchMemoryPayload):
+    """
+    Store many memories in one request (bulk ingestion)
+
+    All events are inserted with a single multi-row INSERT. Contents are
+    embedded in batched requests and upserted to Qdrant in chunks; Zep gets
+    one call per client session and Valkey one pipelined round trip.
+
+    Args:
+        payload: Memories to store and the write mode for the whole batch
+
+    Returns:
+        BatchMemoryResponse with per-item memory_id and storage layers
+    """
+    if not payload.memories:
+        raise HTTPException(status_code=422, detail="memories must not be empty")
+    if len(payload.memories) > settings.remember_batch_max_items:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch exceeds {settings.remember_batch_max_items} memories",
+        )
+
+    try:
+        start_time = time.time()
+        items = [memory.model_dump() for memory in payload.memories]
+        write_behind = payload.write_mode == "async"
+        target_layers = layers.default_layers()
+
+        # 1. Store all events in Postgres (one statement, one transaction)
+        try:
+            memory_ids = await postgres.store_memories_batch(
+                items,
+                outbox_layers=target_layers if write_behind else None,
+            )
+        except Exception as e:
+            logger.error(f"Failed to store batch in Postgres: {e}")
+            raise HTTPException(status_code=500, detail="Database storage failed")
+
+        for item, memory_id in zip(items, memory_ids):
+            item["memory_id"] = memory_id
+
+        # 2. Replicate now, or leave it to the outbox worker
+        if write_behind:
+            outbox.notify()
+            layer_results = {}
+        else:
+            layer_results = await layers.replicate_many(items, layers=target_layers)
+            await recall_cache.invalidate(item["client_id"] for item in items)
+
+        results = []
+        for index, item in enumerate(items):
+            per_layer = layer_results.get(item["memory_id"], {})
+            results.append(
+                BatchMemoryItemResult(
+                    index=index,
+                    memory_id=item["memory_id"],
+                    client_id=item["client_id"],
+                    stored_in=["postgres"] + [layer for layer, ok in per_layer.items() if ok],
+                    pending_in=target_layers if write_behind else [],
+                    failed_in=[layer for layer, ok in per_layer.items() if ok is False],
+                    unknown_in=[layer for layer, ok in per_layer.items() if ok is None],
+                )
+            )
+
+        elapsed_ms = (time.time() - start_time) * 1000
+        logger.info(f"Batch of {len(items)} memories stored ({elapsed_ms:.1f}ms)")
+
+        return BatchMemoryResponse(
+            results=results,
+            stored_count=len(memory_ids),
+            elapsed_ms=elapsed_ms,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in /remember/batch: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/recall", response_model=RecallResponse)
 async def recall(
     query: str = Query(..., description="Search query"),
@@ -138,6 +229,38 @@ async def recall(
         default=None,
         description="Optional: filter by memory type (fact, event, preference, observation)",
     ),
+    mode: Optional[Literal["fallback", "parallel", "hybrid", "lexical"]] = Query(
+        default=None,
+        description=(
+            "Optional: fallback (Zep, then Qdrant), parallel (hedged Zep + Qdrant), "
+            "hybrid (full-text + Qdrant, rank-fused) or lexical (full-text only); "
+            "defaults to RECALL_MODE"
+        ),
+    ),
+    rerank: Optional[Literal["none", "lexical", "cross-encoder"]] = Query(
+        default=None,
+        description=(
+            "Optional: rescore the top RECALL_RERANK_CANDIDATES before truncating to k "
+            "(lexical overlap or local cross-encoder, with recency/salience boosts); "
+            "defaults to RECALL_RERANK"
+        ),
+    ),
+    scoring: Optional[Literal["similarity", "weighted"]] = Query(
+        default=None,
+        description=(
+            "Optional: similarity (cosine order) or weighted (similarity + time decay + "
+            "salience/confidence); defaults to RECALL_SCORING"
+        ),
+    ),
+    recency_weight: Optional[float] = Query(
+        default=None, ge=0, description="Weighted scoring: time decay weight"
+    ),
+    half_life_days: Optional[float] = Query(
+        default=None, gt=0, description="Weighted scoring: age (days) at which decay halves"
+    ),
+    salience_weight: Optional[float] = Query(
+        default=None, ge=0, description="Weighted scoring: salience/confidence weight"
+    ),
 ):
     """
     Recall memories using semantic search
@@ -148,11 +271,36 @@ async def recall(
     - Valkey: Recent memories from short-term cache (faster)
     - Postgres: Structured queries as fallback
 
+    In parallel mode Zep and Qdrant are queried concurrently; if Zep misses
+    its deadline the Qdrant results are returned without waiting, and results
+    from both are merged and deduplicated by memory_id. Hybrid mode runs
+    Postgres full-text search alongside Qdrant and fuses the two rankings
+    with reciprocal rank fusion; lexical mode uses full-text search only and
+    skips the query embedding (useful for names and IDs).
+
+    With rerank, more candidates are fetched and rescored within
+    RECALL_RERANK_BUDGET_MS, so a small k still returns the best matches.
+
+    Weighted scoring over-fetches RECALL_SCORING_CANDIDATES and ranks them by
+    similarity plus exponential time decay of `stored_at` and
+    salience/confidence from memory metadata, so fresh, high-confidence
+    memories come first. With rerank too, the weights apply to its boosts.
+
+    Results are cached semantically: a later query whose embedding is within
+    RECALL_CACHE_SIMILARITY (cosine) of a cached one, with the same
+    memory_type and mode and a covering k, is served from Valkey.
+
     Args:
         query: Search query (natural language)
         client_id: Client/user ID
         k: Number of results to return (1-100)
         memory_type: Optional filter by memory type
+        mode: Optional recall mode override
+        rerank: Optional rerank method override
+        scoring: Optional scoring override
+        recency_weight: Optional time decay weight (weighted scoring)
+        half_life_days: Optional decay half-life in days (weighted scoring)
+        salience_weight: Optional salience weight (weighted scoring)
 
     Returns:
         RecallResponse with ranked list of matching memories and scores
@@ -160,96 +308,135 @@ async def recall(
     try:
         start_time = time.time()
 
-        # 1. Try Valkey cache first (fastest)
-        cache_key = f"recall:{client_id}:{query}:{memory_type}"
-        cached_result = await valkey.get_cache(cache_key)
-        if cached_result:
-            logger.info(f"Recall cache hit for client {client_id}")
-            return RecallResponse(
-                query=query,
-                client_id=client_id,
-                results=cached_result["results"],
-                result_count=len(cached_result["results"]),
-                search_time_ms=(time.time() - start_time) * 1000,
+        mode = mode or settings.recall_mode
+        rerank = rerank or settings.recall_rerank
+        scoring = scoring or settings.recall_scoring
+        fetch_k = k
+        if rerank != "none":
+            fetch_k = max(fetch_k, settings.recall_rerank_candidates)
+        if scoring == "weighted":
+            fetch_k = max(fetch_k, settings.recall_scoring_candidates)
+            recency_weight = (
+                settings.scoring_recency_weight if recency_weight is None else recency_weight
             )
-
-        # 2. Search in Zep Cloud (if enabled, highest quality semantic search)
-        results = []
-        if settings.zep_memory_enabled:
+            salience_weight = (
+                settings.scoring_salience_weight if salience_weight is None else salience_weight
+            )
+            half_life_days = half_life_days or settings.scoring_recency_half_life_days
+
+        # Results for each rerank method / scoring configuration are cached separately
+        cache_mode = mode
+        if rerank != "none":
+            cache_mode += f"+{rerank}"
+        if scoring == "weighted":
+            cache_mode += f"+w{recency_weight:g}:{half_life_days:g}:{salience_weight:g}"
+
+        # 1. Embed the query once: keys the semantic cache and feeds vector search
+        #    (lexical mode needs no embedding and is not cached)
+        query_embedding = None
+        if mode != "lexical":
             try:
-                zep_session_id = f"client_{client_id}"
-                zep_results = await zep.search_memories(
-                    session_id=zep_session_id,
-                    query=query,
-                    limit=k,
-                    min_relevance=0.6,
-                )
-                results = [
-                    {
-                        "memory_id": r["metadata"].get("memory_id", "unknown"),
-                        "content": r["content"],
-                        "memory_type": r["metadata"].get("memory_type", "fact"),
-                        "similarity_score": r["similarity_score"],
-                        "stored_at": r["created_at"],
-                        "metadata": r["metadata"],
-                        "source": "zep",
-                    }
-                    for r in zep_results
-                ]
-                logger.info(f"Found {len(results)} results in Zep Cloud for client {client_id}")
+                query_embedding = await embeddings.embed_text(query)
             except Exception as e:
-                logger.warning(f"Zep Cloud search failed: {e}")
-                logger.info("Falling back to Qdrant search")
-
-        # 3. Fallback to Qdrant (if no Zep results)
-        if not results:
-            try:
-                qdrant_results = await qdrant.search_memories(
+                logger.warning(f"Query embedding failed - recall cache bypassed: {e}")
+
+        # 2. Try the semantic Valkey cache (a paraphrase of a recent query hits)
+        generation = await recall_cache.current_generation(client_id)
+        use_cache = query_embedding is not None and generation is not None
+        if use_cache:
+            cached_results = await recall_cache.lookup(
+                client_id, generation, memory_type, cache_mode, k, query_embedding
+            )
+            hit = cached_results is not None
+            metrics.record_cache("recall", int(hit), int(not hit))
+            if hit:
+                logger.info(f"Recall cache hit for client {client_id}")
+                return RecallResponse(
                     query=query,
                     client_id=client_id,
-                    k=k,
-                    memory_type=memory_type,
+                    results=cached_results,
+                    result_count=len(cached_results),
+                    search_time_ms=(time.time() - start_time) * 1000,
                 )
-                results = qdrant_results
-                logger.info(f"Found {len(results)} results in Qdrant for client {client_id}")
-            except Exception as e:
-                logger.warning(f"Qdrant search failed: {e}")
-                logger.info("Falling back to Postgres search")
 
-                # 4. Final fallback to Postgres (structured query)
+        # 3. Search Zep / Qdrant (sequential fallback or hedged parallel), Postgres last.
+        # Identical concurrent recalls share one computation (singleflight), and
+        # optionally one computation across replicas (Valkey lock).
+        query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        flight_key = (
+            f"recall:{client_id}:{generation}:{memory_type or '*'}:{cache_mode}:{k}:{query_hash}"
+        )
+
+        async def compute():
+            async with singleflight.valkey_lock(flight_key) as acquired:
+                if not acquired and use_cache:
+                    cached = await recall_cache.lookup(
+                        client_id, generation, memory_type, cache_mode, k, query_embedding
+                    )
+                    if cached is not None:
+                        return cached
+
                 try:
-                    events = await postgres.get_events(
+                    found = await recall_service.search(
+                        query=query,
                         client_id=client_id,
-                        event_type=f"memory:{memory_type}" if memory_type else None,
-                        limit=k,
+                        k=fetch_k,
+                        memory_type=memory_type,
+                        mode=mode,
+                        query_embedding=query_embedding,
                     )
-
-                    # Convert to result format
-                    results = [
-                        {
-                            "memory_id": event["id"],
-                            "content": event["payload"].get("content", ""),
-                            "memory_type": event["payload"].get("memory_type", "fact"),
-                            "similarity_score": 0.5,  # No score from SQL
-                            "stored_at": event["created_at"],
-                            "metadata": event.get("metadata", {}),
-                            "source": "postgres",
-                        }
-                        for event in events
-                    ]
-                except Exception as e2:
-                    logger.error(f"Postgres fallback also failed: {e2}")
+                except Exception as e:
+                    logger.error(f"Recall search failed in every layer: {e}")
                     raise HTTPException(status_code=500, detail="Search failed")
 
-        # Cache the results
-        try:
-            await valkey.set_cache(
-                cache_key,
-                {"results": results},
-                ttl=3600,  # Cache for 1 hour
-            )
-        except Exception as e:
-            logger.warning(f"Failed to cache recall results: {e}")
+                if rerank != "none":
+                    # Weighted scoring's weights (if any) replace the rerank boost defaults
+                    found = await rerank_service.rerank(
+                        query,
+                        found,
+                        k,
+                        rerank,
+                        recency_weight=recency_weight,
+                        salience_weight=salience_weight,
+                        half_life_days=half_life_days,
+                    )
+                elif scoring == "weighted":
+                    found = scoring_service.rank(
+                        found,
+                        k,
+                        recency_weight=recency_weight,
+                        salience_weight=salience_weight,
+                        half_life_days=half_life_days,
+                    )
+
+                # Validate before caching: a hit that fails MemoryHit would otherwise be
+                # served (and fail) from the cache on every later paraphrase
+                valid = []
+                for hit in found:
+                    try:
+                        valid.append(MemoryHit.model_validate(hit).model_dump(mode="json"))
+                    except ValidationError as e:
+                        logger.warning(f"Dropping invalid recall hit {hit.get('memory_id')}: {e}")
+                found = valid
+
+                # Cache the results under the query embedding (generation read before the search)
+                if use_cache:
+                    await recall_cache.store(
+                        client_id,
+                        generation,
+                        memory_type,
+                        cache_mode,
+                        k,
+                        query,
+                        query_embedding,
+                        found,
+                    )
+                return found
+
+        if settings.recall_singleflight_enabled:
+            results = await singleflight.do(flight_key, compute)
+        else:
+            results = await compute()
 
         elapsed_ms = (time.time() - start_time) * 1000
         logger.info(f"Recall completed in {elapsed_ms:.1f}ms ({len(results)} results)")
@@ -329,6 +516,11 @@ async def create_fact(payload: FactPayload):
         except Exception as e:
             logger.warning(f"Failed to log fact in Postgres: {e}")
 
+        # 3. Only client 0's recall can return the audit row (Zep graph facts are
+        # not searched by /recall), so other clients' cached results stay valid
+        if "postgres" in stored_in:
+            await recall_cache.invalidate([0])
+
         elapsed_ms = (time.time() - start_time) * 1000
         logger.info(f"Fact {fact_id} created in {len(stored_in)} layers ({elapsed_ms:.1f}ms)")
 
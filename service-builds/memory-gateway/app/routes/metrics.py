@@ -0,0 +1,65 @@
+"""
+Metrics Routes
+Prometheus scrape endpoint
+"""
+
+import logging
+from fastapi import APIRouter, Response
+
+from app.services import embeddings, metrics, postgres, valkey
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# redis-py's default when no max_connections is given (effectively unbounded)
+UNBOUNDED_POOL = 2**31
+
+
+def _record_valkey_pool(name: str, client):
+    """Gauge a redis-py connection pool (no public stats API; read its counters)"""
+    pool = client.connection_pool
+    in_use = len(getattr(pool, "_in_use_connections", ()))
+    max_size = getattr(pool, "max_connections", None)
+    metrics.record_pool(
+        name,
+        getattr(pool, "_created_connections", in_use),
+        in_use,
+        max_size if max_size and max_size < UNBOUNDED_POOL else None,
+    )
+
+
+@router.get("/metrics")
+async def prometheus_metrics() -> Response:
+    """
+    Prometheus metrics
+
+    Request and storage layer latency histograms and cache counters are
+    updated as requests run; pool and cache gauges are read at scrape time.
+    """
+    if postgres.pool:
+        size = postgres.pool.get_size()
+        metrics.record_pool(
+            "postgres",
+            size,
+            size - postgres.pool.get_idle_size(),
+            postgres.pool.get_max_size(),
+        )
+
+    if valkey.cache:
+        _record_valkey_pool("valkey", valkey.cache)
+        stats = await valkey.get_cache_stats()
+        if stats.get("used_memory") is not None:
+            metrics.VALKEY_USED_MEMORY.set(stats["used_memory"])
+        if stats.get("connected_clients") is not None:
+            metrics.VALKEY_CONNECTED_CLIENTS.set(stats["connected_clients"])
+    if valkey.binary_cache:
+        _record_valkey_pool("valkey_binary", valkey.binary_cache)
+
+    metrics.EMBEDDING_CACHE_ENTRIES.set(embeddings.get_cache_stats()["lru_size"])
+
+    # Passed as a header: media_type would append a second charset
+    return Response(
+        content=metrics.render(),
+        headers={"Content-Type": metrics.CONTENT_TYPE_LATEST},
+    )
@@ -1,5 +1,39 @@
 """Services module"""
 
-from . import postgres, qdrant, valkey
+from . import (
+    codec,
+    embeddings,
+    layers,
+    local_embeddings,
+    metrics,
+    outbox,
+    pgvector,
+    postgres,
+    qdrant,
+    recall,
+    recall_cache,
+    rerank,
+    scoring,
+    singleflight,
+    tracing,
+    valkey,
+)
 
-__all__ = ["postgres", "qdrant", "valkey"]
+__all__ = [
+    "codec",
+    "embeddings",
+    "layers",
+    "local_embeddings",
+    "metrics",
+    "outbox",
+    "pgvector",
+    "postgres",
+    "qdrant",
+    "recall",
+    "recall_cache",
+    "rerank",
+    "scoring",
+    "singleflight",
+    "tracing",
+    "valkey",
+]
@@ -0,0 +1,159 @@
+"""
+Codec Service
+Compact, versioned binary encoding for Valkey cache values
+
+Every encoded value starts with one header byte in 0x80-0xBF, a range no
+UTF-8 text (and so no legacy JSON entry) can start with:
+
+    0x80 | (compression << 3) | serializer
+
+Values without a header are legacy JSON strings and are still decoded.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+from app.config import Settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+HEADER_FLAG = 0x80
+HEADER_MASK = 0xC0
+
+SERIALIZERS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSIONS = {"none": 0, "zstd": 1, "zlib": 2}
+
+
+# ============================================================================
+# Serializers
+# ============================================================================
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_loads(raw: bytes) -> Any:
+    return orjson.loads(raw)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=str, use_bin_type=True)
+
+
+def _msgpack_loads(raw: bytes) -> Any:
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+_DUMPS: Dict[int, Callable[[Any], bytes]] = {1: _json_dumps, 2: _orjson_dumps, 3: _msgpack_dumps}
+_LOADS: Dict[int, Callable[[bytes], Any]] = {1: json.loads, 2: _orjson_loads, 3: _msgpack_loads}
+
+# orjson writes plain JSON, so stdlib json can read it if orjson is missing
+if orjson is None:
+    _LOADS[2] = json.loads
+
+
+# ============================================================================
+# Compression
+# ============================================================================
+
+
+def _zstd_compress(raw: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(raw)
+
+
+def _zstd_decompress(raw: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(raw)
+
+
+_COMPRESS: Dict[int, Callable[[bytes], bytes]] = {1: _zstd_compress, 2: zlib.compress}
+_DECOMPRESS: Dict[int, Callable[[bytes], bytes]] = {1: _zstd_decompress, 2: zlib.decompress}
+
+
+def _resolve(serializer: str, compression: str) -> Tuple[int, int]:
+    """Map configured names to header ids, falling back when a library is missing"""
+    serializer_id = SERIALIZERS.get(serializer, SERIALIZERS["json"])
+    if serializer_id == 2 and orjson is None:
+        logger.warning("orjson not installed - Valkey codec falling back to json")
+        serializer_id = 1
+    if serializer_id == 3 and msgpack is None:
+        logger.warning("msgpack not installed - Valkey codec falling back to json")
+        serializer_id = 1
+
+    compression_id = COMPRESSIONS.get(compression, COMPRESSIONS["none"])
+    if compression_id == 1 and zstandard is None:
+        logger.warning("zstandard not installed - Valkey codec falling back to zlib")
+        compression_id = 2
+
+    return serializer_id, compression_id
+
+
+_serializer_id, _compression_id = _resolve(settings.valkey_codec, settings.valkey_compression)
+
+
+def encode(value: Any) -> bytes:
+    """
+    Encode a cache value with the configured serializer
+
+    Payloads of at least valkey_compress_min_bytes are compressed.
+
+    Args:
+        value: JSON-compatible value
+
+    Returns:
+        Header byte + encoded payload
+    """
+    raw = _DUMPS[_serializer_id](value)
+    compression_id = 0
+    if _compression_id and len(raw) >= settings.valkey_compress_min_bytes:
+        compression_id = _compression_id
+        raw = _COMPRESS[compression_id](raw)
+    return bytes([HEADER_FLAG | (compression_id << 3) | _serializer_id]) + raw
+
+
+def decode(raw: bytes) -> Any:
+    """
+    Decode a cache value written by encode (or a legacy JSON string)
+
+    Args:
+        raw: Bytes read from Valkey
+
+    Returns:
+        Decoded value
+    """
+    if not raw:
+        return None
+
+    header = raw[0]
+    if header & HEADER_MASK != HEADER_FLAG:
+        return json.loads(raw)
+
+    serializer_id = header & 0x07
+    compression_id = (header >> 3) & 0x07
+    payload = raw[1:]
+    if compression_id:
+        payload = _DECOMPRESS[compression_id](payload)
+    return _LOADS[serializer_id](payload)
@@ -0,0 +1,387 @@
+"""
+Embeddings Service
+Embedding providers (OpenRouter API or local CPU model) behind micro-batching,
+request coalescing and a content-addressed embedding cache (in-process LRU + Valkey)
+"""
+
+import asyncio
+import hashlib
+import logging
+import sys
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple, Any, Awaitable, Callable
+
+import httpx
+
+from app.config import Settings
+from app.services import local_embeddings, metrics, valkey
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Global long-lived HTTP client (keep-alive connection pool)
+client: Optional[httpx.AsyncClient] = None
+
+# Micro-batcher state: texts waiting for the next flush
+_pending: List[Tuple[str, asyncio.Future]] = []
+_flush_handle: Optional[asyncio.TimerHandle] = None
+_inflight: set = set()
+
+# Embedding cache: in-process LRU of float32 bytes, backed by Valkey
+_lru: "OrderedDict[str, bytes]" = OrderedDict()
+_stats: Dict[str, int] = {"lru_hits": 0, "valkey_hits": 0, "misses": 0}
+
+CACHE_KEY_PREFIX = "emb:"
+
+# Output size of embedding_model when no shortened size is requested
+NATIVE_DIMENSIONS = 1536
+
+
+def dimensions() -> int:
+    """Size of the vectors this service returns"""
+    if settings.embedding_dimensions:
+        return settings.embedding_dimensions
+    if settings.embedding_provider == "local":
+        return local_embeddings.dimensions()
+    return NATIVE_DIMENSIONS
+
+
+def model_name() -> str:
+    """Name of the model producing embeddings for the configured provider"""
+    if settings.embedding_provider == "local":
+        return f"local:{settings.local_embedding_model}"
+    return settings.embedding_model
+
+
+async def initialize():
+    """Initialize the configured embedding provider (HTTP client pool or local model)"""
+    global client
+    if settings.embedding_provider == "local":
+        await local_embeddings.initialize()
+        return
+    if client:
+        return
+
+    client = httpx.AsyncClient(
+        base_url=settings.embedding_api_url,
+        headers={
+            "Authorization": f"Bearer {settings.openrouter_api_key}",
+            "HTTP-Referer": "https://bestviable.com",
+        },
+        timeout=settings.embedding_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.embedding_max_connections,
+            max_keepalive_connections=settings.embedding_max_connections,
+        ),
+    )
+    logger.info(
+        f"Embedding client initialized ({settings.embedding_model}, {dimensions()} dims)"
+    )
+
+
+async def close():
+    """Flush pending batches and close the embedding HTTP client"""
+    global client, _flush_handle
+    if _flush_handle:
+        _flush_handle.cancel()
+        _flush_handle = None
+    _flush()
+    if _inflight:
+        await asyncio.gather(*_inflight, return_exceptions=True)
+    await local_embeddings.close()
+    if client:
+        await client.aclose()
+        client = None
+        logger.info("Embedding client closed")
+
+
+async def _request_remote_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    Send one multi-input request to the OpenRouter embeddings endpoint
+
+    Args:
+        texts: Texts to embed (one API request)
+
+    Returns:
+        Embeddings in the same order as texts
+    """
+    if not client:
+        await initialize()
+
+    body: Dict[str, Any] = {
+        "model": settings.embedding_model,
+        "input": texts,
+    }
+    if settings.embedding_dimensions:
+        body["dimensions"] = settings.embedding_dimensions
+
+    response = await client.post("/embeddings", json=body)
+
+    if response.status_code != 200:
+        logger.error(f"Embedding API error: {response.status_code} - {response.text}")
+        raise Exception(f"Failed to generate embedding: {response.status_code}")
+
+    data = sorted(response.json()["data"], key=lambda item: item["index"])
+    if len(data) != len(texts):
+        raise Exception(f"Embedding API returned {len(data)} vectors for {len(texts)} inputs")
+
+    logger.debug(f"Generated {len(data)} embeddings in one request")
+    return [item["embedding"] for item in data]
+
+
+# Embedding providers: async (texts) -> embeddings in the same order
+PROVIDERS: Dict[str, Callable[[List[str]], Awaitable[List[List[float]]]]] = {
+    "openrouter": _request_remote_embeddings,
+    "local": local_embeddings.embed,
+}
+
+
+@metrics.timed("embeddings", "provider_request")
+async def _request_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    Embed one batch of texts with the configured provider
+
+    Args:
+        texts: Texts to embed (one provider call)
+
+    Returns:
+        Embeddings in the same order as texts
+    """
+    provider = PROVIDERS.get(settings.embedding_provider)
+    if provider is None:
+        raise ValueError(f"Unknown embedding provider: {settings.embedding_provider}")
+    return await provider(texts)
+
+
+async def _embed_many_uncached(texts: List[str]) -> List[List[float]]:
+    """
+    Embed many texts, chunked into multi-input requests
+
+    Identical texts are only sent once.
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        Embeddings in the same order as texts
+    """
+    unique = list(dict.fromkeys(texts))
+    size = settings.embedding_max_batch_size
+    chunks = [unique[i : i + size] for i in range(0, len(unique), size)]
+
+    vectors: Dict[str, List[float]] = {}
+    for chunk, embeddings in zip(
+        chunks, await asyncio.gather(*(_request_embeddings(chunk) for chunk in chunks))
+    ):
+        vectors.update(zip(chunk, embeddings))
+
+    return [vectors[text] for text in texts]
+
+
+async def _send_batch(batch: List[Tuple[str, asyncio.Future]]):
+    """Embed a flushed batch and resolve the waiting futures"""
+    try:
+        embeddings = await _embed_many_uncached([text for text, _ in batch])
+    except Exception as e:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for (_, future), embedding in zip(batch, embeddings):
+        if not future.done():
+            future.set_result(embedding)
+
+
+def _flush():
+    """Hand all pending texts to a background batch request"""
+    global _pending, _flush_handle
+    _flush_handle = None
+    if not _pending:
+        return
+
+    batch, _pending = _pending, []
+    task = asyncio.get_running_loop().create_task(_send_batch(batch))
+    _inflight.add(task)
+    task.add_done_callback(_inflight.discard)
+
+
+async def _embed_one_uncached(text: str) -> List[float]:
+    """
+    Embed one text through the micro-batcher
+
+    Concurrent calls made within the batch window are coalesced into a
+    single multi-input request to the embeddings endpoint.
+    """
+    if settings.embedding_batch_window_ms <= 0:
+        return (await _request_embeddings([text]))[0]
+
+    global _flush_handle
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _pending.append((text, future))
+
+    if len(_pending) >= settings.embedding_max_batch_size:
+        if _flush_handle:
+            _flush_handle.cancel()
+        _flush()
+    elif not _flush_handle:
+        _flush_handle = loop.call_later(settings.embedding_batch_window_ms / 1000, _flush)
+
+    try:
+        return await future
+    except Exception as e:
+        logger.error(f"Failed to embed text: {e}")
+        raise
+
+
+# ============================================================================
+# Embedding cache
+# ============================================================================
+
+
+def _normalize(text: str) -> str:
+    """Normalize text for cache addressing (unicode form + whitespace)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text: str) -> str:
+    """Content address for an embedding: hash of model name (+ dimensions) + normalized text"""
+    model = model_name()
+    if settings.embedding_dimensions:
+        model = f"{model}@{settings.embedding_dimensions}"
+    digest = hashlib.sha256(f"{model}\n{_normalize(text)}".encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}{digest}"
+
+
+def _to_bytes(embedding: List[float]) -> bytes:
+    """Pack an embedding as little-endian float32 bytes"""
+    packed = array("f", embedding)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _from_bytes(raw: bytes) -> List[float]:
+    """Unpack little-endian float32 bytes into an embedding"""
+    packed = array("f")
+    packed.frombytes(raw)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _lru_get(key: str) -> Optional[bytes]:
+    raw = _lru.get(key)
+    if raw is not None:
+        _lru.move_to_end(key)
+    return raw
+
+
+def _lru_put(key: str, raw: bytes):
+    if settings.embedding_cache_size <= 0:
+        return
+    _lru[key] = raw
+    _lru.move_to_end(key)
+    while len(_lru) > settings.embedding_cache_size:
+        _lru.popitem(last=False)
+
+
+async def _cache_lookup(keys: List[str]) -> List[Optional[bytes]]:
+    """Look keys up in the LRU tier, then the Valkey tier for the rest"""
+    found: List[Optional[bytes]] = [_lru_get(key) for key in keys]
+    lru_hits = sum(1 for raw in found if raw is not None)
+    _stats["lru_hits"] += lru_hits
+    metrics.record_cache("embedding_lru", lru_hits, len(keys) - lru_hits)
+
+    missing = [i for i, raw in enumerate(found) if raw is None]
+    if missing and valkey.binary_cache:
+        remote = await valkey.get_bytes_many([keys[i] for i in missing])
+        valkey_hits = 0
+        for i, raw in zip(missing, remote):
+            if raw is not None:
+                found[i] = raw
+                _lru_put(keys[i], raw)
+                valkey_hits += 1
+        _stats["valkey_hits"] += valkey_hits
+        metrics.record_cache("embedding_valkey", valkey_hits, len(missing) - valkey_hits)
+
+    _stats["misses"] += sum(1 for raw in found if raw is None)
+    return found
+
+
+async def _cache_store(items: Dict[str, bytes]):
+    """Write freshly computed embeddings to both cache tiers"""
+    for key, raw in items.items():
+        _lru_put(key, raw)
+    if items and valkey.binary_cache:
+        await valkey.set_bytes_many(items, ttl=settings.embedding_cache_ttl)
+
+
+@metrics.timed("embeddings")
+async def embed_text(text: str) -> List[float]:
+    """
+    Generate an embedding for one text
+
+    Served from the embedding cache when the same model + normalized text
+    was embedded before; otherwise sent through the micro-batcher.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        Vector embedding
+    """
+    key = cache_key(text)
+    raw = (await _cache_lookup([key]))[0]
+    if raw is not None:
+        return _from_bytes(raw)
+
+    embedding = await _embed_one_uncached(text)
+    await _cache_store({key: _to_bytes(embedding)})
+    return embedding
+
+
+@metrics.timed("embeddings")
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Embed many texts, skipping any already in the embedding cache
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        Embeddings in the same order as texts
+    """
+    keys = [cache_key(text) for text in texts]
+    found = await _cache_lookup(keys)
+
+    missing = [i for i, raw in enumerate(found) if raw is None]
+    if missing:
+        fresh = await _embed_many_uncached([texts[i] for i in missing])
+        new_items = {}
+        for i, embedding in zip(missing, fresh):
+            found[i] = _to_bytes(embedding)
+            new_items[keys[i]] = found[i]
+        await _cache_store(new_items)
+
+    return [_from_bytes(raw) for raw in found]
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get embedding cache statistics
+
+    Returns:
+        Hit/miss counters per tier and current LRU size
+    """
+    lookups = sum(_stats.values())
+    hits = _stats["lru_hits"] + _stats["valkey_hits"]
+    return {
+        **_stats,
+        "lru_size": len(_lru),
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+    }
@@ -0,0 +1,310 @@
+"""
+Storage Layers Service
+Fan-out writes of a stored memory to the supplementary layers (Zep, Qdrant, pgvector, Valkey)
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Awaitable, Tuple
+
+import httpx
+
+from app.config import Settings
+from app.services import pgvector, qdrant, valkey, zep
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Layers whose writes are not idempotent on memory_id: Zep appends a new
+# message on every call, so a write that timed out (and may have landed) is
+# reported as unknown (None) rather than failed, and is never replayed
+AT_MOST_ONCE_LAYERS = {"zep"}
+
+
+def vector_stores() -> List[str]:
+    """Vector stores in use: the primary, then the fallback (if any)"""
+    stores = [settings.vector_store]
+    if settings.vector_fallback_store and settings.vector_fallback_store not in stores:
+        stores.append(settings.vector_fallback_store)
+    return stores
+
+
+def default_layers() -> List[str]:
+    """Supplementary layers a new memory should be written to"""
+    layers = vector_stores() + ["valkey"]
+    if settings.zep_memory_enabled:
+        layers.insert(0, "zep")
+    return layers
+
+
+async def _run_layer(
+    layer: str, write: Awaitable[bool], timeout: float
+) -> Tuple[str, Optional[bool]]:
+    """
+    Run one supplementary storage write with its own timeout
+
+    Failures are logged and reported as (layer, False) instead of raised.
+    Timeouts in AT_MOST_ONCE_LAYERS are reported as (layer, None).
+    """
+    try:
+        ok = await asyncio.wait_for(write, timeout=timeout)
+        return layer, bool(ok)
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        if layer in AT_MOST_ONCE_LAYERS:
+            logger.warning(
+                f"Storage in {layer} timed out after {timeout}s - outcome unknown, not retried"
+            )
+            return layer, None
+        logger.warning(f"Storage in {layer} timed out after {timeout}s")
+    except Exception as e:
+        logger.error(f"Failed to store in {layer}: {e}")
+    return layer, False
+
+
+async def _store_in_zep(
+    memory_id: int,
+    client_id: int,
+    content: str,
+    memory_type: str,
+    metadata: Optional[Dict[str, Any]],
+) -> bool:
+    """Add the memory to the client's Zep Cloud session"""
+    success = await zep.add_memory(
+        session_id=f"client_{client_id}",
+        content=content,
+        metadata={
+            "memory_id": memory_id,
+            "memory_type": memory_type,
+            **(metadata or {}),
+        },
+    )
+    if success:
+        logger.info(f"Memory {memory_id} stored in Zep Cloud")
+    return success
+
+
+async def _store_in_qdrant(
+    memory_id: int,
+    client_id: int,
+    content: str,
+    memory_type: str,
+    metadata: Optional[Dict[str, Any]],
+) -> bool:
+    """Embed the memory and upsert its vector into Qdrant"""
+    stored = await qdrant.store_memory_vector(
+        memory_id=memory_id,
+        content=content,
+        client_id=client_id,
+        memory_type=memory_type,
+        metadata=metadata,
+    )
+    if stored:
+        logger.info(f"Memory {memory_id} stored in Qdrant")
+    return stored
+
+
+async def _store_in_pgvector(
+    memory_id: int,
+    client_id: int,
+    content: str,
+    memory_type: str,
+    metadata: Optional[Dict[str, Any]],
+) -> bool:
+    """Embed the memory and store it in Postgres memory_entries"""
+    stored = await pgvector.store_memory_vector(
+        memory_id=memory_id,
+        content=content,
+        client_id=client_id,
+        memory_type=memory_type,
+        metadata=metadata,
+    )
+    if stored:
+        logger.info(f"Memory {memory_id} stored in pgvector")
+    return stored
+
+
+async def _store_in_valkey(
+    memory_id: int,
+    client_id: int,
+    content: str,
+    memory_type: str,
+    metadata: Optional[Dict[str, Any]],
+) -> bool:
+    """Cache the memory body in Valkey"""
+    return await valkey.set_cache(
+        f"memory:{client_id}:{memory_id}",
+        {
+            "memory_id": memory_id,
+            "content": content,
+            "memory_type": memory_type,
+            "metadata": metadata,
+            "stored_at": datetime.utcnow().isoformat(),
+            "zep_session_id": f"client_{client_id}" if settings.zep_memory_enabled else None,
+        },
+    )
+
+
+_WRITERS = {
+    "zep": (_store_in_zep, lambda: settings.remember_zep_timeout_seconds),
+    "qdrant": (_store_in_qdrant, lambda: settings.remember_qdrant_timeout_seconds),
+    "pgvector": (_store_in_pgvector, lambda: settings.remember_pgvector_timeout_seconds),
+    "valkey": (_store_in_valkey, lambda: settings.remember_valkey_timeout_seconds),
+}
+
+
+async def replicate(
+    memory_id: int,
+    client_id: int,
+    content: str,
+    memory_type: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    layers: Optional[List[str]] = None,
+) -> Dict[str, Optional[bool]]:
+    """
+    Write a memory (already stored in Postgres) to supplementary layers concurrently
+
+    Qdrant, pgvector and Valkey writes are idempotent on memory_id (point ID,
+    memory_id column, cache key), so replaying them is safe. Zep is not: it
+    appends a message per call, so a Zep write that timed out is reported as
+    None (outcome unknown) and must not be retried.
+
+    Args:
+        memory_id: Memory ID from Postgres
+        client_id: Client/user ID
+        content: Memory content
+        memory_type: Type of memory
+        metadata: Additional metadata
+        layers: Layers to write (defaults to all enabled layers)
+
+    Returns:
+        Mapping of layer name to success status (True, False, or None when
+        unknown), in layer order
+    """
+    layers = default_layers() if layers is None else layers
+    results = await asyncio.gather(
+        *(
+            _run_layer(
+                layer,
+                _WRITERS[layer][0](memory_id, client_id, content, memory_type, metadata),
+                _WRITERS[layer][1](),
+            )
+            for layer in layers
+        )
+    )
+    return dict(results)
+
+
+async def _store_many_in_zep(memories: List[Dict[str, Any]]) -> List[int]:
+    """Add memories to Zep Cloud, one call per client session"""
+    by_client: Dict[int, List[Dict[str, Any]]] = {}
+    for memory in memories:
+        by_client.setdefault(memory["client_id"], []).append(memory)
+
+    async def add(client_id: int, group: List[Dict[str, Any]]) -> List[int]:
+        success = await zep.add_memories(
+            session_id=f"client_{client_id}",
+            memories=[
+                {
+                    "content": memory["content"],
+                    "metadata": {
+                        "memory_id": memory["memory_id"],
+                        "memory_type": memory["memory_type"],
+                        **(memory.get("metadata") or {}),
+                    },
+                }
+                for memory in group
+            ],
+        )
+        return [memory["memory_id"] for memory in group] if success else []
+
+    groups = await asyncio.gather(*(add(cid, group) for cid, group in by_client.items()))
+    return [memory_id for group in groups for memory_id in group]
+
+
+async def _store_many_in_qdrant(memories: List[Dict[str, Any]]) -> List[int]:
+    """Embed in batched requests and upsert vectors to Qdrant in chunks"""
+    return await qdrant.store_memory_vectors(memories)
+
+
+async def _store_many_in_pgvector(memories: List[Dict[str, Any]]) -> List[int]:
+    """Embed in batched requests and write memory_entries with one executemany"""
+    return await pgvector.store_memory_vectors(memories)
+
+
+async def _store_many_in_valkey(memories: List[Dict[str, Any]]) -> List[int]:
+    """Cache memory bodies in Valkey with one pipelined round trip"""
+    stored_at = datetime.utcnow().isoformat()
+    success = await valkey.set_cache_many(
+        {
+            f"memory:{memory['client_id']}:{memory['memory_id']}": {
+                "memory_id": memory["memory_id"],
+                "content": memory["content"],
+                "memory_type": memory["memory_type"],
+                "metadata": memory.get("metadata"),
+                "stored_at": stored_at,
+                "zep_session_id": (
+                    f"client_{memory['client_id']}" if settings.zep_memory_enabled else None
+                ),
+            }
+            for memory in memories
+        }
+    )
+    return [memory["memory_id"] for memory in memories] if success else []
+
+
+_BATCH_WRITERS = {
+    "zep": _store_many_in_zep,
+    "qdrant": _store_many_in_qdrant,
+    "pgvector": _store_many_in_pgvector,
+    "valkey": _store_many_in_valkey,
+}
+
+
+async def replicate_many(
+    memories: List[Dict[str, Any]],
+    layers: Optional[List[str]] = None,
+) -> Dict[int, Dict[str, Optional[bool]]]:
+    """
+    Write many memories (already stored in Postgres) to supplementary layers
+
+    Each layer receives the whole batch in bulk calls; layers run concurrently.
+    As in replicate(), a timed-out batch in AT_MOST_ONCE_LAYERS is reported as
+    None (outcome unknown) for every memory, so callers do not retry it.
+
+    Args:
+        memories: Dicts with memory_id, client_id, content, memory_type, metadata
+        layers: Layers to write (defaults to all enabled layers)
+
+    Returns:
+        Mapping of memory_id to {layer: success (True, False, or None when unknown)}
+    """
+    layers = default_layers() if layers is None else layers
+    timeout = settings.remember_batch_timeout_seconds
+
+    async def run(layer: str) -> Optional[List[int]]:
+        try:
+            return await asyncio.wait_for(_BATCH_WRITERS[layer](memories), timeout=timeout)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            if layer in AT_MOST_ONCE_LAYERS:
+                logger.warning(
+                    f"Batch storage in {layer} timed out after {timeout}s - outcome unknown"
+                )
+                return None
+            logger.warning(f"Batch storage in {layer} timed out after {timeout}s")
+        except Exception as e:
+            logger.error(f"Failed to store batch in {layer}: {e}")
+        return []
+
+    stored = dict(zip(layers, await asyncio.gather(*(run(layer) for layer in layers))))
+    stored_sets = {layer: None if ids is None else set(ids) for layer, ids in stored.items()}
+    return {
+        memory["memory_id"]: {
+            layer: (
+                None if stored_sets[layer] is None else memory["memory_id"] in stored_sets[layer]
+            )
+            for layer in layers
+        }
+        for memory in memories
+    }
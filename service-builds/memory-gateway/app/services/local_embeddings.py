@@ -0,0 +1,105 @@
+"""
+Local Embeddings Service
+CPU embedding backend (sentence-transformers, torch or ONNX) for offline use
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List
+
+from app.config import Settings
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # pragma: no cover - optional dependency (requirements-local.txt)
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Global model and the worker threads that run inference off the event loop
+model = None
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _load_model():
+    """Load the model (blocking; runs in the worker pool)"""
+    kwargs = {"device": "cpu"}
+    if settings.local_embedding_backend != "torch":
+        kwargs["backend"] = settings.local_embedding_backend
+    if settings.embedding_dimensions:
+        # Matryoshka-trained models keep working when truncated
+        kwargs["truncate_dim"] = settings.embedding_dimensions
+    return SentenceTransformer(settings.local_embedding_model, **kwargs)
+
+
+async def initialize():
+    """Load the local embedding model"""
+    global model, _executor
+    if model:
+        return
+    if SentenceTransformer is None:
+        raise RuntimeError(
+            "sentence-transformers not installed - install requirements-local.txt "
+            "or set EMBEDDING_PROVIDER=openrouter"
+        )
+
+    _executor = ThreadPoolExecutor(
+        max_workers=settings.local_embedding_workers,
+        thread_name_prefix="embedding",
+    )
+    model = await asyncio.get_running_loop().run_in_executor(_executor, _load_model)
+    logger.info(
+        f"Local embedding model loaded ({settings.local_embedding_model}, "
+        f"{settings.local_embedding_backend}, {dimensions()} dims)"
+    )
+
+
+async def close():
+    """Release the model and stop the worker pool"""
+    global model, _executor
+    if _executor:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if model:
+        model = None
+        logger.info("Local embedding model unloaded")
+
+
+def dimensions() -> int:
+    """Output size of the loaded model"""
+    if not model:
+        raise RuntimeError("Local embedding model not initialized")
+    return model.get_sentence_embedding_dimension()
+
+
+def _encode(texts: List[str]) -> List[List[float]]:
+    """Batched inference (blocking; runs in the worker pool)"""
+    vectors = model.encode(
+        texts,
+        batch_size=settings.embedding_max_batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    )
+    return vectors.tolist()
+
+
+async def embed(texts: List[str]) -> List[List[float]]:
+    """
+    Embed texts with the local model in a worker thread
+
+    Tokenization and inference in torch / onnxruntime release the GIL, so
+    the event loop keeps serving requests while a batch is encoded.
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        Unit-length embeddings in the same order as texts
+    """
+    if not model:
+        await initialize()
+    return await asyncio.get_running_loop().run_in_executor(_executor, _encode, texts)
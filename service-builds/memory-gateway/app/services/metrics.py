@@ -0,0 +1,130 @@
+"""
+Metrics Service
+Prometheus histograms, counters and gauges for requests, storage layer calls,
+caches and connection pools (served on /metrics); layer calls are also traced
+"""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from typing import Optional, Callable, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from app.services import tracing
+
+# Latency buckets (seconds): sub-millisecond cache reads up to slow embedding calls
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_SECONDS = Histogram(
+    "memory_gateway_request_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=BUCKETS,
+)
+
+LAYER_SECONDS = Histogram(
+    "memory_gateway_layer_seconds",
+    "Storage layer call latency (outcome: ok, error, cancelled)",
+    ["layer", "operation", "outcome"],
+    buckets=BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "memory_gateway_cache_requests_total",
+    "Cache lookups by cache tier and result (hit, miss)",
+    ["cache", "result"],
+)
+
+POOL_CONNECTIONS = Gauge(
+    "memory_gateway_pool_connections",
+    "Connection pool state (state: open, in_use, idle, max)",
+    ["pool", "state"],
+)
+
+EMBEDDING_CACHE_ENTRIES = Gauge(
+    "memory_gateway_embedding_cache_entries",
+    "Embeddings held in the in-process LRU",
+)
+
+VALKEY_USED_MEMORY = Gauge(
+    "memory_gateway_valkey_used_memory_bytes",
+    "Valkey used_memory (INFO)",
+)
+
+VALKEY_CONNECTED_CLIENTS = Gauge(
+    "memory_gateway_valkey_connected_clients",
+    "Valkey connected_clients across all gateway replicas and other clients (INFO)",
+)
+
+
+@contextmanager
+def observe(layer: str, operation: str) -> Iterator[None]:
+    """
+    Time a block as one storage layer call (histogram sample + trace span)
+
+    Args:
+        layer: Storage layer (postgres, embeddings, qdrant, pgvector, zep, valkey)
+        operation: Operation name within the layer
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    with tracing.tracer.start_as_current_span(
+        f"{layer}.{operation}", attributes={"memory.layer": layer}
+    ) as span:
+        try:
+            yield
+            outcome = "ok"
+        except asyncio.CancelledError:
+            # Layer timeouts (asyncio.wait_for) cancel the call
+            outcome = "cancelled"
+            raise
+        finally:
+            span.set_attribute("memory.outcome", outcome)
+            LAYER_SECONDS.labels(layer, operation, outcome).observe(time.perf_counter() - start)
+
+
+def timed(layer: str, operation: Optional[str] = None) -> Callable:
+    """
+    Decorator recording an async service function in the layer latency histogram
+
+    Args:
+        layer: Storage layer the function talks to
+        operation: Operation label (defaults to the function name)
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        name = operation or fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with observe(layer, name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_cache(cache: str, hits: int, misses: int):
+    """Count cache lookups for one cache tier"""
+    if hits:
+        CACHE_REQUESTS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache, "miss").inc(misses)
+
+
+def record_pool(pool: str, open_connections: int, in_use: int, max_size: Optional[int]):
+    """Set connection pool gauges (read at scrape time)"""
+    POOL_CONNECTIONS.labels(pool, "open").set(open_connections)
+    POOL_CONNECTIONS.labels(pool, "in_use").set(in_use)
+    POOL_CONNECTIONS.labels(pool, "idle").set(max(0, open_connections - in_use))
+    if max_size is not None:
+        POOL_CONNECTIONS.labels(pool, "max").set(max_size)
+
+
+def render() -> bytes:
+    """Current metrics in the Prometheus text format"""
+    return generate_latest()
+
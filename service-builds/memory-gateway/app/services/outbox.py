@@ -0,0 +1,139 @@
+"""
+Outbox Service
+Background worker that drains the memory outbox (write-behind /remember)
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.config import Settings
+from app.services import layers, postgres, recall_cache
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Global worker task and wake-up signal
+_worker: Optional[asyncio.Task] = None
+_wake: Optional[asyncio.Event] = None
+
+MAX_RETRY_DELAY = 300  # seconds
+
+
+async def start():
+    """Start the outbox worker"""
+    global _worker, _wake
+    if _worker or not settings.outbox_worker_enabled:
+        return
+
+    _wake = asyncio.Event()
+    _worker = asyncio.create_task(_run())
+    logger.info("Outbox worker started")
+
+
+async def stop():
+    """Stop the outbox worker (pending entries stay in the outbox)"""
+    global _worker
+    if _worker:
+        _worker.cancel()
+        try:
+            await _worker
+        except asyncio.CancelledError:
+            pass
+        _worker = None
+        logger.info("Outbox worker stopped")
+
+
+def notify():
+    """Wake the worker after a new outbox entry was committed"""
+    if _wake:
+        _wake.set()
+
+
+def _retry_delay(attempts: int) -> float:
+    """Exponential backoff for the next attempt"""
+    return min(settings.outbox_retry_base_seconds * (2 ** (attempts - 1)), MAX_RETRY_DELAY)
+
+
+async def drain_once() -> int:
+    """
+    Claim and replicate one batch of due outbox entries
+
+    Layers that succeed are removed from the entry, so a retry only redoes
+    the layers that failed. Entries are keyed on memory_id; Qdrant, pgvector
+    and Valkey writes are idempotent on it. A Zep write that timed out may
+    have landed, so it is dropped rather than replayed (a replay would
+    duplicate the message in the session).
+
+    Returns:
+        Number of entries processed
+    """
+    entries = await postgres.claim_outbox_entries(
+        limit=settings.outbox_batch_size,
+        lease_seconds=settings.outbox_lease_seconds,
+    )
+
+    async def process(entry):
+        memory_id = entry["memory_id"]
+        payload = entry["payload"]
+        results = await layers.replicate(
+            memory_id=memory_id,
+            client_id=entry["client_id"],
+            content=payload["content"],
+            memory_type=payload["memory_type"],
+            metadata=payload.get("metadata"),
+            layers=entry["pending_layers"],
+        )
+        failed = [layer for layer, ok in results.items() if ok is False]
+        unknown = [layer for layer, ok in results.items() if ok is None]
+        if unknown:
+            logger.warning(f"Memory {memory_id} outcome unknown in {unknown} - not retried")
+        if len(failed) < len(results):
+            await recall_cache.invalidate([entry["client_id"]])
+
+        if not failed:
+            await postgres.complete_outbox_entry(memory_id)
+            logger.info(f"Memory {memory_id} replicated from outbox to {list(results)}")
+            return
+
+        dead = entry["attempts"] >= settings.outbox_max_attempts
+        await postgres.reschedule_outbox_entry(
+            memory_id,
+            pending_layers=failed,
+            error=f"failed layers: {', '.join(failed)}",
+            retry_in_seconds=_retry_delay(entry["attempts"]),
+            dead=dead,
+        )
+        if dead:
+            logger.error(f"Memory {memory_id} outbox entry gave up after {entry['attempts']} attempts ({failed})")
+        else:
+            logger.warning(f"Memory {memory_id} outbox retry scheduled for {failed}")
+
+    results = await asyncio.gather(*(process(entry) for entry in entries), return_exceptions=True)
+    for entry, result in zip(entries, results):
+        if isinstance(result, Exception):
+            # The lease expires and the entry is claimed again
+            logger.error(f"Outbox entry {entry['memory_id']} failed: {result}")
+    return len(entries)
+
+
+async def _run():
+    """Worker loop: drain while there is work, then wait for a wake-up or the poll interval"""
+    while True:
+        _wake.clear()
+        try:
+            processed = await drain_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Outbox drain failed: {e}")
+            processed = 0
+
+        if processed >= settings.outbox_batch_size:
+            continue
+
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=settings.outbox_poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
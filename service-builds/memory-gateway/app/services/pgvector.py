@@ -0,0 +1,240 @@
+"""
+pgvector Service
+In-database vector storage and search on memory_entries (shares the Postgres pool)
+"""
+
+import json
+import logging
+from typing import Optional, Dict, Any, List
+
+from app.config import Settings
+from app.services import embeddings, metrics, postgres
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+SOURCE_TYPE = "memory"
+
+
+async def initialize():
+    """
+    Check that memory_entries.embedding matches the embedding size
+
+    The column is VECTOR(1536) (migration 001); shortened or local-model
+    embeddings cannot be written to it, so pgvector is refused rather than
+    silently failing every write.
+    """
+    if not postgres.pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    # pgvector stores the declared dimension as the column's type modifier
+    column_dims = await postgres.pool.fetchval(
+        """
+        SELECT atttypmod FROM pg_attribute
+        WHERE attrelid = 'memory_entries'::regclass AND attname = 'embedding'
+        """
+    )
+    vector_size = embeddings.dimensions()
+    if column_dims and column_dims > 0 and column_dims != vector_size:
+        raise RuntimeError(
+            f"memory_entries.embedding is VECTOR({column_dims}) but embeddings are "
+            f"{vector_size}-dim - resize the column (see migration 006) or remove pgvector "
+            "from VECTOR_STORE / VECTOR_FALLBACK_STORE"
+        )
+    logger.info(f"pgvector enabled ({vector_size} dims)")
+
+
+def _to_vector(embedding: List[float]) -> str:
+    """pgvector text literal, sent with a ::vector cast"""
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
+
+async def store_memory_vector(
+    memory_id: int,
+    content: str,
+    client_id: int,
+    memory_type: str,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Store a memory and its embedding in memory_entries
+
+    Idempotent on memory_id.
+
+    Args:
+        memory_id: Memory ID from Postgres (events.id)
+        content: Memory content
+        client_id: Client/user ID
+        memory_type: Type of memory
+        metadata: Additional metadata
+
+    Returns:
+        Success status
+    """
+    stored = await store_memory_vectors(
+        [
+            {
+                "memory_id": memory_id,
+                "content": content,
+                "client_id": client_id,
+                "memory_type": memory_type,
+                "metadata": metadata,
+            }
+        ]
+    )
+    return bool(stored)
+
+
+@metrics.timed("pgvector")
+async def store_memory_vectors(memories: List[Dict[str, Any]]) -> List[int]:
+    """
+    Store many memories and their embeddings in memory_entries
+
+    Contents are embedded in batched requests and written with one
+    executemany; rows for memories already stored are updated in place.
+
+    Args:
+        memories: Dicts with memory_id, content, client_id, memory_type, metadata
+
+    Returns:
+        Memory IDs that were stored
+    """
+    if not postgres.pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    if not memories:
+        return []
+
+    vectors = await embeddings.embed_texts([memory["content"] for memory in memories])
+    ttl_days = settings.pgvector_ttl_days
+
+    try:
+        await postgres.pool.executemany(
+            """
+            INSERT INTO memory_entries
+                (memory_id, client_id, content, embedding, source_type, memory_type,
+                 metadata, ttl_days, expires_at)
+            VALUES ($1, $2, $3, $4::vector, $5, $6, $7::jsonb, $8,
+                    NOW() + make_interval(days => $8))
+            ON CONFLICT (memory_id) DO UPDATE SET
+                content = EXCLUDED.content,
+                embedding = EXCLUDED.embedding,
+                memory_type = EXCLUDED.memory_type,
+                metadata = EXCLUDED.metadata,
+                updated_at = NOW()
+            """,
+            [
+                (
+                    memory["memory_id"],
+                    memory["client_id"],
+                    memory["content"],
+                    _to_vector(vector),
+                    SOURCE_TYPE,
+                    memory["memory_type"],
+                    json.dumps(memory.get("metadata") or {}),
+                    ttl_days,
+                )
+                for memory, vector in zip(memories, vectors)
+            ],
+        )
+        logger.debug(f"{len(memories)} memories stored in pgvector")
+        return [memory["memory_id"] for memory in memories]
+
+    except Exception as e:
+        logger.error(f"Failed to store memory vectors in pgvector: {e}")
+        raise
+
+
+@metrics.timed("pgvector")
+async def search_memories(
+    query: str,
+    client_id: int,
+    k: int = 10,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+    probes: Optional[int] = None,
+    ef_search: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search memories by cosine distance (ORDER BY embedding <=> query)
+
+    ivfflat.probes and hnsw.ef_search are set per query (SET LOCAL inside
+    the query's transaction), so whichever index type reindex_vectors.py
+    built is tuned: more probes / a wider beam trade latency for recall.
+
+    Args:
+        query: Search query
+        client_id: Client/user ID
+        k: Number of results
+        memory_type: Optional memory type filter
+        query_embedding: Precomputed query embedding (skips embedding the query)
+        probes: ivfflat lists to scan (defaults to pgvector_probes)
+        ef_search: HNSW beam width (defaults to pgvector_ef_search)
+
+    Returns:
+        List of matching memories with scores
+    """
+    if not postgres.pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    if query_embedding is None:
+        query_embedding = await embeddings.embed_text(query)
+    probes = settings.pgvector_probes if probes is None else probes
+    ef_search = settings.pgvector_ef_search if ef_search is None else ef_search
+
+    try:
+        async with postgres.pool.acquire() as conn:
+            async with conn.transaction():
+                # SET does not take bind parameters; both values are ints
+                await conn.execute(f"SET LOCAL ivfflat.probes = {int(probes)}")
+                await conn.execute(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+                rows = await conn.fetch(
+                    """
+                    SELECT memory_id, content, memory_type, metadata, created_at,
+                           1 - (embedding <=> $1::vector) AS score
+                    FROM memory_entries
+                    WHERE client_id = $2
+                      AND source_type = $3
+                      AND ($4::text IS NULL OR memory_type = $4)
+                      AND (expires_at IS NULL OR expires_at > NOW())
+                    ORDER BY embedding <=> $1::vector
+                    LIMIT $5
+                    """,
+                    _to_vector(query_embedding),
+                    client_id,
+                    SOURCE_TYPE,
+                    memory_type,
+                    k,
+                )
+
+        memories = [
+            {
+                "memory_id": row["memory_id"],
+                "content": row["content"],
+                "memory_type": row["memory_type"],
+                "similarity_score": float(row["score"]),
+                "stored_at": row["created_at"].isoformat(),
+                "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
+            }
+            for row in rows
+        ]
+        logger.debug(f"Found {len(memories)} memories in pgvector")
+        return memories
+
+    except Exception as e:
+        logger.error(f"Failed to search pgvector memories: {e}")
+        raise
+
+
+async def check_connection() -> bool:
+    """Check that memory_entries is reachable"""
+    if not postgres.pool:
+        return False
+
+    try:
+        await postgres.pool.fetchval("SELECT 1 FROM memory_entries LIMIT 1")
+        return True
+    except Exception as e:
+        logger.error(f"pgvector connection check failed: {e}")
+        return False
@@ -3,13 +3,15 @@ PostgreSQL Service
 Connection pooling and event storage
 """
 
+import base64
 import logging
 import json
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 import asyncpg
 from app.config import Settings
+from app.services import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,7 @@ async def close():
         logger.info("Postgres pool closed")
 
 
+@metrics.timed("postgres")
 async def insert_event(
     event_type: str,
     event_source: str,
@@ -95,20 +98,56 @@ async def insert_event(
         raise
 
 
+def encode_cursor(event: Dict[str, Any]) -> str:
+    """
+    Opaque keyset cursor pointing just after an event from get_events
+
+    Args:
+        event: Last event of a page (needs created_at and id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{event['created_at']}|{event['id']}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor from encode_cursor into its (created_at, id) key
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, event_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(event_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+@metrics.timed("postgres")
 async def get_events(
     client_id: int,
     event_type: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Retrieve events for a client
+    Retrieve events for a client, newest first
+
+    Pages with a keyset cursor on (created_at, id): pass encode_cursor() of
+    the last event of a page to get the next one. With the composite
+    indexes from migration 007 every page is an index range scan, however
+    deep. offset is still accepted but costs O(offset); prefer cursor.
 
     Args:
         client_id: Client/user ID
         event_type: Optional event type filter
         limit: Number of results to return
-        offset: Result offset for pagination
+        offset: Result offset for pagination (ignored when cursor is given)
+        cursor: Keyset cursor from encode_cursor
 
     Returns:
         List of events
@@ -116,25 +155,28 @@ async def get_events(
     if not pool:
         raise RuntimeError("Postgres pool not initialized")
 
+    conditions = ["client_id = $1"]
+    params: List[Any] = [client_id]
+    if event_type:
+        params.append(event_type)
+        conditions.append(f"event_type = ${len(params)}")
+    if cursor:
+        created_at, event_id = decode_cursor(cursor)
+        params.extend([created_at, event_id])
+        conditions.append(f"(created_at, id) < (${len(params) - 1}, ${len(params)})")
+        offset = 0
+    params.extend([limit, offset])
+
+    query = f"""
+    SELECT id, event_type, event_source, client_id, payload, metadata, created_at
+    FROM events
+    WHERE {" AND ".join(conditions)}
+    ORDER BY created_at DESC, id DESC
+    LIMIT ${len(params) - 1} OFFSET ${len(params)}
+    """
+
     try:
-        if event_type:
-            query = """
-            SELECT id, event_type, event_source, client_id, payload, metadata, created_at
-            FROM events
-            WHERE client_id = $1 AND event_type = $2
-            ORDER BY created_at DESC
-            LIMIT $3 OFFSET $4
-            """
-            rows = await pool.fetch(query, client_id, event_type, limit, offset)
-        else:
-            query = """
-            SELECT id, event_type, event_source, client_id, payload, metadata, created_at
-            FROM events
-            WHERE client_id = $1
-            ORDER BY created_at DESC
-            LIMIT $2 OFFSET $3
-            """
-            rows = await pool.fetch(query, client_id, limit, offset)
+        rows = await pool.fetch(query, *params)
 
         events = []
         for row in rows:
@@ -157,6 +199,123 @@ async def get_events(
         raise
 
 
+@metrics.timed("postgres")
+async def get_memories_by_ids(client_id: int, memory_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    Fetch memory events by ID in one query
+
+    Args:
+        client_id: Client/user ID (only the client's own memories are returned)
+        memory_ids: Memory (event) IDs
+
+    Returns:
+        Memory bodies (memory_id, content, memory_type, metadata, stored_at)
+    """
+    if not pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    if not memory_ids:
+        return []
+
+    try:
+        rows = await pool.fetch(
+            """
+            SELECT id, payload, metadata, created_at
+            FROM events
+            WHERE id = ANY($1::bigint[]) AND client_id = $2
+            """,
+            memory_ids,
+            client_id,
+        )
+
+        memories = []
+        for row in rows:
+            payload = json.loads(row["payload"]) if row["payload"] else {}
+            memories.append(
+                {
+                    "memory_id": row["id"],
+                    "content": payload.get("content", ""),
+                    "memory_type": payload.get("memory_type", "fact"),
+                    "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
+                    "stored_at": row["created_at"].isoformat(),
+                }
+            )
+        return memories
+
+    except Exception as e:
+        logger.error(f"Failed to retrieve memories by ID: {e}")
+        raise
+
+
+@metrics.timed("postgres")
+async def search_memories_lexical(
+    client_id: int,
+    query: str,
+    k: int = 10,
+    memory_type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Full-text search over memory content (GIN index from migration 005)
+
+    The query is parsed with websearch_to_tsquery, so quoted phrases, OR
+    and -term work; results are ranked by ts_rank_cd.
+
+    Args:
+        client_id: Client/user ID
+        query: Search query
+        k: Number of results
+        memory_type: Optional memory type filter
+
+    Returns:
+        Memory bodies (memory_id, content, memory_type, metadata, stored_at)
+        with a "rank" score, best first
+    """
+    if not pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    # The expression and event_type predicate must match the index definition
+    sql = """
+    SELECT id, payload, metadata, created_at,
+           ts_rank_cd(to_tsvector('english', COALESCE(payload->>'content', '')), q) AS rank
+    FROM events, websearch_to_tsquery('english', $2) AS q
+    WHERE client_id = $1
+      AND event_type LIKE 'memory:%'
+      AND ($4::text IS NULL OR event_type = $4)
+      AND to_tsvector('english', COALESCE(payload->>'content', '')) @@ q
+    ORDER BY rank DESC, created_at DESC
+    LIMIT $3
+    """
+
+    try:
+        rows = await pool.fetch(
+            sql,
+            client_id,
+            query,
+            k,
+            f"memory:{memory_type}" if memory_type else None,
+        )
+
+        memories = []
+        for row in rows:
+            payload = json.loads(row["payload"]) if row["payload"] else {}
+            memories.append(
+                {
+                    "memory_id": row["id"],
+                    "content": payload.get("content", ""),
+                    "memory_type": payload.get("memory_type", "fact"),
+                    "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
+                    "stored_at": row["created_at"].isoformat(),
+                    "rank": float(row["rank"]),
+                }
+            )
+        return memories
+
+    except Exception as e:
+        logger.error(f"Failed lexical memory search: {e}")
+        raise
+
+
+# Not timed itself: insert_event records the sample
 async def store_memory(
     client_id: int,
     content: str,
@@ -189,6 +348,244 @@ async def store_memory(
     )
 
 
+@metrics.timed("postgres")
+async def store_memory_with_outbox(
+    client_id: int,
+    content: str,
+    memory_type: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    layers: Optional[List[str]] = None,
+) -> int:
+    """
+    Store a memory event and its outbox record in one transaction
+
+    The outbox record lists the supplementary layers still to be written;
+    the outbox worker drains it in the background.
+
+    Args:
+        client_id: Client/user ID
+        content: Memory content
+        memory_type: Type of memory (fact, event, preference, observation)
+        metadata: Additional metadata
+        layers: Supplementary layers to replicate to (e.g. ["zep", "qdrant", "valkey"])
+
+    Returns:
+        Memory ID (event ID)
+    """
+    if not pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    payload = {
+        "content": content,
+        "memory_type": memory_type,
+    }
+
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                memory_id = await conn.fetchval(
+                    """
+                    INSERT INTO events (event_type, event_source, client_id, payload, metadata, created_at)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    RETURNING id
+                    """,
+                    f"memory:{memory_type}",
+                    "memory-gateway",
+                    client_id,
+                    json.dumps(payload),
+                    json.dumps(metadata) if metadata else None,
+                    datetime.utcnow(),
+                )
+                await conn.execute(
+                    """
+                    INSERT INTO memory_outbox (memory_id, client_id, payload, pending_layers)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (memory_id) DO NOTHING
+                    """,
+                    memory_id,
+                    client_id,
+                    json.dumps({**payload, "metadata": metadata}),
+                    layers or [],
+                )
+
+        logger.debug(f"Memory {memory_id} stored with outbox record ({layers})")
+        return memory_id
+
+    except Exception as e:
+        logger.error(f"Failed to store memory with outbox: {e}")
+        raise
+
+
+@metrics.timed("postgres")
+async def store_memories_batch(
+    memories: List[Dict[str, Any]],
+    outbox_layers: Optional[List[str]] = None,
+) -> List[int]:
+    """
+    Store many memories as events with one multi-row INSERT
+
+    Args:
+        memories: Dicts with client_id, content, memory_type, metadata
+        outbox_layers: If given, also write an outbox record per memory
+            (same transaction) listing the layers to replicate to
+
+    Returns:
+        Memory IDs (event IDs) in input order
+    """
+    if not pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    payloads = [
+        {"content": memory["content"], "memory_type": memory["memory_type"]}
+        for memory in memories
+    ]
+
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                rows = await conn.fetch(
+                    """
+                    INSERT INTO events (event_type, event_source, client_id, payload, metadata, created_at)
+                    SELECT t.event_type, 'memory-gateway', t.client_id, t.payload::jsonb, t.metadata::jsonb, $5
+                    FROM unnest($1::text[], $2::int[], $3::text[], $4::text[])
+                        WITH ORDINALITY AS t(event_type, client_id, payload, metadata, ord)
+                    ORDER BY t.ord
+                    RETURNING id
+                    """,
+                    [f"memory:{memory['memory_type']}" for memory in memories],
+                    [memory["client_id"] for memory in memories],
+                    [json.dumps(payload) for payload in payloads],
+                    [
+                        json.dumps(memory["metadata"]) if memory.get("metadata") else None
+                        for memory in memories
+                    ],
+                    datetime.utcnow(),
+                )
+                # BIGSERIAL ids are assigned in row order within one statement
+                memory_ids = sorted(row["id"] for row in rows)
+
+                if outbox_layers is not None:
+                    await conn.executemany(
+                        """
+                        INSERT INTO memory_outbox (memory_id, client_id, payload, pending_layers)
+                        VALUES ($1, $2, $3, $4)
+                        ON CONFLICT (memory_id) DO NOTHING
+                        """,
+                        [
+                            (
+                                memory_id,
+                                memory["client_id"],
+                                json.dumps({**payload, "metadata": memory.get("metadata")}),
+                                outbox_layers,
+                            )
+                            for memory_id, memory, payload in zip(memory_ids, memories, payloads)
+                        ],
+                    )
+
+        logger.debug(f"{len(memory_ids)} memories inserted in one batch")
+        return memory_ids
+
+    except Exception as e:
+        logger.error(f"Failed to insert memory batch: {e}")
+        raise
+
+
+@metrics.timed("postgres")
+async def claim_outbox_entries(limit: int, lease_seconds: float) -> List[Dict[str, Any]]:
+    """
+    Claim due outbox entries for replication
+
+    Claimed rows are leased by pushing next_attempt_at forward, so other
+    gateway replicas skip them until the lease expires (SKIP LOCKED).
+
+    Args:
+        limit: Maximum entries to claim
+        lease_seconds: How long the claim is held before another worker may retry
+
+    Returns:
+        List of outbox entries
+    """
+    if not pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    query = """
+    UPDATE memory_outbox
+    SET attempts = attempts + 1,
+        next_attempt_at = NOW() + make_interval(secs => $2),
+        updated_at = NOW()
+    WHERE memory_id IN (
+        SELECT memory_id FROM memory_outbox
+        WHERE status = 'pending' AND next_attempt_at <= NOW()
+        ORDER BY next_attempt_at
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING memory_id, client_id, payload, pending_layers, attempts
+    """
+
+    try:
+        rows = await pool.fetch(query, limit, float(lease_seconds))
+        return [
+            {
+                "memory_id": row["memory_id"],
+                "client_id": row["client_id"],
+                "payload": json.loads(row["payload"]),
+                "pending_layers": list(row["pending_layers"]),
+                "attempts": row["attempts"],
+            }
+            for row in rows
+        ]
+    except Exception as e:
+        logger.error(f"Failed to claim outbox entries: {e}")
+        raise
+
+
+async def complete_outbox_entry(memory_id: int):
+    """Remove a fully replicated outbox entry"""
+    if not pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    await pool.execute("DELETE FROM memory_outbox WHERE memory_id = $1", memory_id)
+
+
+async def reschedule_outbox_entry(
+    memory_id: int,
+    pending_layers: List[str],
+    error: str,
+    retry_in_seconds: float,
+    dead: bool = False,
+):
+    """
+    Record a failed replication attempt
+
+    Args:
+        memory_id: Memory ID of the outbox entry
+        pending_layers: Layers that still need to be written
+        error: Error summary from this attempt
+        retry_in_seconds: Backoff before the next attempt
+        dead: Stop retrying (attempts exhausted)
+    """
+    if not pool:
+        raise RuntimeError("Postgres pool not initialized")
+
+    await pool.execute(
+        """
+        UPDATE memory_outbox
+        SET pending_layers = $2,
+            last_error = $3,
+            next_attempt_at = NOW() + make_interval(secs => $4),
+            status = $5,
+            updated_at = NOW()
+        WHERE memory_id = $1
+        """,
+        memory_id,
+        pending_layers,
+        error,
+        float(retry_in_seconds),
+        "dead" if dead else "pending",
+    )
+
+
 async def check_connection() -> bool:
     """Check if Postgres is accessible"""
     if not pool:
@@ -5,83 +5,166 @@ Vector search and semantic memory operations
 
 import logging
 import hashlib
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-import httpx
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    IntegerIndexParams,
+    KeywordIndexParams,
+    PayloadSchemaType,
+    SearchParams,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+)
 
 from app.config import Settings
+from app.services import embeddings, metrics
 
 logger = logging.getLogger(__name__)
 
 settings = Settings()
 
-# Global Qdrant client
-client: Optional[QdrantClient] = None
+# Global Qdrant client (async; REST or gRPC transport)
+client: Optional[AsyncQdrantClient] = None
 
-VECTOR_SIZE = 1536
-COLLECTION_NAME = "events"
+# May be a collection or an alias (migrate_dimensions.py flips the alias)
+COLLECTION_NAME = settings.qdrant_collection
+
+# Payload indexes for the fields recall filters on; without them Qdrant has to
+# load and check payloads while traversing the HNSW graph
+PAYLOAD_INDEXES = {
+    "client_id": IntegerIndexParams(type=PayloadSchemaType.INTEGER, lookup=True, range=False),
+    "memory_type": KeywordIndexParams(type=PayloadSchemaType.KEYWORD),
+    "timestamp": PayloadSchemaType.DATETIME,
+}
+
+# Quantized copies stay in RAM for HNSW traversal; originals are used to rescore
+QUANTIZATION_CONFIGS = {
+    "none": None,
+    "scalar": ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+    ),
+    "binary": BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True)),
+}
+
+# Set once the collection and its payload indexes are known to exist
+_collection_ready = False
 
 
 async def initialize():
     """Initialize Qdrant client"""
     global client
     try:
-        client = QdrantClient(url=settings.qdrant_url)
-        # Test connection
+        client = AsyncQdrantClient(
+            host=settings.qdrant_host,
+            port=settings.qdrant_port,
+            grpc_port=settings.qdrant_grpc_port,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            timeout=settings.qdrant_timeout_seconds,
+        )
+        # Test connection (creates the collection and payload indexes if missing)
         try:
-            info = client.get_collection(COLLECTION_NAME)
-            logger.info(f"Qdrant initialized. Collection '{COLLECTION_NAME}' exists")
+            await ensure_collection()
+            logger.info(f"Qdrant initialized. Collection '{COLLECTION_NAME}' ready")
         except Exception as e:
-            logger.warning(f"Collection '{COLLECTION_NAME}' does not exist yet: {e}")
-            # Collection will be created on first vector storage
+            logger.warning(f"Collection '{COLLECTION_NAME}' not ready yet: {e}")
+            # Retried on first vector storage
     except Exception as e:
         logger.warning(f"Qdrant connection failed - will operate in degraded mode: {e}")
         # Don't fail startup, Qdrant is supplementary
 
 
+async def ensure_collection():
+    """
+    Create the collection and its payload indexes if they do not exist
+
+    Safe to call repeatedly: existing indexes are left untouched, so this
+    also backfills indexes on collections created before they were added.
+    """
+    global _collection_ready
+    if _collection_ready:
+        return
+    if not client:
+        raise RuntimeError("Qdrant client not initialized")
+
+    vector_size = embeddings.dimensions()
+    aliases = {alias.alias_name for alias in (await client.get_aliases()).aliases}
+    if COLLECTION_NAME not in aliases and not await client.collection_exists(COLLECTION_NAME):
+        await client.create_collection(
+            collection_name=COLLECTION_NAME,
+            vectors_config=VectorParams(
+                size=vector_size,
+                distance=Distance.COSINE,
+                on_disk=settings.qdrant_vectors_on_disk,
+            ),
+            quantization_config=QUANTIZATION_CONFIGS[settings.qdrant_quantization],
+        )
+        logger.info(
+            f"Created Qdrant collection '{COLLECTION_NAME}' "
+            f"(quantization={settings.qdrant_quantization}, "
+            f"on_disk={settings.qdrant_vectors_on_disk})"
+        )
+
+    info = await client.get_collection(COLLECTION_NAME)
+    vectors = info.config.params.vectors
+    if getattr(vectors, "size", vector_size) != vector_size:
+        # Refuse (and re-check on the next write) rather than upsert vectors of the wrong size
+        raise RuntimeError(
+            f"Collection '{COLLECTION_NAME}' holds {vectors.size}-dim vectors but embeddings "
+            f"are {vector_size}-dim - set QDRANT_COLLECTION / EMBEDDING_DIMENSIONS to match "
+            "(see migrate_dimensions.py)"
+        )
+    existing = set((info.payload_schema or {}).keys())
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        if field_name in existing:
+            continue
+        await client.create_payload_index(
+            collection_name=COLLECTION_NAME,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+        logger.info(f"Created Qdrant payload index on '{field_name}'")
+
+    _collection_ready = True
+
+
+async def close():
+    """Close Qdrant client"""
+    global client, _collection_ready
+    _collection_ready = False
+    if client:
+        await client.close()
+        client = None
+        logger.info("Qdrant client closed")
+
+
 async def embed_text(text: str) -> List[float]:
     """
     Generate embeddings for text using OpenAI API via OpenRouter
 
+    Delegates to the pooled, micro-batched embeddings service.
+
     Args:
         text: Text to embed
 
     Returns:
         Vector embedding
     """
-    try:
-        # Use OpenRouter to access OpenAI's embedding model
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.post(
-                "https://openrouter.ai/api/v1/embeddings",
-                headers={
-                    "Authorization": f"Bearer {settings.openrouter_api_key}",
-                    "HTTP-Referer": "https://bestviable.com",
-                },
-                json={
-                    "model": "openai/text-embedding-3-small",
-                    "input": text,
-                },
-                timeout=30,
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                embedding = data["data"][0]["embedding"]
-                logger.debug(f"Generated embedding for text ({len(embedding)} dims)")
-                return embedding
-            else:
-                logger.error(f"Embedding API error: {response.status_code} - {response.text}")
-                raise Exception(f"Failed to generate embedding: {response.status_code}")
-
-    except Exception as e:
-        logger.error(f"Failed to embed text: {e}")
-        raise
+    return await embeddings.embed_text(text)
 
 
+@metrics.timed("qdrant")
 async def store_memory_vector(
     memory_id: int,
     content: str,
@@ -107,6 +190,8 @@ async def store_memory_vector(
         return False
 
     try:
+        await ensure_collection()
+
         # Generate embedding
         embedding = await embed_text(content)
 
@@ -125,7 +210,7 @@ async def store_memory_vector(
         )
 
         # Upsert point
-        client.upsert(
+        await client.upsert(
             collection_name=COLLECTION_NAME,
             points=[point],
         )
@@ -138,11 +223,150 @@ async def store_memory_vector(
         raise
 
 
+@metrics.timed("qdrant")
+async def store_memory_vectors(memories: List[Dict[str, Any]]) -> List[int]:
+    """
+    Store many memories as vectors in Qdrant
+
+    Contents are embedded in batched requests and points are upserted in
+    chunks of qdrant_upsert_batch_size.
+
+    Args:
+        memories: Dicts with memory_id, content, client_id, memory_type, metadata
+
+    Returns:
+        Memory IDs that were stored
+    """
+    if not client:
+        logger.warning("Qdrant client not initialized - skipping vector storage")
+        return []
+
+    await ensure_collection()
+    vectors = await embeddings.embed_texts([memory["content"] for memory in memories])
+    timestamp = datetime.utcnow().isoformat()
+    points = [
+        PointStruct(
+            id=memory["memory_id"],
+            vector=vector,
+            payload={
+                "memory_id": memory["memory_id"],
+                "client_id": memory["client_id"],
+                "content": memory["content"],
+                "memory_type": memory["memory_type"],
+                "timestamp": timestamp,
+                **(memory.get("metadata") or {}),
+            },
+        )
+        for memory, vector in zip(memories, vectors)
+    ]
+
+    stored: List[int] = []
+    size = settings.qdrant_upsert_batch_size
+    for i in range(0, len(points), size):
+        chunk = points[i : i + size]
+        try:
+            await client.upsert(collection_name=COLLECTION_NAME, points=chunk)
+            stored.extend(point.id for point in chunk)
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(chunk)} memory vectors: {e}")
+
+    logger.debug(f"{len(stored)}/{len(points)} memories stored in Qdrant")
+    return stored
+
+
+def _build_filter(client_id: int, memory_type: Optional[str] = None) -> Filter:
+    """Filter on client_id (+ memory_type if provided)"""
+    conditions = [FieldCondition(key="client_id", match=MatchValue(value=client_id))]
+    if memory_type:
+        conditions.append(FieldCondition(key="memory_type", match=MatchValue(value=memory_type)))
+    return Filter(must=conditions)
+
+
+def _search_params(
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None,
+) -> Optional[SearchParams]:
+    """
+    Per-request search parameters, defaulting to qdrant_hnsw_ef / qdrant_exact_search
+
+    With quantization configured, the quantized vectors pick
+    k * qdrant_quantization_oversampling candidates which are rescored
+    against the float32 originals. Returns None (server defaults) when
+    nothing is configured.
+    """
+    hnsw_ef = settings.qdrant_hnsw_ef if hnsw_ef is None else hnsw_ef
+    exact = settings.qdrant_exact_search if exact is None else exact
+    quantization = None
+    if settings.qdrant_quantization != "none":
+        quantization = QuantizationSearchParams(
+            rescore=settings.qdrant_quantization_rescore,
+            oversampling=settings.qdrant_quantization_oversampling,
+        )
+    if hnsw_ef is None and not exact and quantization is None:
+        return None
+    return SearchParams(hnsw_ef=hnsw_ef, exact=exact, quantization=quantization)
+
+
+@metrics.timed("qdrant")
+async def search_memory_ids(
+    query: str,
+    client_id: int,
+    k: int = 10,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Search for memory IDs using semantic similarity, without payloads
+
+    Memory bodies are hydrated separately (Valkey, then Postgres), which
+    keeps Qdrant responses small.
+
+    Args:
+        query: Search query
+        client_id: Client/user ID
+        k: Number of results
+        memory_type: Optional memory type filter
+        query_embedding: Precomputed query embedding (skips embedding the query)
+        hnsw_ef: HNSW beam width override (defaults to qdrant_hnsw_ef)
+        exact: Exact-search override (defaults to qdrant_exact_search)
+
+    Returns:
+        (memory_id, score) pairs, best first
+    """
+    if not client:
+        logger.warning("Qdrant client not initialized - returning empty results")
+        return []
+
+    try:
+        if query_embedding is None:
+            query_embedding = await embed_text(query)
+
+        results = await client.search(
+            collection_name=COLLECTION_NAME,
+            query_vector=query_embedding,
+            query_filter=_build_filter(client_id, memory_type),
+            search_params=_search_params(hnsw_ef, exact),
+            limit=k,
+            with_payload=False,
+        )
+        return [(int(result.id), result.score) for result in results]
+
+    except Exception as e:
+        logger.error(f"Failed to search memory IDs: {e}")
+        raise
+
+
+@metrics.timed("qdrant")
 async def search_memories(
     query: str,
     client_id: int,
     k: int = 10,
     memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None,
 ) -> List[Dict[str, Any]]:
     """
     Search for memories using semantic similarity
@@ -152,6 +376,9 @@ async def search_memories(
         client_id: Client/user ID
         k: Number of results
         memory_type: Optional memory type filter
+        query_embedding: Precomputed query embedding (skips embedding the query)
+        hnsw_ef: HNSW beam width override (defaults to qdrant_hnsw_ef)
+        exact: Exact-search override (defaults to qdrant_exact_search)
 
     Returns:
         List of matching memories with scores
@@ -162,36 +389,15 @@ async def search_memories(
 
     try:
         # Generate query embedding
-        query_embedding = await embed_text(query)
-
-        # Build filter for client_id
-        query_filter = {
-            "must": [
-                {
-                    "key": "client_id",
-                    "match": {
-                        "value": client_id,
-                    },
-                },
-            ],
-        }
-
-        # Add memory_type filter if provided
-        if memory_type:
-            query_filter["must"].append(
-                {
-                    "key": "memory_type",
-                    "match": {
-                        "value": memory_type,
-                    },
-                }
-            )
+        if query_embedding is None:
+            query_embedding = await embed_text(query)
 
         # Search
-        results = client.search(
+        results = await client.search(
             collection_name=COLLECTION_NAME,
             query_vector=query_embedding,
-            query_filter=query_filter,
+            query_filter=_build_filter(client_id, memory_type),
+            search_params=_search_params(hnsw_ef, exact),
             limit=k,
             with_payload=True,
         )
@@ -235,7 +441,7 @@ async def check_connection() -> bool:
         return False
 
     try:
-        client.get_collection(COLLECTION_NAME)
+        await client.get_collection(COLLECTION_NAME)
         return True
     except Exception as e:
         logger.error(f"Qdrant connection check failed: {e}")
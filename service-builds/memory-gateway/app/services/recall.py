@@ -0,0 +1,492 @@
+"""
+Recall Service
+Multi-source memory search (Zep, Qdrant / pgvector, Postgres full-text) and result merging
+"""
+
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List
+
+from app.config import Settings
+from app.services import pgvector, postgres, qdrant, valkey, zep
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+
+async def search_zep(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Search the client's Zep Cloud session and convert hits to the result format"""
+    zep_results = await zep.search_memories(
+        session_id=f"client_{client_id}",
+        query=query,
+        limit=k,
+        min_relevance=0.6,
+    )
+    results = [
+        {
+            "memory_id": r["metadata"].get("memory_id", "unknown"),
+            "content": r["content"],
+            "memory_type": r["metadata"].get("memory_type", "fact"),
+            "similarity_score": r["similarity_score"],
+            "stored_at": r["created_at"],
+            "metadata": r["metadata"],
+            "source": "zep",
+        }
+        for r in zep_results
+    ]
+    # Zep sessions hold every memory type; apply the filter Qdrant applies server-side
+    if memory_type:
+        results = [r for r in results if r["memory_type"] == memory_type]
+    logger.info(f"Found {len(results)} results in Zep Cloud for client {client_id}")
+    return results
+
+
+async def hydrate_memories(client_id: int, memory_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Fetch memory bodies by ID: one Valkey MGET, then one Postgres query for misses
+
+    Bodies found only in Postgres are written back to Valkey. Cached bodies
+    without a stored_at (written before recall hydration existed) are treated
+    as misses, so the Postgres copy replaces them.
+
+    Args:
+        client_id: Client/user ID
+        memory_ids: Memory IDs to hydrate
+
+    Returns:
+        Mapping of memory_id to body (missing IDs are absent)
+    """
+    bodies: Dict[int, Dict[str, Any]] = {}
+    try:
+        cached = await valkey.get_cache_many(
+            [f"memory:{client_id}:{memory_id}" for memory_id in memory_ids]
+        )
+        for memory_id, body in zip(memory_ids, cached):
+            if body and body.get("stored_at"):
+                bodies[memory_id] = body
+    except Exception as e:
+        logger.warning(f"Valkey hydration failed: {e}")
+
+    missing = [memory_id for memory_id in memory_ids if memory_id not in bodies]
+    if missing:
+        rows = await postgres.get_memories_by_ids(client_id, missing)
+        for row in rows:
+            bodies[row["memory_id"]] = row
+        if rows:
+            try:
+                await valkey.set_cache_many(
+                    {f"memory:{client_id}:{row['memory_id']}": row for row in rows}
+                )
+            except Exception as e:
+                logger.warning(f"Failed to backfill hydrated memories: {e}")
+
+    logger.debug(
+        f"Hydrated {len(bodies)}/{len(memory_ids)} memories ({len(missing)} from Postgres)"
+    )
+    return bodies
+
+
+async def search_qdrant(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Semantic search in Qdrant
+
+    With recall_hydrate_from_cache, Qdrant returns IDs and scores only and
+    bodies are hydrated from Valkey/Postgres; otherwise bodies come from the
+    Qdrant payloads.
+    """
+    if settings.recall_hydrate_from_cache:
+        hits = await qdrant.search_memory_ids(
+            query=query,
+            client_id=client_id,
+            k=k,
+            memory_type=memory_type,
+            query_embedding=query_embedding,
+        )
+        bodies = await hydrate_memories(client_id, [memory_id for memory_id, _ in hits])
+        results = []
+        for memory_id, score in hits:
+            body = bodies.get(memory_id)
+            if body is None:
+                # Indexed in Qdrant but gone from Valkey and Postgres (e.g. deleted)
+                logger.warning(
+                    f"Qdrant hit {memory_id} for client {client_id} has no stored body - skipped"
+                )
+                continue
+            results.append(
+                {
+                    "memory_id": memory_id,
+                    "content": body.get("content", ""),
+                    "memory_type": body.get("memory_type", "fact"),
+                    "similarity_score": score,
+                    "stored_at": body["stored_at"],
+                    "metadata": body.get("metadata") or {},
+                }
+            )
+    else:
+        results = await qdrant.search_memories(
+            query=query,
+            client_id=client_id,
+            k=k,
+            memory_type=memory_type,
+            query_embedding=query_embedding,
+        )
+    for result in results:
+        result["source"] = "qdrant"
+    logger.info(f"Found {len(results)} results in Qdrant for client {client_id}")
+    return results
+
+
+async def search_pgvector(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """In-database vector search on memory_entries"""
+    results = await pgvector.search_memories(
+        query=query,
+        client_id=client_id,
+        k=k,
+        memory_type=memory_type,
+        query_embedding=query_embedding,
+    )
+    for result in results:
+        result["source"] = "pgvector"
+    logger.info(f"Found {len(results)} results in pgvector for client {client_id}")
+    return results
+
+
+_VECTOR_SEARCHES = {
+    "qdrant": search_qdrant,
+    "pgvector": search_pgvector,
+}
+
+
+async def search_vector(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Vector search on the primary store (vector_store), retried on
+    vector_fallback_store if the primary fails
+    """
+    try:
+        return await _VECTOR_SEARCHES[settings.vector_store](
+            query, client_id, k, memory_type, query_embedding
+        )
+    except Exception as e:
+        fallback = settings.vector_fallback_store
+        if not fallback or fallback == settings.vector_store:
+            raise
+        logger.warning(f"{settings.vector_store} search failed - falling back to {fallback}: {e}")
+        return await _VECTOR_SEARCHES[fallback](query, client_id, k, memory_type, query_embedding)
+
+
+async def search_lexical(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Postgres full-text search over memory content (no embedding needed)"""
+    rows = await postgres.search_memories_lexical(client_id, query, k, memory_type)
+    results = [
+        {
+            "memory_id": row["memory_id"],
+            "content": row["content"],
+            "memory_type": row["memory_type"],
+            "similarity_score": row["rank"],
+            "stored_at": row["stored_at"],
+            "metadata": row["metadata"] or {},
+            "source": "lexical",
+        }
+        for row in rows
+    ]
+    logger.info(f"Found {len(results)} lexical results in Postgres for client {client_id}")
+    return results
+
+
+async def search_postgres(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Structured fallback: full-text matches, else the latest memory events"""
+    try:
+        results = await search_lexical(query, client_id, k, memory_type)
+        if results:
+            return results
+    except Exception as e:
+        logger.warning(f"Lexical search failed - returning latest memories: {e}")
+
+    events = await postgres.get_events(
+        client_id=client_id,
+        event_type=f"memory:{memory_type}" if memory_type else None,
+        limit=k,
+    )
+    return [
+        {
+            "memory_id": event["id"],
+            "content": event["payload"].get("content", ""),
+            "memory_type": event["payload"].get("memory_type", "fact"),
+            "similarity_score": 0.5,  # No score from SQL
+            "stored_at": event["created_at"],
+            "metadata": event.get("metadata", {}),
+            "source": "postgres",
+        }
+        for event in events
+    ]
+
+
+def merge_results(result_lists: List[List[Dict[str, Any]]], k: int) -> List[Dict[str, Any]]:
+    """
+    Merge ranked lists from different sources
+
+    Scores are normalized per source (divided by that source's best score)
+    so Zep relevance and Qdrant cosine are comparable, then results are
+    deduplicated by memory_id keeping the best normalized score.
+
+    Args:
+        result_lists: Ranked result lists, one per source
+        k: Number of results to return
+
+    Returns:
+        Merged results, best first
+    """
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for results in result_lists:
+        if not results:
+            continue
+        top = max(r["similarity_score"] for r in results) or 1.0
+        for result in results:
+            normalized = {**result, "similarity_score": result["similarity_score"] / top}
+            key = result["memory_id"]
+            if key in (None, "unknown"):
+                key = ("content", result["content"])
+            existing = merged.get(key)
+            if not existing or normalized["similarity_score"] > existing["similarity_score"]:
+                merged[key] = normalized
+
+    ranked = sorted(merged.values(), key=lambda r: r["similarity_score"], reverse=True)
+    return ranked[:k]
+
+
+def rrf_merge(result_lists: List[List[Dict[str, Any]]], k: int) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked lists with reciprocal rank fusion
+
+    Each result scores sum(1 / (recall_rrf_k + rank)) over the lists it
+    appears in, so only ranks matter and BM25-style and cosine scores never
+    need to be comparable. Scores are scaled so a result ranked first in
+    every list scores 1.0.
+
+    Args:
+        result_lists: Ranked result lists, one per retriever
+        k: Number of results to return
+
+    Returns:
+        Fused results, best first
+    """
+    rrf_k = settings.recall_rrf_k
+    lists = [results for results in result_lists if results]
+    if not lists:
+        return []
+
+    fused: Dict[Any, Dict[str, Any]] = {}
+    scores: Dict[Any, float] = {}
+    for results in lists:
+        for rank, result in enumerate(results, start=1):
+            key = result["memory_id"]
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            fused.setdefault(key, result)
+
+    best_possible = len(lists) / (rrf_k + 1)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [
+        {**fused[key], "similarity_score": scores[key] / best_possible} for key in ranked
+    ]
+
+
+async def search_hybrid(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Hybrid recall: Postgres full-text and vector search, fused with RRF
+
+    Both retrievers fetch recall_hybrid_candidates results (at least k) so
+    documents ranked moderately by both can surface. If one retriever fails
+    the other's ranking is returned alone.
+    """
+    depth = max(k, settings.recall_hybrid_candidates)
+    lexical, vector = await asyncio.gather(
+        search_lexical(query, client_id, depth, memory_type),
+        search_vector(query, client_id, depth, memory_type, query_embedding),
+        return_exceptions=True,
+    )
+    result_lists = []
+    for name, results in (("lexical", lexical), ("vector", vector)):
+        if isinstance(results, Exception):
+            logger.warning(f"Hybrid {name} search failed: {results}")
+            continue
+        result_lists.append(results)
+
+    if not result_lists:
+        logger.info("Falling back to Postgres search")
+        return await search_postgres(query, client_id, k, memory_type)
+
+    return rrf_merge(result_lists, k)
+
+
+async def search_fallback(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Sequential recall: Zep first, vector search if Zep has nothing, Postgres if that fails
+    """
+    results = []
+    if settings.zep_memory_enabled:
+        try:
+            results = await search_zep(query, client_id, k, memory_type)
+        except Exception as e:
+            logger.warning(f"Zep Cloud search failed: {e}")
+            logger.info("Falling back to vector search")
+
+    if not results:
+        try:
+            results = await search_vector(query, client_id, k, memory_type, query_embedding)
+        except Exception as e:
+            logger.warning(f"Vector search failed: {e}")
+            logger.info("Falling back to Postgres search")
+            results = await search_postgres(query, client_id, k, memory_type)
+
+    return results
+
+
+def _good(task: Optional[asyncio.Task]) -> bool:
+    """A finished search task that returned at least one result"""
+    return bool(
+        task and task.done() and not task.cancelled() and not task.exception() and task.result()
+    )
+
+
+async def search_parallel(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Hedged recall: query Zep and vector search concurrently under a latency budget
+
+    If Zep misses recall_zep_deadline_ms and vector search already has results, those
+    are returned without waiting for Zep. Otherwise the first source to return
+    results wins once the deadline passes, and nothing waits past
+    recall_budget_ms. Results from every finished source are merged.
+    Postgres is only queried if both sources come back empty and vector search failed.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    budget = settings.recall_budget_ms / 1000
+
+    tasks: Dict[str, asyncio.Task] = {
+        "vector": asyncio.create_task(
+            search_vector(query, client_id, k, memory_type, query_embedding)
+        ),
+    }
+    if settings.zep_memory_enabled:
+        tasks["zep"] = asyncio.create_task(search_zep(query, client_id, k, memory_type))
+
+    try:
+        _, pending = await asyncio.wait(
+            tasks.values(),
+            timeout=min(settings.recall_zep_deadline_ms / 1000, budget),
+        )
+        while pending and not any(_good(task) for task in tasks.values()):
+            remaining = budget - (loop.time() - start)
+            if remaining <= 0:
+                break
+            _, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+    finally:
+        for name, task in tasks.items():
+            if not task.done():
+                logger.info(f"Recall {name} search missed the deadline - cancelling")
+                task.cancel()
+
+    result_lists = []
+    for name, task in tasks.items():
+        if not task.done() or task.cancelled():
+            continue
+        if task.exception():
+            logger.warning(f"{name} search failed: {task.exception()}")
+            continue
+        result_lists.append(task.result())
+
+    results = merge_results(result_lists, k)
+
+    vector_task = tasks["vector"]
+    if not results and vector_task.done() and not vector_task.cancelled() and vector_task.exception():
+        logger.info("Falling back to Postgres search")
+        results = await search_postgres(query, client_id, k, memory_type)
+
+    return results
+
+
+async def search(
+    query: str,
+    client_id: int,
+    k: int,
+    memory_type: Optional[str] = None,
+    mode: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search memories using the configured recall mode
+
+    Args:
+        query: Search query
+        client_id: Client/user ID
+        k: Number of results
+        memory_type: Optional memory type filter
+        mode: "fallback", "parallel", "hybrid" or "lexical"
+            (defaults to settings.recall_mode)
+        query_embedding: Precomputed query embedding, reused for vector search
+
+    Returns:
+        Ranked list of matching memories
+    """
+    mode = mode or settings.recall_mode
+    if mode == "parallel":
+        return await search_parallel(query, client_id, k, memory_type, query_embedding)
+    if mode == "hybrid":
+        return await search_hybrid(query, client_id, k, memory_type, query_embedding)
+    if mode == "lexical":
+        return await search_postgres(query, client_id, k, memory_type)
+    return await search_fallback(query, client_id, k, memory_type, query_embedding)
@@ -0,0 +1,179 @@
+"""
+Recall Cache Service
+Semantic cache for /recall results, keyed on query embedding similarity
+"""
+
+import hashlib
+import logging
+from typing import Optional, Dict, Any, Iterable, List
+
+import numpy as np
+
+from app.config import Settings
+from app.services import codec, valkey
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+KEY_PREFIX = "recall:sem"
+FINGERPRINT_SIZE = 8  # bytes of sha256 prefixed to each indexed embedding
+
+
+def _scope(client_id: int, generation: str, memory_type: Optional[str], mode: str) -> str:
+    """
+    Cache scope: results are only shared between identical filters and recall
+    modes, within one cache generation (see valkey.get_cache_generation)
+    """
+    return f"{KEY_PREFIX}:{client_id}:{generation}:{memory_type or '*'}:{mode}"
+
+
+def _fingerprint(query: str, k: int) -> bytes:
+    return hashlib.sha256(f"{k}\n{query}".encode("utf-8")).digest()[:FINGERPRINT_SIZE]
+
+
+async def current_generation(client_id: int) -> Optional[str]:
+    """Read the client's recall cache generation (None if Valkey is unavailable)"""
+    try:
+        return await valkey.get_cache_generation(client_id)
+    except Exception as e:
+        logger.warning(f"Failed to read recall cache generation: {e}")
+        return None
+
+
+async def invalidate(client_ids: Iterable[Optional[int]]):
+    """
+    Invalidate cached recall results after a write
+
+    Bumps each client's generation counter (None bumps the global counter,
+    invalidating every client).
+    """
+    for client_id in set(client_ids):
+        try:
+            await valkey.bump_cache_generation(client_id)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate recall cache for {client_id}: {e}")
+
+
+async def lookup(
+    client_id: int,
+    generation: str,
+    memory_type: Optional[str],
+    mode: str,
+    k: int,
+    query_embedding: List[float],
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Find cached results for a semantically equivalent earlier query
+
+    The per-scope index holds up to recall_cache_entries recent query
+    embeddings (float16). The closest one by cosine similarity is used if it
+    clears recall_cache_similarity and its result set covers k.
+
+    Args:
+        client_id: Client/user ID
+        generation: Client's current recall cache generation
+        memory_type: Memory type filter of the request
+        mode: Recall mode of the request
+        k: Number of results requested
+        query_embedding: Embedding of the new query
+
+    Returns:
+        Up to k cached results, or None on a miss
+    """
+    if not valkey.binary_cache:
+        return None
+
+    scope = _scope(client_id, generation, memory_type, mode)
+    try:
+        index = await valkey.binary_cache.hgetall(f"{scope}:idx")
+        if not index:
+            return None
+
+        slots = list(index.keys())
+        matrix = np.stack(
+            [np.frombuffer(index[slot][FINGERPRINT_SIZE:], dtype="<f2") for slot in slots]
+        ).astype(np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if matrix.shape[1] != query.shape[0]:
+            return None
+
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        similarities = matrix @ query / np.where(norms == 0, 1.0, norms)
+        best = int(np.argmax(similarities))
+        if similarities[best] < settings.recall_cache_similarity:
+            return None
+
+        slot = slots[best]
+        raw = await valkey.binary_cache.get(f"{scope}:res:{slot.decode()}")
+        if not raw:
+            return None
+
+        entry = codec.decode(raw)
+        # Slot may have been overwritten between the two reads
+        if bytes.fromhex(entry["fingerprint"]) != index[slot][:FINGERPRINT_SIZE]:
+            return None
+
+        results = entry["results"]
+        # A result set covers k if it was fetched with k' >= k, or was exhaustive
+        if entry["k"] < k and len(results) >= entry["k"]:
+            return None
+
+        logger.debug(
+            f"Semantic recall cache hit (similarity {similarities[best]:.3f}, k={entry['k']})"
+        )
+        return results[:k]
+
+    except Exception as e:
+        logger.warning(f"Semantic recall cache lookup failed: {e}")
+        return None
+
+
+async def store(
+    client_id: int,
+    generation: str,
+    memory_type: Optional[str],
+    mode: str,
+    k: int,
+    query: str,
+    query_embedding: List[float],
+    results: List[Dict[str, Any]],
+) -> bool:
+    """
+    Cache a recall result set under its query embedding
+
+    Entries live in a fixed-size ring of slots per scope, so the index never
+    grows past recall_cache_entries. Pass the generation read before the
+    search ran, so results racing with a /remember are stored under the
+    already-invalidated generation.
+
+    Returns:
+        Success status
+    """
+    if not valkey.binary_cache:
+        return False
+
+    scope = _scope(client_id, generation, memory_type, mode)
+    ttl = settings.recall_cache_ttl
+    try:
+        slot = (await valkey.binary_cache.incr(f"{scope}:ctr")) % settings.recall_cache_entries
+        fingerprint = _fingerprint(query, k)
+        embedding = np.asarray(query_embedding, dtype="<f2").tobytes()
+        entry = {
+            "fingerprint": fingerprint.hex(),
+            "k": k,
+            "query": query,
+            "results": results,
+        }
+
+        async with valkey.binary_cache.pipeline(transaction=True) as pipe:
+            pipe.hset(f"{scope}:idx", str(slot), fingerprint + embedding)
+            pipe.expire(f"{scope}:idx", ttl)
+            pipe.expire(f"{scope}:ctr", ttl)
+            pipe.setex(f"{scope}:res:{slot}", ttl, codec.encode(entry))
+            await pipe.execute()
+        return True
+
+    except Exception as e:
+        logger.warning(f"Failed to cache recall results: {e}")
+        return False
@@ -0,0 +1,224 @@
+"""
+Rerank Service
+Rescore recall candidates before truncating to k: a lexical-overlap scorer or a
+local CPU cross-encoder, plus recency and salience boosts, under a time budget
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from app.config import Settings
+from app.services import scoring
+
+try:
+    from sentence_transformers import CrossEncoder
+except ImportError:  # pragma: no cover - optional dependency (requirements-local.txt)
+    CrossEncoder = None
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Global cross-encoder and the worker thread that runs it off the event loop
+model = None
+_executor: Optional[ThreadPoolExecutor] = None
+_loading: Optional[asyncio.Task] = None
+# Set once loading failed (or cannot work), so it is reported and tried once
+_load_failed = False
+# Scoring job on the worker thread; a budget timeout does not stop it
+_running: Optional[Future] = None
+
+_TOKEN = re.compile(r"\w+")
+
+
+async def initialize():
+    """Load the cross-encoder model"""
+    global model, _executor
+    if model:
+        return
+    if CrossEncoder is None:
+        raise RuntimeError(
+            "sentence-transformers not installed - install requirements-local.txt "
+            "or set RECALL_RERANK=lexical"
+        )
+
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+    model = await asyncio.get_running_loop().run_in_executor(
+        _executor, lambda: CrossEncoder(settings.rerank_model, device="cpu")
+    )
+    logger.info(f"Cross-encoder loaded ({settings.rerank_model})")
+
+
+def _load_in_background():
+    """Start loading the cross-encoder outside any request's time budget"""
+    global _loading, _load_failed
+    if _load_failed or (_loading and not _loading.done()):
+        return
+    if CrossEncoder is None:
+        _load_failed = True
+        logger.warning("sentence-transformers not installed - cross-encoder rerank runs lexically")
+        return
+
+    def report(task: asyncio.Task):
+        global _load_failed
+        if not task.cancelled() and task.exception():
+            _load_failed = True
+            logger.error(
+                f"Failed to load cross-encoder - rerank runs lexically: {task.exception()}"
+            )
+
+    _loading = asyncio.get_running_loop().create_task(initialize())
+    _loading.add_done_callback(report)
+
+
+async def close():
+    """Release the cross-encoder and stop its worker thread"""
+    global model, _executor, _running
+    _running = None
+    if _executor:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    if model:
+        model = None
+        logger.info("Cross-encoder unloaded")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def lexical_scores(query: str, contents: List[str]) -> List[float]:
+    """
+    Query-term overlap per candidate, weighted by IDF over the candidate set
+
+    Args:
+        query: Search query
+        contents: Candidate contents
+
+    Returns:
+        Scores in [0, 1]: IDF mass of query terms present / total query IDF
+    """
+    query_terms = set(_tokens(query))
+    if not query_terms or not contents:
+        return [0.0] * len(contents)
+
+    documents = [set(_tokens(content)) for content in contents]
+    n = len(documents)
+    idf = {
+        term: math.log(1 + (n + 1) / (1 + sum(1 for doc in documents if term in doc)))
+        for term in query_terms
+    }
+    total = sum(idf.values())
+    return [sum(idf[term] for term in query_terms if term in doc) / total for doc in documents]
+
+
+def _cross_encoder_scores(query: str, contents: List[str]) -> List[float]:
+    """Relevance in [0, 1] (blocking; runs in the worker thread)"""
+    logits = model.predict([(query, content) for content in contents], show_progress_bar=False)
+    return [1 / (1 + math.exp(-float(logit))) for logit in logits]
+
+
+async def _score(
+    query: str,
+    candidates: List[Dict[str, Any]],
+    method: str,
+    recency_weight: float,
+    salience_weight: float,
+    half_life_days: float,
+) -> List[float]:
+    global _running
+    contents = [candidate["content"] for candidate in candidates]
+    if method == "cross-encoder" and not model:
+        # Score lexically until the model is loaded
+        _load_in_background()
+        method = "lexical"
+    if method == "cross-encoder" and _running and not _running.done():
+        # A call that overran its budget still holds the worker thread; queueing
+        # behind it would only time out too
+        logger.debug("Cross-encoder busy - reranking lexically")
+        method = "lexical"
+
+    if method == "cross-encoder":
+        _running = _executor.submit(_cross_encoder_scores, query, contents)
+        relevance = await asyncio.wrap_future(_running)
+    else:
+        # Lexical overlap alone ignores meaning; keep the retriever's similarity in the mix
+        overlap = lexical_scores(query, contents)
+        relevance = [
+            0.5 * lexical + 0.5 * float(candidate.get("similarity_score") or 0.0)
+            for lexical, candidate in zip(overlap, candidates)
+        ]
+
+    return (
+        np.asarray(relevance, dtype=np.float64)
+        + scoring.boosts(candidates, recency_weight, salience_weight, half_life_days)
+    ).tolist()
+
+
+async def rerank(
+    query: str,
+    candidates: List[Dict[str, Any]],
+    k: int,
+    method: Optional[str] = None,
+    recency_weight: Optional[float] = None,
+    salience_weight: Optional[float] = None,
+    half_life_days: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rescore candidates and return the best k
+
+    Relevance gets the recency/salience boosts from the scoring service.
+    If scoring fails or exceeds recall_rerank_budget_ms, the candidates are
+    returned in their original order (truncated to k).
+
+    Args:
+        query: Search query
+        candidates: Recall results (over-fetched, in retriever order)
+        k: Number of results to return
+        method: "none", "lexical" or "cross-encoder" (defaults to recall_rerank)
+        recency_weight: Recency boost weight (defaults to rerank_recency_weight)
+        salience_weight: Salience boost weight (defaults to rerank_salience_weight)
+        half_life_days: Recency half-life (defaults to rerank_recency_half_life_days)
+
+    Returns:
+        Up to k results, each with a rerank_score when reranked
+    """
+    method = method or settings.recall_rerank
+    if method == "none" or len(candidates) <= 1:
+        return candidates[:k]
+
+    recency_weight = settings.rerank_recency_weight if recency_weight is None else recency_weight
+    salience_weight = (
+        settings.rerank_salience_weight if salience_weight is None else salience_weight
+    )
+    half_life_days = half_life_days or settings.rerank_recency_half_life_days
+
+    start = time.perf_counter()
+    try:
+        scores = await asyncio.wait_for(
+            _score(query, candidates, method, recency_weight, salience_weight, half_life_days),
+            timeout=settings.recall_rerank_budget_ms / 1000,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Rerank ({method}) exceeded {settings.recall_rerank_budget_ms}ms budget - "
+            "keeping retriever order"
+        )
+        return candidates[:k]
+    except Exception as e:
+        logger.warning(f"Rerank ({method}) failed - keeping retriever order: {e}")
+        return candidates[:k]
+
+    ranked = sorted(zip(scores, range(len(candidates))), key=lambda pair: pair[0], reverse=True)
+    logger.debug(
+        f"Reranked {len(candidates)} candidates ({method}) in "
+        f"{(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+    return [{**candidates[i], "rerank_score": round(score, 6)} for score, i in ranked[:k]]
@@ -0,0 +1,158 @@
+"""
+Scoring Service
+Recency- and salience-weighted ranking of recall candidates (vectorized NumPy post-pass)
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Sequence
+
+import numpy as np
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Salience used when a memory records none
+DEFAULT_SALIENCE = 0.5
+
+# Metadata fields read as salience, in order, with their scale:
+# facts.salience_score / planner fact salience (0-1), memory_facts.confidence (0-1),
+# episodes.rating (0-5)
+SALIENCE_FIELDS = (("salience", 1.0), ("salience_score", 1.0), ("confidence", 1.0), ("rating", 5.0))
+
+
+def _epoch_seconds(value: Any) -> float:
+    """Timestamp (datetime or ISO string) as epoch seconds; NaN if unparseable"""
+    try:
+        stored = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    except ValueError:
+        return np.nan
+    if stored.tzinfo is None:
+        stored = stored.replace(tzinfo=timezone.utc)
+    return stored.timestamp()
+
+
+def recency(
+    stored_at: Sequence[Any],
+    half_life_days: float,
+    now: Optional[datetime] = None,
+) -> np.ndarray:
+    """
+    Exponential time decay per candidate: 0.5 ** (age / half_life)
+
+    Args:
+        stored_at: Storage timestamps (datetime or ISO strings; naive = UTC)
+        half_life_days: Age at which the decay reaches 0.5
+        now: Reference time (defaults to the current time)
+
+    Returns:
+        Decay in [0, 1] (1 = just stored, 0 = unknown timestamp)
+    """
+    now = now or datetime.now(timezone.utc)
+    stored = np.array([_epoch_seconds(value) for value in stored_at], dtype=np.float64)
+    age_days = np.maximum(0.0, (now.timestamp() - stored) / 86400)
+    decay = np.exp2(-age_days / half_life_days)
+    return np.nan_to_num(decay, nan=0.0)
+
+
+def _salience_of(metadata: Optional[Dict[str, Any]]) -> float:
+    for field, scale in SALIENCE_FIELDS:
+        value = (metadata or {}).get(field)
+        if value is None:
+            continue
+        try:
+            return float(value) / scale
+        except (TypeError, ValueError):
+            continue
+    return DEFAULT_SALIENCE
+
+
+def salience(metadata: Sequence[Optional[Dict[str, Any]]]) -> np.ndarray:
+    """
+    Salience per candidate from its metadata (salience, salience_score,
+    confidence, or rating / 5)
+
+    Returns:
+        Salience in [0, 1] (DEFAULT_SALIENCE when none is recorded)
+    """
+    return np.clip(np.array([_salience_of(m) for m in metadata], dtype=np.float64), 0.0, 1.0)
+
+
+def boosts(
+    candidates: List[Dict[str, Any]],
+    recency_weight: float,
+    salience_weight: float,
+    half_life_days: float,
+) -> np.ndarray:
+    """
+    Weighted recency + salience term added to each candidate's relevance
+
+    Args:
+        candidates: Recall results (stored_at and metadata are read)
+        recency_weight: Weight of the time decay
+        salience_weight: Weight of the salience
+        half_life_days: Recency half-life
+
+    Returns:
+        Boost per candidate
+    """
+    total = np.zeros(len(candidates), dtype=np.float64)
+    if recency_weight:
+        total += recency_weight * recency(
+            [candidate.get("stored_at") for candidate in candidates], half_life_days
+        )
+    if salience_weight:
+        total += salience_weight * salience([candidate.get("metadata") for candidate in candidates])
+    return total
+
+
+def rank(
+    candidates: List[Dict[str, Any]],
+    k: int,
+    similarity_weight: Optional[float] = None,
+    recency_weight: Optional[float] = None,
+    salience_weight: Optional[float] = None,
+    half_life_days: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rank candidates by similarity combined with time decay and salience
+
+    score = similarity_weight * similarity
+          + recency_weight * 0.5 ** (age_days / half_life_days)
+          + salience_weight * salience
+
+    Weights left as None use the scoring_* settings.
+
+    Args:
+        candidates: Recall results (over-fetched, in retriever order)
+        k: Number of results to return
+
+    Returns:
+        Top k results by score, each with a weighted_score
+    """
+    if not candidates:
+        return []
+
+    similarity_weight = (
+        settings.scoring_similarity_weight if similarity_weight is None else similarity_weight
+    )
+    recency_weight = settings.scoring_recency_weight if recency_weight is None else recency_weight
+    salience_weight = (
+        settings.scoring_salience_weight if salience_weight is None else salience_weight
+    )
+    half_life_days = half_life_days or settings.scoring_recency_half_life_days
+
+    similarity = np.array(
+        [float(candidate.get("similarity_score") or 0.0) for candidate in candidates],
+        dtype=np.float64,
+    )
+    scores = similarity_weight * similarity + boosts(
+        candidates, recency_weight, salience_weight, half_life_days
+    )
+
+    # Stable: ties keep retriever order
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [{**candidates[i], "weighted_score": round(float(scores[i]), 6)} for i in order]
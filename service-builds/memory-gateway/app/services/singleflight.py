@@ -0,0 +1,100 @@
+"""
+Singleflight Service
+De-duplicate concurrent identical work, in-process and across replicas via Valkey
+"""
+
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, AsyncIterator
+
+from app.config import Settings
+from app.services import valkey
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# In-flight computations by key
+_inflight: Dict[str, asyncio.Task] = {}
+
+LOCK_PREFIX = "lock:"
+
+# Delete the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+async def do(key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run fn once for all concurrent callers with the same key
+
+    The computation runs in its own task, so a caller disconnecting (and
+    being cancelled) does not cancel it for the others.
+
+    Args:
+        key: De-duplication key
+        fn: Coroutine factory producing the result
+
+    Returns:
+        The shared result (exceptions are shared too)
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fn())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.debug(f"Joined in-flight computation for {key}")
+    return await asyncio.shield(task)
+
+
+@asynccontextmanager
+async def valkey_lock(key: str) -> AsyncIterator[bool]:
+    """
+    Cross-replica lock around a computation
+
+    Yields True if this replica acquired the lock (and must compute). If
+    another replica holds it, waits up to recall_lock_wait_ms for it to be
+    released and yields False, so the caller can re-check the shared cache
+    before computing itself. Valkey errors yield True (fail open).
+
+    Args:
+        key: Lock key (prefixed with "lock:")
+    """
+    if not settings.recall_lock_enabled or not valkey.cache:
+        yield True
+        return
+
+    lock_key = f"{LOCK_PREFIX}{key}"
+    token = uuid.uuid4().hex
+    try:
+        acquired = await valkey.cache.set(lock_key, token, nx=True, px=settings.recall_lock_ttl_ms)
+    except Exception as e:
+        logger.warning(f"Valkey lock unavailable - computing without it: {e}")
+        yield True
+        return
+
+    if not acquired:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.recall_lock_wait_ms / 1000
+        try:
+            while loop.time() < deadline and await valkey.cache.exists(lock_key):
+                await asyncio.sleep(settings.recall_lock_poll_ms / 1000)
+        except Exception as e:
+            logger.warning(f"Valkey lock wait failed: {e}")
+        yield False
+        return
+
+    try:
+        yield True
+    finally:
+        try:
+            await valkey.cache.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.warning(f"Failed to release Valkey lock {lock_key}: {e}")
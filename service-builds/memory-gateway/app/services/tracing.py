@@ -0,0 +1,73 @@
+"""
+Tracing Service
+OpenTelemetry spans exported over OTLP, with W3C trace context propagation
+(incoming requests continue the caller's trace; outgoing httpx calls carry it on)
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import FastAPI
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+from opentelemetry.sdk.resources import SERVICE_NAME, SERVICE_VERSION, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+# Spans for storage layer calls (opened by metrics.observe). A no-op until
+# initialize() installs a provider, so instrumented code needs no checks.
+tracer = trace.get_tracer("memory-gateway")
+
+# Global tracer provider (None when tracing is disabled)
+provider: Optional[TracerProvider] = None
+
+
+def initialize(app: FastAPI):
+    """
+    Install the OTLP tracer provider and instrument FastAPI and httpx
+
+    Must run before the app serves its first request (FastAPI builds its
+    middleware stack then) and before httpx clients are created.
+
+    Args:
+        app: The FastAPI application
+    """
+    global provider
+    if not settings.otel_enabled or provider:
+        return
+
+    provider = TracerProvider(
+        resource=Resource.create(
+            {SERVICE_NAME: settings.otel_service_name, SERVICE_VERSION: "0.1.0"}
+        ),
+        # Follow the caller's sampling decision; sample root spans by ratio
+        sampler=ParentBased(TraceIdRatioBased(settings.otel_sample_ratio)),
+    )
+    endpoint = f"{settings.otel_exporter_otlp_endpoint.rstrip('/')}/v1/traces"
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+    trace.set_tracer_provider(provider)
+
+    # Server spans continue an incoming `traceparent`; client spans inject it
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="health,metrics")
+    HTTPXClientInstrumentor().instrument()
+    logger.info(
+        f"Tracing enabled ({settings.otel_service_name} -> {settings.otel_exporter_otlp_endpoint})"
+    )
+
+
+def close():
+    """Flush buffered spans and shut the exporter down"""
+    global provider
+    if provider:
+        provider.shutdown()
+        provider = None
+        logger.info("Tracing shut down")
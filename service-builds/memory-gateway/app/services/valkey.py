@@ -4,11 +4,11 @@ Short-term memory cache with TTL
 """
 
 import logging
-import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import redis.asyncio as redis
 
 from app.config import Settings
+from app.services import codec, metrics
 
 logger = logging.getLogger(__name__)
 
@@ -17,21 +17,32 @@ settings = Settings()
 # Global Redis/Valkey connection
 cache: Optional[redis.Redis] = None
 
+# Binary-safe connection for codec-encoded values and raw bytes (e.g. float32 embeddings)
+binary_cache: Optional[redis.Redis] = None
+
 DEFAULT_TTL = 86400  # 24 hours
 
 
 async def initialize():
     """Initialize Valkey connection"""
-    global cache
+    global cache, binary_cache
     try:
+        url = f"redis://{settings.valkey_host}:{settings.valkey_port}/{settings.valkey_db}"
         cache = await redis.from_url(
-            f"redis://{settings.valkey_host}:{settings.valkey_port}/{settings.valkey_db}",
+            url,
             encoding="utf-8",
             decode_responses=True,
             socket_connect_timeout=10,
             socket_keepalive=True,
             retry_on_timeout=True,
         )
+        binary_cache = await redis.from_url(
+            url,
+            decode_responses=False,
+            socket_connect_timeout=10,
+            socket_keepalive=True,
+            retry_on_timeout=True,
+        )
         await cache.ping()
         logger.info("Valkey cache initialized")
     except Exception as e:
@@ -41,12 +52,15 @@ async def initialize():
 
 async def close():
     """Close Valkey connection"""
-    global cache
+    global cache, binary_cache
+    if binary_cache:
+        await binary_cache.close()
     if cache:
         await cache.close()
         logger.info("Valkey cache closed")
 
 
+@metrics.timed("valkey")
 async def set_cache(
     key: str,
     value: Dict[str, Any],
@@ -57,18 +71,17 @@ async def set_cache(
 
     Args:
         key: Cache key
-        value: Value to cache (will be JSON-serialized)
+        value: Value to cache (encoded with the configured codec)
         ttl: Time to live in seconds
 
     Returns:
         Success status
     """
-    if not cache:
+    if not binary_cache:
         raise RuntimeError("Valkey cache not initialized")
 
     try:
-        serialized = json.dumps(value)
-        await cache.setex(key, ttl, serialized)
+        await binary_cache.setex(key, ttl, codec.encode(value))
         logger.debug(f"Set cache key: {key} (TTL: {ttl}s)")
         return True
     except Exception as e:
@@ -76,6 +89,7 @@ async def set_cache(
         return False
 
 
+@metrics.timed("valkey")
 async def get_cache(key: str) -> Optional[Dict[str, Any]]:
     """
     Get value from cache
@@ -86,14 +100,14 @@ async def get_cache(key: str) -> Optional[Dict[str, Any]]:
     Returns:
         Cached value or None if not found
     """
-    if not cache:
+    if not binary_cache:
         raise RuntimeError("Valkey cache not initialized")
 
     try:
-        value = await cache.get(key)
+        value = await binary_cache.get(key)
         if value:
             logger.debug(f"Cache hit: {key}")
-            return json.loads(value)
+            return codec.decode(value)
         else:
             logger.debug(f"Cache miss: {key}")
             return None
@@ -102,6 +116,113 @@ async def get_cache(key: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+@metrics.timed("valkey")
+async def get_cache_many(keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Get many values with a single MGET
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        Decoded values in key order (None where missing)
+    """
+    if not binary_cache:
+        raise RuntimeError("Valkey cache not initialized")
+
+    if not keys:
+        return []
+
+    try:
+        values = await binary_cache.mget(keys)
+        return [codec.decode(value) if value else None for value in values]
+    except Exception as e:
+        logger.error(f"Failed to get cache: {e}")
+        return [None] * len(keys)
+
+
+@metrics.timed("valkey")
+async def set_cache_many(
+    items: Dict[str, Dict[str, Any]],
+    ttl: int = DEFAULT_TTL,
+) -> bool:
+    """
+    Set many values in one pipelined round trip
+
+    Args:
+        items: Mapping of cache key to value (encoded with the configured codec)
+        ttl: Time to live in seconds
+
+    Returns:
+        Success status
+    """
+    if not binary_cache:
+        raise RuntimeError("Valkey cache not initialized")
+
+    try:
+        async with binary_cache.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, codec.encode(value))
+            await pipe.execute()
+        logger.debug(f"Set {len(items)} cache keys (TTL: {ttl}s)")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to set cache: {e}")
+        return False
+
+
+@metrics.timed("valkey")
+async def set_bytes_many(items: Dict[str, bytes], ttl: int = DEFAULT_TTL) -> bool:
+    """
+    Set raw byte values in one pipelined round trip
+
+    Args:
+        items: Mapping of cache key to raw bytes
+        ttl: Time to live in seconds
+
+    Returns:
+        Success status
+    """
+    if not binary_cache:
+        raise RuntimeError("Valkey cache not initialized")
+
+    try:
+        async with binary_cache.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, value)
+            await pipe.execute()
+        logger.debug(f"Set {len(items)} binary cache keys (TTL: {ttl}s)")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to set binary cache: {e}")
+        return False
+
+
+@metrics.timed("valkey")
+async def get_bytes_many(keys: List[str]) -> List[Optional[bytes]]:
+    """
+    Get raw byte values with a single MGET
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        Raw values in key order (None where missing)
+    """
+    if not binary_cache:
+        raise RuntimeError("Valkey cache not initialized")
+
+    if not keys:
+        return []
+
+    try:
+        return await binary_cache.mget(keys)
+    except Exception as e:
+        logger.error(f"Failed to get binary cache: {e}")
+        return [None] * len(keys)
+
+
+@metrics.timed("valkey")
 async def delete_cache(key: str) -> bool:
     """
     Delete value from cache
@@ -124,13 +245,42 @@ async def delete_cache(key: str) -> bool:
         return False
 
 
-async def clear_client_cache(client_id: int) -> bool:
+def _generation_key(client_id: Optional[int]) -> str:
+    return f"recall:gen:{client_id}" if client_id is not None else "recall:gen:global"
+
+
+@metrics.timed("valkey")
+async def get_cache_generation(client_id: int) -> str:
     """
-    Clear all cache entries for a client
+    Get the recall cache generation for a client
+
+    The generation combines the client's counter and the global counter and
+    is part of every recall cache key, so bumping either invalidates the
+    client's cached recall results in O(1).
 
     Args:
         client_id: Client/user ID
 
+    Returns:
+        Generation tag ("<client>.<global>")
+    """
+    if not cache:
+        raise RuntimeError("Valkey cache not initialized")
+
+    client_gen, global_gen = await cache.mget(
+        _generation_key(client_id), _generation_key(None)
+    )
+    return f"{client_gen or 0}.{global_gen or 0}"
+
+
+@metrics.timed("valkey")
+async def bump_cache_generation(client_id: Optional[int] = None) -> bool:
+    """
+    Atomically bump a recall cache generation counter
+
+    Args:
+        client_id: Client/user ID, or None to invalidate every client
+
     Returns:
         Success status
     """
@@ -138,25 +288,30 @@ async def clear_client_cache(client_id: int) -> bool:
         raise RuntimeError("Valkey cache not initialized")
 
     try:
-        pattern = f"recall:{client_id}:*"
-        cursor = 0
-        deleted_count = 0
-
-        while True:
-            cursor, keys = await cache.scan(cursor, match=pattern, count=100)
-            if keys:
-                await cache.delete(*keys)
-                deleted_count += len(keys)
-            if cursor == 0:
-                break
-
-        logger.debug(f"Cleared {deleted_count} cache entries for client {client_id}")
+        generation = await cache.incr(_generation_key(client_id))
+        logger.debug(f"Recall cache generation for {client_id or 'all clients'} is now {generation}")
         return True
     except Exception as e:
-        logger.error(f"Failed to clear client cache: {e}")
+        logger.error(f"Failed to bump cache generation: {e}")
         return False
 
 
+async def clear_client_cache(client_id: int) -> bool:
+    """
+    Clear all cache entries for a client
+
+    Bumps the client's cache generation instead of scanning the keyspace;
+    entries under the old generation are unreachable and expire by TTL.
+
+    Args:
+        client_id: Client/user ID
+
+    Returns:
+        Success status
+    """
+    return await bump_cache_generation(client_id)
+
+
 async def get_cache_stats() -> Dict[str, Any]:
     """
     Get cache statistics
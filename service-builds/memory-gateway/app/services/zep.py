@@ -5,10 +5,13 @@ Long-term memory and semantic search via Zep Cloud
 
 import logging
 from typing import Optional, List, Dict, Any
+
+import httpx
 from zep_cloud.client import AsyncZep
 from zep_cloud.types import Message
 
 from app.config import Settings
+from app.services import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,7 @@ async def close():
         logger.info("Zep Cloud client closed")
 
 
+@metrics.timed("zep")
 async def add_memory(
     session_id: str,
     content: str,
@@ -63,6 +67,9 @@ async def add_memory(
 
     Returns:
         bool: True if successful, False otherwise
+
+    Raises:
+        httpx.TimeoutException: If the outcome is unknown (the message may have been added)
     """
     if not _initialized or not client:
         logger.warning("Zep Cloud client not initialized")
@@ -79,11 +86,60 @@ async def add_memory(
         logger.debug(f"Memory added to Zep session {session_id}")
         return True
 
+    except httpx.TimeoutException:
+        # The message may have been added; callers must not blindly retry
+        raise
+
     except Exception as e:
         logger.error(f"Failed to add memory to Zep: {e}")
         return False
 
 
+@metrics.timed("zep")
+async def add_memories(
+    session_id: str,
+    memories: List[Dict[str, Any]],
+    role: str = "user"
+) -> bool:
+    """
+    Store several memories in one Zep Cloud session call
+
+    Args:
+        session_id: Zep session identifier (e.g., "client_1")
+        memories: Dicts with "content" and optional "metadata"
+        role: Message role ("user", "assistant", etc.)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not _initialized or not client:
+        logger.warning("Zep Cloud client not initialized")
+        return False
+
+    try:
+        messages = [
+            Message(
+                role_type=role,
+                content=memory["content"],
+                metadata=memory.get("metadata") or {}
+            )
+            for memory in memories
+        ]
+
+        await client.memory.add(session_id, messages=messages)
+        logger.debug(f"{len(messages)} memories added to Zep session {session_id}")
+        return True
+
+    except httpx.TimeoutException:
+        # The message may have been added; callers must not blindly retry
+        raise
+
+    except Exception as e:
+        logger.error(f"Failed to add memories to Zep: {e}")
+        return False
+
+
+@metrics.timed("zep")
 async def search_memories(
     session_id: str,
     query: str,
@@ -133,6 +189,7 @@ async def search_memories(
         return []
 
 
+@metrics.timed("zep")
 async def create_fact(
     content: str,
     entity_type: str,
@@ -172,6 +229,7 @@ async def create_fact(
         return None
 
 
+@metrics.timed("zep")
 async def get_session_memory(
     session_id: str,
     limit: int = 100
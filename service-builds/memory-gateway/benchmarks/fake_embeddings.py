@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Fake Embeddings Server
+Purpose: OpenAI-compatible /embeddings endpoint for benchmarks (no API key, no cost)
+
+Vectors are deterministic unit vectors seeded from a hash of each input, so
+the same text always embeds the same way and recall caches behave as they do
+in production. A fixed per-request latency plus a per-input cost stand in for
+the network and model time of the real provider.
+
+Usage:
+    python fake_embeddings.py --port 9100 --latency-ms 40 --per-input-ms 0.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+from typing import List, Optional, Union
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+NATIVE_DIMENSIONS = 1536
+
+app = FastAPI(title="Fake Embeddings")
+
+# Set from the command line
+config = {"latency_ms": 0.0, "per_input_ms": 0.0}
+
+
+class EmbeddingRequest(BaseModel):
+    model: str
+    input: Union[str, List[str]]
+    dimensions: Optional[int] = None
+
+
+def embed(text: str, dimensions: int) -> List[float]:
+    """Deterministic unit vector for text"""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+@app.post("/embeddings")
+async def embeddings(request: EmbeddingRequest):
+    texts = [request.input] if isinstance(request.input, str) else request.input
+    dimensions = request.dimensions or NATIVE_DIMENSIONS
+
+    delay_ms = config["latency_ms"] + config["per_input_ms"] * len(texts)
+    if delay_ms > 0:
+        await asyncio.sleep(delay_ms / 1000)
+
+    return {
+        "object": "list",
+        "model": request.model,
+        "data": [
+            {"object": "embedding", "index": i, "embedding": embed(text, dimensions)}
+            for i, text in enumerate(texts)
+        ],
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible embeddings server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Fixed latency per request")
+    parser.add_argument("--per-input-ms", type=float, default=0.5, help="Added latency per input")
+    args = parser.parse_args()
+
+    config["latency_ms"] = args.latency_ms
+    config["per_input_ms"] = args.per_input_ms
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
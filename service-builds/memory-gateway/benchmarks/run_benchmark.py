@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Memory Gateway Benchmark
+Purpose: Throughput and p50/p95/p99 latency per endpoint and per storage layer
+
+Boots app.main:app in-process (lifespan included) against local stand-ins -
+the fake embeddings server plus the Postgres, Qdrant and Valkey containers in
+benchmarks/docker-compose.yml - and drives a mixed /remember, /recall and
+/facts workload from CONCURRENCY workers. Storage layer calls (Postgres,
+embeddings, Qdrant, pgvector, Zep, Valkey) are timed by wrapping the service
+functions, so a slow endpoint can be traced to the layer behind it.
+
+Results are written as JSON; --compare diffs two result files so commits can
+be checked for regressions.
+
+Usage:
+    docker compose -f benchmarks/docker-compose.yml up -d
+    python benchmarks/run_benchmark.py --concurrency 16 --duration 60 --output results/head.json
+    python benchmarks/run_benchmark.py --mix remember=1,recall=4 --recall-mode hybrid
+    python benchmarks/run_benchmark.py --compare results/base.json results/head.json
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+GATEWAY_DIR = BENCH_DIR.parent
+
+# Service functions timed as storage layer calls: "<layer>.<function>"
+LAYER_CALLS = {
+    "postgres": [
+        "store_memory",
+        "store_memory_with_outbox",
+        "store_memories_batch",
+        "get_memories_by_ids",
+        "search_memories_lexical",
+        "get_events",
+    ],
+    "embeddings": ["embed_text", "embed_texts", "_request_embeddings"],
+    "qdrant": ["store_memory_vector", "store_memory_vectors", "search_memory_ids", "search_memories"],
+    "pgvector": ["store_memory_vector", "store_memory_vectors", "search_memories"],
+    "zep": ["add_memory", "add_memories", "search_memories", "create_fact"],
+    "valkey": [
+        "get_cache",
+        "get_cache_many",
+        "set_cache",
+        "set_cache_many",
+        "get_bytes_many",
+        "set_bytes_many",
+        "get_cache_generation",
+        "bump_cache_generation",
+    ],
+}
+
+WORDS = (
+    "client invoice meeting deadline budget workflow planner report weekly monthly review "
+    "design launch roadmap hiring contract renewal proposal feedback onboarding migration "
+    "database pipeline dashboard sprint retro customer support pricing marketing campaign "
+    "morning afternoon evening prefers avoids email slack calendar focus deep work travel"
+).split()
+
+MEMORY_TYPES = ["fact", "event", "preference", "observation"]
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+
+class Recorder:
+    """Latency samples (ms) and error counts per name"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.enabled = False
+
+    def record(self, name: str, elapsed_ms: float, ok: bool = True):
+        if not self.enabled:
+            return
+        self.samples[name].append(elapsed_ms)
+        if not ok:
+            self.errors[name] += 1
+
+    def summary(self, duration_s: float) -> Dict[str, Dict[str, float]]:
+        return {
+            name: summarize(samples, self.errors[name], duration_s)
+            for name, samples in sorted(self.samples.items())
+        }
+
+
+def summarize(samples: List[float], errors: int, duration_s: float) -> Dict[str, float]:
+    values = np.asarray(samples, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(values.size),
+        "errors": int(errors),
+        "throughput_rps": round(values.size / duration_s, 2),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def instrument_layers(recorder: Recorder) -> Callable[[], None]:
+    """
+    Wrap storage layer service functions with timers
+
+    Callers look these functions up on the module at call time, so replacing
+    the module attribute times every call path. Returns an undo function.
+    """
+    import importlib
+
+    restore: List[Tuple[Any, str, Any]] = []
+    for layer, functions in LAYER_CALLS.items():
+        module = importlib.import_module(f"app.services.{layer}")
+        for function_name in functions:
+            original = getattr(module, function_name, None)
+            if original is None or not asyncio.iscoroutinefunction(original):
+                continue
+
+            @functools.wraps(original)
+            async def timed(*args, __original=original, __name=f"{layer}.{function_name}", **kwargs):
+                start = time.perf_counter()
+                ok = False
+                try:
+                    result = await __original(*args, **kwargs)
+                    ok = True
+                    return result
+                finally:
+                    recorder.record(__name, (time.perf_counter() - start) * 1000, ok)
+
+            setattr(module, function_name, timed)
+            restore.append((module, function_name, original))
+
+    def undo():
+        for module, function_name, original in restore:
+            setattr(module, function_name, original)
+
+    return undo
+
+
+# ============================================================================
+# Workload
+# ============================================================================
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+class Workload:
+    """Builds requests for each endpoint from a seeded random stream"""
+
+    def __init__(self, rng: random.Random, clients: int, k: int, recall_mode: Optional[str], repeat_ratio: float):
+        self.rng = rng
+        self.clients = clients
+        self.k = k
+        self.recall_mode = recall_mode
+        self.repeat_ratio = repeat_ratio
+        self.recent_queries: List[Tuple[int, str]] = []
+
+    def remember(self) -> Tuple[str, str, Dict[str, Any]]:
+        body = {
+            "client_id": self.rng.randint(1, self.clients),
+            "content": sentence(self.rng, self.rng.randint(8, 40)),
+            "memory_type": self.rng.choice(MEMORY_TYPES),
+            "metadata": {"source": "benchmark"},
+        }
+        return "POST", "/api/v1/memory/remember", {"json": body}
+
+    def recall(self) -> Tuple[str, str, Dict[str, Any]]:
+        if self.recent_queries and self.rng.random() < self.repeat_ratio:
+            client_id, query = self.rng.choice(self.recent_queries)
+        else:
+            client_id, query = self.rng.randint(1, self.clients), sentence(self.rng, self.rng.randint(2, 6))
+            self.recent_queries = (self.recent_queries + [(client_id, query)])[-200:]
+        params: Dict[str, Any] = {"query": query, "client_id": client_id, "k": self.k}
+        if self.recall_mode:
+            params["mode"] = self.recall_mode
+        return "GET", "/api/v1/memory/recall", {"params": params}
+
+    def facts(self) -> Tuple[str, str, Dict[str, Any]]:
+        body = {
+            "content": sentence(self.rng, self.rng.randint(6, 20)),
+            "entity_type": "user",
+            "entity_id": str(self.rng.randint(1, self.clients)),
+            "fact_type": self.rng.choice(["preference", "constraint", "pattern"]),
+        }
+        return "POST", "/api/v1/memory/facts", {"json": body}
+
+    def seed_batch(self, size: int) -> Dict[str, Any]:
+        return {
+            "memories": [
+                {
+                    "client_id": self.rng.randint(1, self.clients),
+                    "content": sentence(self.rng, self.rng.randint(8, 40)),
+                    "memory_type": self.rng.choice(MEMORY_TYPES),
+                    "metadata": {"source": "benchmark-seed"},
+                }
+                for _ in range(size)
+            ]
+        }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """'remember=1,recall=4,facts=0.2' -> weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("remember", "recall", "facts"):
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    mix: Dict[str, float],
+    recorder: Recorder,
+    deadline: float,
+):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        endpoint = workload.rng.choices(names, weights)[0]
+        method, path, kwargs = getattr(workload, endpoint)()
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await client.request(method, path, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            pass
+        recorder.record(endpoint, (time.perf_counter() - start) * 1000, ok)
+
+
+async def seed(client: httpx.AsyncClient, workload: Workload, count: int, batch_size: int):
+    """Store COUNT memories through /remember/batch so recall has data to search"""
+    stored = 0
+    while stored < count:
+        size = min(batch_size, count - stored)
+        response = await client.post(
+            "/api/v1/memory/remember/batch", json=workload.seed_batch(size), timeout=300
+        )
+        response.raise_for_status()
+        stored += size
+        print(f"  ... {stored} memories", end="\r")
+    print()
+
+
+# ============================================================================
+# Stand-ins and gateway
+# ============================================================================
+
+
+def start_fake_embeddings(port: int, latency_ms: float, per_input_ms: float) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(BENCH_DIR / "fake_embeddings.py"),
+            "--port", str(port),
+            "--latency-ms", str(latency_ms),
+            "--per-input-ms", str(per_input_ms),
+        ]
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    print("✗ Fake embeddings server did not start")
+    sys.exit(1)
+
+
+def configure_environment(args: argparse.Namespace):
+    """Point the gateway's settings at the stand-ins (before app is imported)"""
+    defaults = {
+        "POSTGRES_HOST": "localhost",
+        "POSTGRES_PORT": "55432",
+        "POSTGRES_DB": "n8n",
+        "POSTGRES_USER": "n8n",
+        "POSTGRES_PASSWORD": "bench",
+        "QDRANT_HOST": "localhost",
+        "QDRANT_PORT": "56333",
+        "QDRANT_GRPC_PORT": "56334",
+        "VALKEY_HOST": "localhost",
+        "VALKEY_PORT": "56379",
+        "EMBEDDING_PROVIDER": "openrouter",
+        "EMBEDDING_API_URL": args.embedding_url or f"http://127.0.0.1:{args.embedding_port}",
+        "OPENROUTER_API_KEY": "benchmark",
+        "ZEP_MEMORY_ENABLED": "false",
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=GATEWAY_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    sys.path.insert(0, str(GATEWAY_DIR))
+    from app.config import Settings
+    from app.main import app
+
+    settings = Settings()
+    requests_recorder = Recorder()
+    layers_recorder = Recorder()
+    undo = instrument_layers(layers_recorder)
+    rng = random.Random(args.seed)
+    workloads = [
+        Workload(random.Random(rng.random()), args.clients, args.k, args.recall_mode, args.repeat_ratio)
+        for _ in range(args.concurrency)
+    ]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://gateway", timeout=args.timeout, limits=limits
+            ) as client:
+                if args.seed_memories:
+                    print(f"\n[1/3] Seeding {args.seed_memories} memories...")
+                    await seed(client, workloads[0], args.seed_memories, args.seed_batch_size)
+
+                print(f"\n[2/3] Warming up for {args.warmup}s...")
+                deadline = time.perf_counter() + args.warmup
+                await asyncio.gather(
+                    *(worker(client, w, args.mix, requests_recorder, deadline) for w in workloads)
+                )
+
+                print(f"\n[3/3] Measuring for {args.duration}s at concurrency {args.concurrency}...")
+                requests_recorder.enabled = layers_recorder.enabled = True
+                started = time.perf_counter()
+                deadline = started + args.duration
+                await asyncio.gather(
+                    *(worker(client, w, args.mix, requests_recorder, deadline) for w in workloads)
+                )
+                elapsed = time.perf_counter() - started
+                requests_recorder.enabled = layers_recorder.enabled = False
+    finally:
+        undo()
+
+    all_samples = [ms for samples in requests_recorder.samples.values() for ms in samples]
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "duration_s": round(elapsed, 3),
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "clients": args.clients,
+            "k": args.k,
+            "seed_memories": args.seed_memories,
+            "repeat_ratio": args.repeat_ratio,
+            "recall_mode": args.recall_mode or settings.recall_mode,
+            "vector_store": settings.vector_store,
+            "embedding_latency_ms": args.embedding_latency_ms,
+        },
+        "total": summarize(all_samples, sum(requests_recorder.errors.values()), elapsed)
+        if all_samples
+        else {},
+        "endpoints": requests_recorder.summary(elapsed),
+        "layers": layers_recorder.summary(elapsed),
+    }
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]):
+    print(f"\n  {title}")
+    print(f"    {'name':<40} {'count':>7} {'err':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, row in rows.items():
+        print(
+            f"    {name:<40} {row['count']:>7} {row['errors']:>5} {row['throughput_rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms"
+        )
+
+
+def compare(base_path: str, head_path: str, threshold_pct: float) -> bool:
+    """Print per-endpoint/per-layer deltas; True if any p95 or throughput regressed past threshold"""
+    base = json.loads(Path(base_path).read_text())
+    head = json.loads(Path(head_path).read_text())
+    print(f"Base: {base['meta'].get('git_commit')}  Head: {head['meta'].get('git_commit')}")
+
+    regressed = False
+    for section in ("endpoints", "layers"):
+        print(f"\n  {section}")
+        print(f"    {'name':<40} {'p50':>10} {'p95':>10} {'p99':>10} {'rps':>10}")
+        for name, new in head.get(section, {}).items():
+            old = base.get(section, {}).get(name)
+            if not old:
+                print(f"    {name:<40} (new)")
+                continue
+            deltas = {
+                metric: (new[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+                for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+            }
+            flag = ""
+            if deltas["p95_ms"] > threshold_pct or (
+                section == "endpoints" and deltas["throughput_rps"] < -threshold_pct
+            ):
+                flag = "  ✗ regression"
+                regressed = True
+            print(
+                f"    {name:<40} {deltas['p50_ms']:>+9.1f}% {deltas['p95_ms']:>+9.1f}% "
+                f"{deltas['p99_ms']:>+9.1f}% {deltas['throughput_rps']:>+9.1f}%{flag}"
+            )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory gateway against local stand-ins")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent workers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before measuring")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix("remember=1,recall=4,facts=0.2"),
+        help="Endpoint weights, e.g. remember=1,recall=4,facts=0.2",
+    )
+    parser.add_argument("--clients", type=int, default=20, help="Distinct client_ids")
+    parser.add_argument("--k", type=int, default=10, help="Recall k")
+    parser.add_argument(
+        "--recall-mode", choices=["fallback", "parallel", "hybrid", "lexical"], default=None,
+        help="Recall mode per request (defaults to RECALL_MODE)",
+    )
+    parser.add_argument(
+        "--repeat-ratio", type=float, default=0.3, help="Share of recalls that repeat a recent query"
+    )
+    parser.add_argument("--seed-memories", type=int, default=2000, help="Memories stored before measuring")
+    parser.add_argument("--seed-batch-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the workload")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    parser.add_argument("--embedding-url", default=None, help="Use this embeddings API instead of the fake")
+    parser.add_argument("--embedding-port", type=int, default=9100)
+    parser.add_argument("--embedding-latency-ms", type=float, default=40.0)
+    parser.add_argument("--embedding-per-input-ms", type=float, default=0.5)
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASE", "HEAD"), help="Compare two result files and exit"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Regression threshold (%%) for --compare"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    print("=" * 60)
+    print("Memory Gateway Benchmark")
+    print("=" * 60)
+
+    configure_environment(args)
+    fake = None
+    if not args.embedding_url:
+        fake = start_fake_embeddings(
+            args.embedding_port, args.embedding_latency_ms, args.embedding_per_input_ms
+        )
+        print(f"✓ Fake embeddings server on :{args.embedding_port} ({args.embedding_latency_ms}ms)")
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if fake:
+            fake.terminate()
+            fake.wait()
+
+    print_table("endpoints", results["endpoints"])
+    print_table("layers", results["layers"])
+    if results["total"]:
+        total = results["total"]
+        print(
+            f"\n  total: {total['count']} requests, {total['throughput_rps']:.1f} req/s, "
+            f"p50={total['p50_ms']:.1f}ms p95={total['p95_ms']:.1f}ms p99={total['p99_ms']:.1f}ms"
+        )
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
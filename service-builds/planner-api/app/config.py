@@ -45,6 +45,12 @@ class Settings(BaseSettings):
     gcal_credentials_path: str = "/app/credentials/gcal.json"
     gcal_timezone: str = "America/Los_Angeles"
 
+    # Tracing (OpenTelemetry, OTLP/HTTP). Context propagates to the Memory Gateway.
+    otel_enabled: bool = False
+    otel_service_name: str = "planner-api"
+    otel_exporter_otlp_endpoint: str = "http://localhost:4318"
+    otel_sample_ratio: float = 1.0
+
     request_timeout_seconds: float = 30.0
 
     class Config:
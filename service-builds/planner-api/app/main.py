@@ -10,7 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.routes import health, observer, oauth, planner, scheduler
-from app.services import gcal, llm, memory, postgres
+from app.services import gcal, llm, memory, postgres, tracing
 
 logging.basicConfig(level=getattr(logging, settings.log_level.upper(), logging.INFO))
 structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.INFO))
@@ -28,6 +28,7 @@ async def lifespan(app: FastAPI):
     await memory.close()
     await postgres.close()
     await llm.close()
+    tracing.close()
 
 
 app = FastAPI(
@@ -37,6 +38,8 @@ app = FastAPI(
     description="Consolidated Planner API: Intent → SOP → Schedule → Reflect",
 )
 
+tracing.initialize(app)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -9,7 +9,7 @@ from openai import AsyncOpenAI
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from app.config import settings
-from app.services import memory, postgres
+from app.services import memory, postgres, tracing
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +45,7 @@ If no meaningful facts can be extracted, return an empty array [].
     wait=wait_exponential(multiplier=1, min=1, max=4),
     retry=retry_if_exception_type(Exception),
 )
+@tracing.traced("fact_extractor.openrouter")
 async def _call_llm_for_facts(content: str, context: Optional[Dict[str, Any]] = None) -> str:
     """Call LLM to extract facts from content."""
     context_str = json.dumps(context, indent=2) if context else "No additional context"
@@ -13,6 +13,7 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
 from app.config import settings
+from app.services import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +95,7 @@ async def check_health() -> Tuple[bool, str]:
         return False, str(exc)
 
 
+@tracing.traced("gcal.get_events")
 async def get_events(
     days_ahead: int = 14,
     calendar_id: str = "primary",
@@ -134,6 +136,7 @@ async def get_events(
         raise
 
 
+@tracing.traced("gcal.create_event")
 async def create_event(
     title: str,
     start_time: str,
@@ -191,6 +194,7 @@ async def create_event(
         raise
 
 
+@tracing.traced("gcal.update_event")
 async def update_event(
     event_id: str,
     title: Optional[str] = None,
@@ -242,6 +246,7 @@ async def update_event(
         raise
 
 
+@tracing.traced("gcal.delete_event")
 async def delete_event(event_id: str, calendar_id: str = "primary") -> None:
     """Delete an event from Google Calendar.
 
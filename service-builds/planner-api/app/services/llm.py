@@ -11,6 +11,7 @@ from openai import APIError, APIStatusError, AsyncOpenAI, RateLimitError
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from app.config import settings
+from app.services import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -141,6 +142,7 @@ def _estimate_cost(usage: Optional[Dict[str, Any]]) -> Optional[float]:
     wait=wait_exponential(multiplier=1, min=1, max=4),
     retry=retry_if_exception_type((RateLimitError, APIError, APIStatusError)),
 )
+@tracing.traced("llm.openrouter")
 async def _call_openrouter(messages: list[Dict[str, str]]):
     return await openrouter.chat.completions.create(
         model=settings.openrouter_model,
@@ -151,6 +153,7 @@ async def _call_openrouter(messages: list[Dict[str, str]]):
     )
 
 
+@tracing.traced("llm.generate_sop")
 async def generate_sop(
     *,
     intent: str,
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import httpx
 
 from app.config import settings
+from app.services import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,7 @@ async def check_health() -> Tuple[bool, str]:
         return False, str(exc)
 
 
+@tracing.traced("memory.fetch_preferences")
 async def fetch_preferences(
     *,
     client_id: int,
@@ -78,6 +80,7 @@ async def fetch_preferences(
         return []
 
 
+@tracing.traced("memory.fetch_recent_plans")
 async def fetch_recent_plans(*, client_id: int, limit: int = 3) -> List[Dict[str, Any]]:
     """Placeholder for future caching logic via Memory Gateway events."""
     if not _client:
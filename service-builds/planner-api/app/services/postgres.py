@@ -10,6 +10,7 @@ import asyncpg
 
 from app.config import settings
 from app.models import PromptTemplate
+from app.services import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ async def check_connection() -> Tuple[bool, str]:
         return False, str(exc)
 
 
+@tracing.traced("postgres.insert_plan")
 async def insert_plan(
     *,
     plan_title: str,
@@ -87,6 +89,7 @@ async def insert_plan(
         }
 
 
+@tracing.traced("postgres.get_plan")
 async def get_plan(plan_id: int) -> Optional[Dict[str, Any]]:
     if not _pool:
         raise RuntimeError("Postgres pool not initialized")
@@ -113,6 +116,7 @@ async def get_plan(plan_id: int) -> Optional[Dict[str, Any]]:
         }
 
 
+@tracing.traced("postgres.update_plan_status")
 async def update_plan_status(plan_id: int, status: str, metadata: Optional[Dict[str, Any]] = None) -> None:
     if not _pool:
         raise RuntimeError("Postgres pool not initialized")
@@ -127,6 +131,7 @@ async def update_plan_status(plan_id: int, status: str, metadata: Optional[Dict[
         await conn.execute(query, plan_id, status, meta_json)
 
 
+@tracing.traced("postgres.get_prompt_template")
 async def get_prompt_template(template_name: str, version: Optional[str] = None) -> Optional[PromptTemplate]:
     """Return prompt template details."""
     if not _pool:
@@ -0,0 +1,73 @@
+"""OpenTelemetry tracing: OTLP export and W3C trace context propagation."""
+from __future__ import annotations
+
+import functools
+import logging
+from typing import Any, Callable, Optional
+
+from fastapi import FastAPI
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+from opentelemetry.sdk.resources import SERVICE_NAME, SERVICE_VERSION, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# No-op until initialize() installs a provider.
+tracer = trace.get_tracer("planner-api")
+
+_provider: Optional[TracerProvider] = None
+
+
+def initialize(app: FastAPI) -> None:
+    """Install the OTLP tracer provider and instrument FastAPI + httpx.
+
+    Runs at import of app.main: FastAPI must be instrumented before its first
+    request, and httpx before the Memory Gateway client is created, so that
+    every gateway call carries a `traceparent` header.
+    """
+    global _provider
+    if not settings.otel_enabled or _provider:
+        return
+
+    _provider = TracerProvider(
+        resource=Resource.create(
+            {SERVICE_NAME: settings.otel_service_name, SERVICE_VERSION: settings.service_version}
+        ),
+        sampler=ParentBased(TraceIdRatioBased(settings.otel_sample_ratio)),
+    )
+    endpoint = f"{settings.otel_exporter_otlp_endpoint.rstrip('/')}/v1/traces"
+    _provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+    trace.set_tracer_provider(_provider)
+
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="health")
+    HTTPXClientInstrumentor().instrument()
+    logger.info("Tracing enabled (%s -> %s)", settings.otel_service_name, settings.otel_exporter_otlp_endpoint)
+
+
+def close() -> None:
+    """Flush buffered spans."""
+    global _provider
+    if _provider:
+        _provider.shutdown()
+        _provider = None
+
+
+def traced(name: str) -> Callable:
+    """Wrap an async service call in a span named `name` (e.g. "memory.fetch_preferences")."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.start_as_current_span(name, attributes={"planner.component": name.split(".")[0]}):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,34 @@
+-- Migration 004: Memory Outbox for write-behind /remember
+-- Created: 2026-10-17
+-- Purpose: Durable outbox so supplementary layers (Zep, Qdrant, Valkey) are
+--          replicated by a background worker instead of on the request path
+
+-- ============================================================================
+-- MEMORY OUTBOX: One row per memory awaiting replication
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS memory_outbox (
+    memory_id BIGINT PRIMARY KEY REFERENCES events(id) ON DELETE CASCADE,  -- Idempotency key
+    client_id INTEGER,
+    payload JSONB NOT NULL,                    -- {content, memory_type, metadata}
+    pending_layers TEXT[] NOT NULL,            -- Layers still to write: 'zep', 'qdrant', 'valkey'
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- 'pending', 'dead' (attempts exhausted)
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_memory_outbox_due ON memory_outbox(next_attempt_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_memory_outbox_dead ON memory_outbox(updated_at DESC) WHERE status = 'dead';
+
+-- ============================================================================
+-- VALIDATION QUERIES (for testing post-migration)
+-- ============================================================================
+
+-- Backlog waiting for replication:
+-- SELECT COUNT(*), MIN(created_at) FROM memory_outbox WHERE status = 'pending';
+
+-- Entries that exhausted their retries:
+-- SELECT memory_id, pending_layers, attempts, last_error FROM memory_outbox WHERE status = 'dead';
@@ -0,0 +1,26 @@
+-- Migration 005: Full-text index over memory content
+-- Created: 2026-10-17
+-- Purpose: Lexical retrieval for /recall (hybrid mode and the Postgres
+--          fallback) without an embedding call
+
+-- ============================================================================
+-- MEMORY CONTENT FULL-TEXT INDEX
+-- ============================================================================
+
+-- Expression index (no stored column, so no table rewrite). Queries must use
+-- the identical expression and the event_type predicate to be able to use it;
+-- see postgres.search_memories_lexical in the memory gateway.
+-- On a large live table, run this with CREATE INDEX CONCURRENTLY instead.
+CREATE INDEX IF NOT EXISTS idx_events_memory_content_fts
+    ON events
+    USING GIN (to_tsvector('english', COALESCE(payload->>'content', '')))
+    WHERE event_type LIKE 'memory:%';
+
+-- ============================================================================
+-- VALIDATION QUERIES (for testing post-migration)
+-- ============================================================================
+
+-- Should show a Bitmap Index Scan on idx_events_memory_content_fts:
+-- EXPLAIN SELECT id FROM events
+-- WHERE event_type LIKE 'memory:%' AND client_id = 1
+--   AND to_tsvector('english', COALESCE(payload->>'content', '')) @@ websearch_to_tsquery('english', 'invoice 2041');
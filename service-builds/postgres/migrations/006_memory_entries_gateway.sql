@@ -0,0 +1,87 @@
+-- Migration 006: memory_entries as a memory gateway vector store
+-- Created: 2026-10-17
+-- Purpose: Let the memory gateway write /remember embeddings to pgvector and
+--          serve /recall from it (primary or Qdrant fallback)
+
+-- ============================================================================
+-- LINK ENTRIES TO THEIR MEMORY EVENT
+-- ============================================================================
+
+-- One entry per gateway memory; the idempotency key for replays from the outbox
+ALTER TABLE memory_entries ADD COLUMN IF NOT EXISTS memory_id BIGINT REFERENCES events(id) ON DELETE CASCADE;
+ALTER TABLE memory_entries ADD COLUMN IF NOT EXISTS memory_type VARCHAR(50);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_memory_entries_memory_id ON memory_entries(memory_id);
+
+-- ============================================================================
+-- CLIENT REFERENCE: PROFILES ARE ONLY REQUIRED FOR PLANNER ENTRIES
+-- ============================================================================
+
+-- /remember accepts any client_id (events has no profile FK), so a profile FK
+-- would reject the vector of every memory whose client has no profile. A
+-- foreign key cannot be conditional; the trigger below keeps the profile check
+-- (and the ON DELETE CASCADE) for episode/fact/working_state entries only.
+ALTER TABLE memory_entries DROP CONSTRAINT IF EXISTS memory_entries_client_id_fkey;
+
+CREATE OR REPLACE FUNCTION memory_entries_check_client()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.source_type <> 'memory'
+     AND NOT EXISTS (SELECT 1 FROM client_profiles WHERE client_id = NEW.client_id) THEN
+    RAISE EXCEPTION 'client_id % is not present in client_profiles', NEW.client_id
+      USING ERRCODE = 'foreign_key_violation';
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_memory_entries_check_client ON memory_entries;
+CREATE TRIGGER trg_memory_entries_check_client
+  BEFORE INSERT OR UPDATE OF client_id, source_type ON memory_entries
+  FOR EACH ROW EXECUTE FUNCTION memory_entries_check_client();
+
+CREATE OR REPLACE FUNCTION client_profiles_delete_entries()
+RETURNS TRIGGER AS $$
+BEGIN
+  DELETE FROM memory_entries WHERE client_id = OLD.client_id AND source_type <> 'memory';
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_client_profiles_delete_entries ON client_profiles;
+CREATE TRIGGER trg_client_profiles_delete_entries
+  AFTER DELETE ON client_profiles
+  FOR EACH ROW EXECUTE FUNCTION client_profiles_delete_entries();
+
+-- ============================================================================
+-- SOURCE TYPE
+-- ============================================================================
+
+-- Gateway memories are their own source type
+ALTER TABLE memory_entries DROP CONSTRAINT IF EXISTS memory_entries_source_type_check;
+ALTER TABLE memory_entries ADD CONSTRAINT memory_entries_source_type_check
+    CHECK (source_type IN ('episode', 'fact', 'working_state', 'memory'));
+
+-- embedding stays VECTOR(1536). The gateway refuses to start with pgvector
+-- enabled when the embedding size differs (EMBEDDING_DIMENSIONS, local models);
+-- resize the column and rebuild its index first, e.g. for 384 dims:
+--   DROP INDEX idx_memory_entries_embedding;
+--   ALTER TABLE memory_entries ALTER COLUMN embedding TYPE VECTOR(384) USING NULL;
+--   then re-embed every entry and run postgres/reindex_vectors.py
+
+-- ============================================================================
+-- VALIDATION QUERIES (for testing post-migration)
+-- ============================================================================
+
+-- Gateway memories for clients without a profile are accepted:
+-- SELECT COUNT(*) FROM memory_entries me
+-- WHERE source_type = 'memory'
+--   AND NOT EXISTS (SELECT 1 FROM client_profiles cp WHERE cp.client_id = me.client_id);
+
+-- Entries written by the gateway:
+-- SELECT COUNT(*), MAX(created_at) FROM memory_entries WHERE source_type = 'memory';
+
+-- Should use idx_memory_entries_embedding (ivfflat):
+-- SET ivfflat.probes = 10;
+-- EXPLAIN SELECT memory_id FROM memory_entries WHERE client_id = 1
+-- ORDER BY embedding <=> (SELECT embedding FROM memory_entries LIMIT 1) LIMIT 10;
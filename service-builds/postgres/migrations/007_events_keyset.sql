@@ -0,0 +1,32 @@
+-- Migration 007: Composite indexes for event history pagination
+-- Created: 2026-10-17
+-- Purpose: Keyset (cursor) pagination in postgres.get_events - each page is
+--          an index range scan on (created_at, id) regardless of depth
+
+-- ============================================================================
+-- EVENT HISTORY INDEXES
+-- ============================================================================
+
+-- Filtered history: WHERE client_id = ? AND event_type = ?
+--                   AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC
+-- id is the tiebreaker for events sharing a timestamp.
+-- On a large live table, run these with CREATE INDEX CONCURRENTLY instead.
+CREATE INDEX IF NOT EXISTS idx_events_client_type_created
+    ON events(client_id, event_type, created_at DESC, id DESC);
+
+-- Unfiltered history: WHERE client_id = ? ... same ordering
+CREATE INDEX IF NOT EXISTS idx_events_client_created
+    ON events(client_id, created_at DESC, id DESC);
+
+-- idx_events_client_id (002) is a prefix of both and no longer needed:
+-- DROP INDEX CONCURRENTLY IF EXISTS idx_events_client_id;
+
+-- ============================================================================
+-- VALIDATION QUERIES (for testing post-migration)
+-- ============================================================================
+
+-- Should show an Index Scan on idx_events_client_type_created with no Sort node:
+-- EXPLAIN SELECT id FROM events
+-- WHERE client_id = 1 AND event_type = 'memory:fact'
+--   AND (created_at, id) < ('2026-10-01T00:00:00Z', 500)
+-- ORDER BY created_at DESC, id DESC LIMIT 50;
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+pgvector Index Maintenance
+Purpose: Rebuild memory_entries / episodes vector indexes sized for their data
+
+Migration 001 creates ivfflat indexes with lists = 100 on empty tables, so
+their centroids never reflect real data. This command measures each table,
+builds a replacement index with CREATE INDEX CONCURRENTLY (reads and writes
+continue), swaps it in, and reports query latency and recall@k against exact
+search before and after.
+
+Index choice:
+    hnsw     - graph index, best recall/latency, needs pgvector >= 0.5.0
+    ivfflat  - lists = rows / 1000 up to 1M rows, sqrt(rows) above
+    auto     - hnsw when available, else ivfflat
+
+Usage:
+    POSTGRES_HOST=localhost POSTGRES_PASSWORD=... python reindex_vectors.py
+    python reindex_vectors.py --table episodes --method ivfflat --dry-run
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg
+
+# Tables with a pgvector `embedding` column and the index migration 001 created
+TABLES = {
+    "memory_entries": "idx_memory_entries_embedding",
+    "episodes": "idx_episodes_embedding",
+}
+
+HNSW_MIN_VERSION = (0, 5, 0)
+
+
+def connect() -> psycopg.Connection:
+    """Connect with the same environment variables as the memory gateway"""
+    return psycopg.connect(
+        host=os.environ.get("POSTGRES_HOST", "localhost"),
+        port=int(os.environ.get("POSTGRES_PORT", "5432")),
+        dbname=os.environ.get("POSTGRES_DB", "n8n"),
+        user=os.environ.get("POSTGRES_USER", "n8n"),
+        password=os.environ.get("POSTGRES_PASSWORD", ""),
+        autocommit=True,  # CREATE/DROP INDEX CONCURRENTLY cannot run in a transaction
+    )
+
+
+def pgvector_version(conn: psycopg.Connection) -> Tuple[int, ...]:
+    row = conn.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'").fetchone()
+    if not row:
+        print("✗ pgvector extension is not installed")
+        sys.exit(1)
+    return tuple(int(part) for part in row[0].split(".")[:3])
+
+
+def index_definition(conn: psycopg.Connection, index: str) -> Optional[str]:
+    row = conn.execute("SELECT indexdef FROM pg_indexes WHERE indexname = %s", (index,)).fetchone()
+    return row[0] if row else None
+
+
+def ivfflat_lists(rows: int) -> int:
+    """pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond"""
+    if rows <= 1_000_000:
+        return max(10, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def search_settings(method: str, lists: int, ef_search: int) -> Dict[str, int]:
+    """Search-time settings for benchmarking an index"""
+    if method == "hnsw":
+        return {"hnsw.ef_search": int(ef_search)}
+    # Scanning ~sqrt(lists) lists is the usual starting point
+    return {"ivfflat.probes": max(1, int(math.sqrt(lists)))}
+
+
+def sample_queries(conn: psycopg.Connection, table: str, count: int) -> List[str]:
+    """Use stored embeddings as query vectors (text form, cast back with ::vector)"""
+    rows = conn.execute(
+        f"SELECT embedding::text FROM {table} WHERE embedding IS NOT NULL "
+        "ORDER BY random() LIMIT %s",
+        (count,),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def top_k(conn: psycopg.Connection, table: str, query: str, k: int) -> List[Any]:
+    rows = conn.execute(
+        f"SELECT id FROM {table} WHERE embedding IS NOT NULL "
+        "ORDER BY embedding <=> %s::vector LIMIT %s",
+        (query, k),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def exact_results(conn: psycopg.Connection, table: str, queries: List[str], k: int) -> List[set]:
+    """Ground truth: sequential scan with index scans disabled"""
+    with conn.transaction():
+        conn.execute("SET LOCAL enable_indexscan = off")
+        conn.execute("SET LOCAL enable_bitmapscan = off")
+        return [set(top_k(conn, table, query, k)) for query in queries]
+
+
+def benchmark(
+    conn: psycopg.Connection,
+    table: str,
+    queries: List[str],
+    truth: List[set],
+    k: int,
+    settings: Dict[str, int],
+) -> Dict[str, float]:
+    """Recall@k against exact search and latency percentiles for the current index"""
+    with conn.transaction():
+        for name, value in settings.items():
+            conn.execute(f"SET LOCAL {name} = {value}")
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            found = top_k(conn, table, query, k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len(expected.intersection(found))
+
+    latencies.sort()
+    total = sum(len(expected) for expected in truth) or 1
+    return {
+        "recall": hits / total,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def print_benchmark(label: str, result: Optional[Dict[str, float]]):
+    if result is None:
+        print(f"    {label:<7} (no sample queries)")
+        return
+    print(
+        f"    {label:<7} recall@k={result['recall']:.4f}  "
+        f"p50={result['p50_ms']:.1f}ms  p95={result['p95_ms']:.1f}ms"
+    )
+
+
+def rebuild_index(
+    conn: psycopg.Connection,
+    table: str,
+    index: str,
+    method: str,
+    lists: int,
+    m: int,
+    ef_construction: int,
+):
+    """Build the replacement concurrently, then swap it in under the old name"""
+    new_index = f"{index}_new"
+    # Leftover from an interrupted run (CONCURRENTLY leaves INVALID indexes behind)
+    conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new_index}")
+
+    if method == "hnsw":
+        options = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+    else:
+        options = f"lists = {int(lists)}"
+
+    start = time.time()
+    conn.execute(
+        f"CREATE INDEX CONCURRENTLY {new_index} ON {table} "
+        f"USING {method} (embedding vector_cosine_ops) WITH ({options})"
+    )
+    print(f"✓ Built {method} index ({options}) in {time.time() - start:.1f}s")
+
+    conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+    conn.execute(f"ALTER INDEX {new_index} RENAME TO {index}")
+    print(f"✓ Swapped in as {index}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild pgvector indexes for current data")
+    parser.add_argument("--table", choices=sorted(TABLES) + ["all"], default="all")
+    parser.add_argument("--method", choices=["auto", "hnsw", "ivfflat"], default="auto")
+    parser.add_argument("--m", type=int, default=16, help="HNSW links per node")
+    parser.add_argument("--ef-construction", type=int, default=64, help="HNSW build beam width")
+    parser.add_argument("--ef-search", type=int, default=40, help="HNSW search beam width")
+    parser.add_argument("--queries", type=int, default=50, help="Sample queries for the benchmark")
+    parser.add_argument("--k", type=int, default=10, help="Results per benchmark query")
+    parser.add_argument(
+        "--maintenance-work-mem", default="512MB", help="Memory for the index build"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Measure and report only")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("pgvector Index Maintenance")
+    print("=" * 60)
+
+    with connect() as conn:
+        version = pgvector_version(conn)
+        hnsw_ok = version >= HNSW_MIN_VERSION
+        method = args.method
+        if method == "auto":
+            method = "hnsw" if hnsw_ok else "ivfflat"
+        if method == "hnsw" and not hnsw_ok:
+            print(f"✗ HNSW needs pgvector >= 0.5.0 (installed: {'.'.join(map(str, version))})")
+            sys.exit(1)
+        conn.execute(f"SET maintenance_work_mem = '{args.maintenance_work_mem}'")
+
+        tables = sorted(TABLES) if args.table == "all" else [args.table]
+        for table in tables:
+            index = TABLES[table]
+            rows = conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE embedding IS NOT NULL"
+            ).fetchone()[0]
+            lists = ivfflat_lists(rows)
+            print(f"\n  {table}: {rows} rows with embeddings")
+            print(f"    current: {index_definition(conn, index) or '(no index)'}")
+            print(f"    target:  {method}" + (f" (lists = {lists})" if method == "ivfflat" else ""))
+
+            queries = sample_queries(conn, table, args.queries)
+            truth = exact_results(conn, table, queries, args.k) if queries else []
+
+            old_definition = index_definition(conn, index) or ""
+            old_method = "hnsw" if "hnsw" in old_definition else "ivfflat"
+            old_lists = lists
+            if "lists" in old_definition:
+                old_lists = int(old_definition.split("lists='")[-1].split("'")[0])
+            before = None
+            if queries:
+                before = benchmark(
+                    conn, table, queries, truth, args.k,
+                    search_settings(old_method, old_lists, args.ef_search),
+                )
+            print_benchmark("before", before)
+
+            if args.dry_run:
+                continue
+
+            rebuild_index(conn, table, index, method, lists, args.m, args.ef_construction)
+            conn.execute(f"ANALYZE {table}")
+
+            after = None
+            if queries:
+                after = benchmark(
+                    conn, table, queries, truth, args.k,
+                    search_settings(method, lists, args.ef_search),
+                )
+            print_benchmark("after", after)
+
+    print("\nSet PGVECTOR_PROBES / PGVECTOR_EF_SEARCH for the memory gateway to match.")
+
+
+if __name__ == "__main__":
+    main()
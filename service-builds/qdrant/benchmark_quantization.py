@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Qdrant Quantization Benchmark
+Purpose: Measure recall@k, latency and vector RAM of quantized vs float32 storage
+
+Samples points (with vectors) from an existing collection, loads them into
+temporary collections - one per storage variant - and searches each with
+sampled vectors as queries. Exact (brute-force) float32 search is the ground
+truth. Temporary collections are deleted afterwards; the source collection
+is only read.
+
+Usage:
+    python benchmark_quantization.py --collection events --sample 20000 --queries 200 --k 10
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from setup_collections import QDRANT_URL, QUANTIZATION_CONFIGS, TIMEOUT
+
+# (name, quantization, originals on disk)
+VARIANTS = [
+    ("float32", "none", False),
+    ("scalar-int8", "scalar", True),
+    ("binary", "binary", True),
+]
+
+# Bytes per dimension held in RAM for each quantization
+RAM_BYTES_PER_DIM = {"none": 4.0, "scalar": 1.0, "binary": 1 / 8}
+
+
+def scroll_vectors(collection: str, sample: int) -> List[Dict[str, Any]]:
+    """Read up to `sample` points with their vectors"""
+    points: List[Dict[str, Any]] = []
+    offset = None
+    while len(points) < sample:
+        body: Dict[str, Any] = {
+            "limit": min(1000, sample - len(points)),
+            "with_vector": True,
+            "with_payload": False,
+        }
+        if offset is not None:
+            body["offset"] = offset
+        response = requests.post(
+            f"{QDRANT_URL}/collections/{collection}/points/scroll", json=body, timeout=TIMEOUT
+        )
+        response.raise_for_status()
+        result = response.json()["result"]
+        points.extend({"id": p["id"], "vector": p["vector"]} for p in result["points"])
+        offset = result.get("next_page_offset")
+        if offset is None:
+            break
+    return points
+
+
+def wait_for_green(collection: str, timeout: float = 600) -> None:
+    """Wait until Qdrant has finished indexing / quantizing the collection"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"{QDRANT_URL}/collections/{collection}", timeout=TIMEOUT)
+        response.raise_for_status()
+        if response.json()["result"]["status"] == "green":
+            return
+        time.sleep(1)
+    raise TimeoutError(f"Collection '{collection}' not indexed after {timeout}s")
+
+
+def load_variant(
+    name: str, quantization: str, on_disk: bool, points: List[Dict[str, Any]]
+) -> None:
+    """Create a temporary collection for one storage variant and upload the sample"""
+    dim = len(points[0]["vector"])
+    body: Dict[str, Any] = {
+        "vectors": {"size": dim, "distance": "Cosine", "on_disk": on_disk},
+        # Index even small samples, so HNSW (and quantization) are actually used
+        "optimizers_config": {"indexing_threshold": 1},
+    }
+    if QUANTIZATION_CONFIGS[quantization]:
+        body["quantization_config"] = QUANTIZATION_CONFIGS[quantization]
+
+    requests.delete(f"{QDRANT_URL}/collections/{name}", timeout=TIMEOUT)
+    requests.put(f"{QDRANT_URL}/collections/{name}", json=body, timeout=TIMEOUT).raise_for_status()
+    for i in range(0, len(points), 256):
+        requests.put(
+            f"{QDRANT_URL}/collections/{name}/points",
+            params={"wait": "true"},
+            json={"points": points[i : i + 256]},
+            timeout=TIMEOUT,
+        ).raise_for_status()
+    wait_for_green(name)
+
+
+def search(
+    collection: str,
+    vector: List[float],
+    k: int,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Any]:
+    """Return the IDs of the top-k hits"""
+    body: Dict[str, Any] = {"vector": vector, "limit": k, "with_payload": False}
+    if params:
+        body["params"] = params
+    response = requests.post(
+        f"{QDRANT_URL}/collections/{collection}/points/search", json=body, timeout=TIMEOUT
+    )
+    response.raise_for_status()
+    return [hit["id"] for hit in response.json()["result"]]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant quantization")
+    parser.add_argument("--collection", default="events", help="Collection to sample from")
+    parser.add_argument("--sample", type=int, default=20000, help="Points to sample")
+    parser.add_argument("--queries", type=int, default=200, help="Query vectors")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--oversampling", type=float, default=2.0, help="Quantized oversampling")
+    parser.add_argument("--keep", action="store_true", help="Keep temporary collections")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Qdrant Quantization Benchmark")
+    print("=" * 60)
+
+    print(f"\n[1/3] Sampling up to {args.sample} points from '{args.collection}'...")
+    points = scroll_vectors(args.collection, args.sample)
+    if len(points) < args.k:
+        print(f"✗ Only {len(points)} points in '{args.collection}' - nothing to benchmark")
+        sys.exit(1)
+    dim = len(points[0]["vector"])
+    queries = [p["vector"] for p in random.sample(points, min(args.queries, len(points)))]
+    print(f"✓ {len(points)} points, {dim} dims, {len(queries)} queries")
+
+    print("\n[2/3] Loading variants...")
+    collections = {}
+    for name, quantization, on_disk in VARIANTS:
+        collection = f"bench_{args.collection}_{name.replace('-', '_')}"
+        load_variant(collection, quantization, on_disk, points)
+        collections[name] = collection
+        print(f"✓ {name} loaded into '{collection}'")
+
+    print(f"\n[3/3] Searching (recall@{args.k} vs exact float32)...")
+    truth = [
+        set(search(collections["float32"], q, args.k, {"exact": True})) for q in queries
+    ]
+    print(f"\n  {'variant':<12} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'vector RAM':>12}")
+    try:
+        for name, quantization, on_disk in VARIANTS:
+            params: Dict[str, Any] = {}
+            if quantization != "none":
+                params["quantization"] = {"rescore": True, "oversampling": args.oversampling}
+
+            hits, latencies = 0, []
+            for q, expected in zip(queries, truth):
+                start = time.perf_counter()
+                found = search(collections[name], q, args.k, params)
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += len(expected.intersection(found))
+
+            recall = hits / sum(len(expected) for expected in truth)
+            ram_mb = len(points) * dim * RAM_BYTES_PER_DIM[quantization] / 1024 ** 2
+            print(
+                f"  {name:<12} {recall:>9.4f} {percentile(latencies, 0.5):>8.1f} "
+                f"{percentile(latencies, 0.95):>8.1f} {ram_mb:>9.1f} MB"
+            )
+    finally:
+        if not args.keep:
+            for collection in collections.values():
+                requests.delete(f"{QDRANT_URL}/collections/{collection}", timeout=TIMEOUT)
+
+    print("\nVector RAM counts the vectors held in memory only (quantized vectors when")
+    print("originals are on disk); HNSW graph and payload indexes come on top.")
+
+
+if __name__ == "__main__":
+    main()
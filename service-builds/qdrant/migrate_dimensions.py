@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Qdrant Embedding Dimension Migration
+Purpose: Move a collection to shortened (Matryoshka) text-embedding-3 vectors
+
+Copies every point of the collection behind ALIAS into a new collection with
+DIMENSIONS-sized vectors. Vectors are either truncated and re-normalized (no
+API calls; text-embedding-3 vectors are trained so that their prefixes are
+valid embeddings) or re-embedded with the `dimensions` request parameter.
+
+The migration runs in two phases so the gateway never talks to a collection
+of the wrong size:
+
+1. Copy: create ALIAS_d<DIMENSIONS>_<ts>, copy every point, then catch up on
+   points written during the copy (indexed `timestamp` payload field). No
+   alias is touched and nothing is deleted; the gateway keeps using the old
+   collection.
+2. Set QDRANT_COLLECTION=<new collection> and EMBEDDING_DIMENSIONS=DIMENSIONS
+   for the gateway and restart it, then run the printed --finish command. It
+   copies writes that reached the old collection before the switch, points
+   ALIAS (or ALIAS_live, if ALIAS is still a plain collection) at the new
+   collection and, with --drop-old, deletes the old one.
+
+Until --drop-old, rolling back is a matter of restoring the old
+QDRANT_COLLECTION and EMBEDDING_DIMENSIONS.
+
+Usage:
+    python migrate_dimensions.py --alias events --dimensions 512
+    python migrate_dimensions.py --alias events_live --dimensions 256 --mode reembed
+    python migrate_dimensions.py --alias events --finish events --target events_d512_<ts> \\
+        --since <ts> --drop-old
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from setup_collections import QDRANT_URL, TIMEOUT, get_alias_target
+
+EMBEDDING_API_URL = os.environ.get("EMBEDDING_API_URL", "https://openrouter.ai/api/v1")
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "openai/text-embedding-3-small")
+OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY", "")
+BATCH_SIZE = 256
+
+
+def get_collection(name: str) -> Dict[str, Any]:
+    response = requests.get(f"{QDRANT_URL}/collections/{name}", timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()["result"]
+
+
+def create_target(name: str, source: Dict[str, Any], dimensions: int) -> None:
+    """Create the new collection with the source's storage settings and payload indexes"""
+    vectors = source["config"]["params"]["vectors"]
+    body: Dict[str, Any] = {
+        "vectors": {
+            "size": dimensions,
+            "distance": vectors["distance"],
+            "on_disk": vectors.get("on_disk", False),
+        }
+    }
+    if source["config"].get("quantization_config"):
+        body["quantization_config"] = source["config"]["quantization_config"]
+
+    requests.put(f"{QDRANT_URL}/collections/{name}", json=body, timeout=TIMEOUT).raise_for_status()
+    print(f"✓ Created '{name}' ({dimensions} dims)")
+
+    for field_name, schema in (source.get("payload_schema") or {}).items():
+        requests.put(
+            f"{QDRANT_URL}/collections/{name}/index",
+            params={"wait": "true"},
+            json={"field_name": field_name, "field_schema": schema.get("params") or schema["data_type"]},
+            timeout=TIMEOUT,
+        ).raise_for_status()
+        print(f"✓ Payload index '{name}.{field_name}' created")
+
+
+def truncate(vector: List[float], dimensions: int) -> List[float]:
+    """Keep the first `dimensions` components and re-normalize to unit length"""
+    head = vector[:dimensions]
+    norm = math.sqrt(sum(x * x for x in head)) or 1.0
+    return [x / norm for x in head]
+
+
+def reembed(texts: List[str], dimensions: int) -> List[List[float]]:
+    """Embed texts at the target dimension via the embeddings API"""
+    response = requests.post(
+        f"{EMBEDDING_API_URL}/embeddings",
+        headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}"},
+        json={"model": EMBEDDING_MODEL, "input": texts, "dimensions": dimensions},
+        timeout=TIMEOUT * 4,
+    )
+    response.raise_for_status()
+    data = sorted(response.json()["data"], key=lambda item: item["index"])
+    return [item["embedding"] for item in data]
+
+
+def convert(points: List[Dict[str, Any]], dimensions: int, mode: str) -> List[Dict[str, Any]]:
+    """Shorten a batch of points' vectors"""
+    vectors = [truncate(p["vector"], dimensions) for p in points]
+    if mode == "reembed":
+        # Points without stored content keep the truncated vector
+        indexed = [i for i, p in enumerate(points) if (p.get("payload") or {}).get("content")]
+        for i, vector in zip(
+            indexed, reembed([points[i]["payload"]["content"] for i in indexed], dimensions)
+        ):
+            vectors[i] = vector
+    return [
+        {"id": p["id"], "vector": vector, "payload": p.get("payload") or {}}
+        for p, vector in zip(points, vectors)
+    ]
+
+
+def copy_points(
+    source: str,
+    target: str,
+    dimensions: int,
+    mode: str,
+    since: Optional[str] = None,
+) -> int:
+    """Copy (and shorten) points from source to target, optionally only those written since"""
+    copied = 0
+    offset = None
+    while True:
+        body: Dict[str, Any] = {"limit": BATCH_SIZE, "with_vector": True, "with_payload": True}
+        if since:
+            body["filter"] = {"must": [{"key": "timestamp", "range": {"gte": since}}]}
+        if offset is not None:
+            body["offset"] = offset
+        response = requests.post(
+            f"{QDRANT_URL}/collections/{source}/points/scroll", json=body, timeout=TIMEOUT
+        )
+        response.raise_for_status()
+        result = response.json()["result"]
+        if result["points"]:
+            requests.put(
+                f"{QDRANT_URL}/collections/{target}/points",
+                params={"wait": "true"},
+                json={"points": convert(result["points"], dimensions, mode)},
+                timeout=TIMEOUT,
+            ).raise_for_status()
+            copied += len(result["points"])
+            print(f"  ... {copied} points", end="\r")
+        offset = result.get("next_page_offset")
+        if offset is None:
+            break
+    print()
+    return copied
+
+
+def swap_alias(alias: str, target: str, old_target: Optional[str]) -> None:
+    """Point alias at target in one atomic alias operation"""
+    actions: List[Dict[str, Any]] = []
+    if old_target:
+        actions.append({"delete_alias": {"alias_name": alias}})
+    actions.append({"create_alias": {"collection_name": target, "alias_name": alias}})
+    requests.post(
+        f"{QDRANT_URL}/collections/aliases", json={"actions": actions}, timeout=TIMEOUT
+    ).raise_for_status()
+
+
+def finish(
+    alias: str, source: str, target: str, since: str, mode: str, drop_old: bool
+) -> None:
+    """Copy source's writes since `since` into target, point alias at target, drop source"""
+    dimensions = get_collection(target)["config"]["params"]["vectors"]["size"]
+
+    print(f"\n[1/3] Copying points written to '{source}' since {since} into '{target}'...")
+    caught_up = copy_points(source, target, dimensions, mode, since=since)
+    print(f"✓ Copied {caught_up} points")
+
+    # A plain collection can't be replaced by an alias of the same name without
+    # deleting it first; publish the new collection under ALIAS_live instead
+    old_target = get_alias_target(alias)
+    if not old_target:
+        alias = f"{alias}_live"
+        old_target = get_alias_target(alias)
+    print(f"\n[2/3] Pointing '{alias}' at '{target}'...")
+    swap_alias(alias, target, old_target)
+    print(f"✓ '{alias}' -> '{target}'")
+
+    print("\n[3/3] Old collection...")
+    if drop_old:
+        requests.delete(f"{QDRANT_URL}/collections/{source}", timeout=TIMEOUT).raise_for_status()
+        print(f"✓ Deleted '{source}'")
+    else:
+        print(f"✓ Kept '{source}' (re-run with --drop-old once the gateway is healthy)")
+    print(f"\nThe gateway may now use QDRANT_COLLECTION={alias} (it points at '{target}').")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate a collection to shorter embeddings")
+    parser.add_argument("--alias", default="events", help="Alias (or collection) the gateway uses")
+    parser.add_argument("--dimensions", type=int, help="Target vector size")
+    parser.add_argument(
+        "--mode",
+        choices=["truncate", "reembed"],
+        default="truncate",
+        help="truncate + re-normalize stored vectors, or re-embed stored content",
+    )
+    parser.add_argument(
+        "--finish",
+        metavar="COLLECTION",
+        help="After the gateway switched to --target: copy COLLECTION's writes since --since",
+    )
+    parser.add_argument("--target", help="Collection created by the copy phase (with --finish)")
+    parser.add_argument("--since", help="Copy start time printed by the copy phase")
+    parser.add_argument(
+        "--drop-old", action="store_true", help="Delete the old collection (with --finish)"
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Qdrant Embedding Dimension Migration")
+    print("=" * 60)
+
+    if args.finish:
+        if not (args.target and args.since):
+            parser.error("--finish requires --target and --since")
+        finish(args.alias, args.finish, args.target, args.since, args.mode, args.drop_old)
+        return
+    if not args.dimensions:
+        parser.error("--dimensions is required")
+    if args.drop_old:
+        parser.error("--drop-old only applies to --finish, after the gateway has switched")
+
+    source_name = get_alias_target(args.alias) or args.alias
+    source = get_collection(source_name)
+    source_dims = source["config"]["params"]["vectors"]["size"]
+    if args.mode == "truncate" and args.dimensions > source_dims:
+        print(f"✗ Cannot truncate {source_dims}-dim vectors to {args.dimensions} dims")
+        sys.exit(1)
+
+    base = args.alias[: -len("_live")] if args.alias.endswith("_live") else args.alias
+    target = f"{base}_d{args.dimensions}_{int(time.time())}"
+    print(f"\n[1/3] {source_name} ({source_dims} dims) -> {target} ({args.dimensions} dims)")
+    create_target(target, source, args.dimensions)
+
+    print(f"\n[2/3] Copying points ({args.mode})...")
+    started = datetime.utcnow().isoformat()
+    copied = copy_points(source_name, target, args.dimensions, args.mode)
+    print(f"✓ Copied {copied} points")
+
+    print("\n[3/3] Catching up on points written during the copy...")
+    caught_up = copy_points(source_name, target, args.dimensions, args.mode, since=started)
+    print(f"✓ Re-copied {caught_up} recent points")
+
+    # The gateway keeps writing to the source until it is switched
+    print(
+        f"\nNext: set QDRANT_COLLECTION={target} and EMBEDDING_DIMENSIONS={args.dimensions} "
+        "for the memory gateway and restart it, then run:"
+    )
+    print(
+        f"  python migrate_dimensions.py --alias {args.alias} --finish {source_name} "
+        f"--target {target} --since {started} --mode {args.mode} [--drop-old]"
+    )
+
+
+if __name__ == "__main__":
+    main()
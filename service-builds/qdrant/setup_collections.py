@@ -2,21 +2,39 @@
 """
 Qdrant Collections Setup
 Purpose: Initialize vector collections for Planner & Memory Architecture
-Vector Size: 1536 (OpenAI ada-002 compatible)
+Vector Size: 1536 (OpenAI ada-002 compatible), or EMBEDDING_DIMENSIONS if set
 Created: 2025-12-02
+
+Usage:
+    python setup_collections.py                                  # float32 vectors in RAM
+    python setup_collections.py --quantization scalar --on-disk  # int8 in RAM, originals on disk
+    python setup_collections.py --quantization binary --on-disk --migrate  # convert existing
 """
 
+import argparse
+import os
 import requests
 import json
 import time
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Configuration
 QDRANT_URL = "http://localhost:6333"
-VECTOR_SIZE = 1536
+# Shortened text-embedding-3 vectors (e.g. 512) must match the gateway's EMBEDDING_DIMENSIONS
+VECTOR_SIZE = int(os.environ.get("EMBEDDING_DIMENSIONS") or 1536)
 TIMEOUT = 30
 
+# Quantization presets. Quantized vectors stay in RAM (always_ram) and are used
+# for HNSW traversal; the float32 originals are used to rescore the top hits.
+QUANTIZATION_CONFIGS = {
+    "none": None,
+    # int8: 4x smaller, ~1% recall loss before rescoring
+    "scalar": {"scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}},
+    # 1 bit per dimension: 32x smaller; suited to high-dim OpenAI embeddings
+    "binary": {"binary": {"always_ram": True}},
+}
+
 # Collections to create
 COLLECTIONS = {
     "doc_chunks": {
@@ -31,6 +49,12 @@ COLLECTIONS = {
         "vectors_config": {
             "size": VECTOR_SIZE,
             "distance": "Cosine"
+        },
+        # Fields the memory gateway filters recall on
+        "payload_indexes": {
+            "client_id": {"type": "integer", "lookup": True, "range": False},
+            "memory_type": "keyword",
+            "timestamp": "datetime"
         }
     },
     "agent_memories": {
@@ -65,14 +89,63 @@ def check_qdrant_health() -> bool:
         return False
 
 
-def create_collection(collection_name: str, config: Dict[str, Any]) -> bool:
-    """Create a single collection"""
+def get_alias_target(alias_name: str) -> Optional[str]:
+    """Return the collection an alias points to (None if it is not an alias)"""
+    response = requests.get(f"{QDRANT_URL}/aliases", timeout=TIMEOUT)
+    response.raise_for_status()
+    for alias in response.json()["result"]["aliases"]:
+        if alias["alias_name"] == alias_name:
+            return alias["collection_name"]
+    return None
+
+
+def collection_exists(collection_name: str) -> bool:
+    """Check whether a collection (or an alias of that name) already exists"""
     try:
+        response = requests.get(f"{QDRANT_URL}/collections/{collection_name}", timeout=TIMEOUT)
+        return response.status_code == 200 or get_alias_target(collection_name) is not None
+    except Exception:
+        return False
+
+
+def storage_config(
+    config: Dict[str, Any],
+    quantization: str = "none",
+    on_disk: bool = False,
+) -> Dict[str, Any]:
+    """Collection body: vector params plus optional quantization / on-disk originals"""
+    payload = {
+        "vectors": {**config["vectors_config"], "on_disk": on_disk}
+    }
+    if QUANTIZATION_CONFIGS[quantization]:
+        payload["quantization_config"] = QUANTIZATION_CONFIGS[quantization]
+    return payload
+
+
+def create_collection(
+    collection_name: str,
+    config: Dict[str, Any],
+    quantization: str = "none",
+    on_disk: bool = False,
+    migrate: bool = False,
+) -> bool:
+    """
+    Create a single collection
+
+    Existing collections are left as they are, unless migrate is set, in
+    which case their storage is switched to the requested quantization /
+    on-disk settings in place (Qdrant rebuilds segments in the background).
+    """
+    try:
+        if collection_exists(collection_name):
+            if migrate:
+                return migrate_collection(collection_name, quantization, on_disk)
+            print(f"✓ Collection '{collection_name}' already exists")
+            return True
+
         # Create collection
         url = f"{QDRANT_URL}/collections/{collection_name}"
-        payload = {
-            "vectors": config["vectors_config"]
-        }
+        payload = storage_config(config, quantization, on_disk)
 
         response = requests.put(url, json=payload, timeout=TIMEOUT)
 
@@ -89,6 +162,56 @@ def create_collection(collection_name: str, config: Dict[str, Any]) -> bool:
         return False
 
 
+def migrate_collection(collection_name: str, quantization: str, on_disk: bool) -> bool:
+    """Update an existing collection's vector storage and quantization in place"""
+    try:
+        # "" addresses the collection's default (unnamed) vector
+        payload: Dict[str, Any] = {"vectors": {"": {"on_disk": on_disk}}}
+        if QUANTIZATION_CONFIGS[quantization]:
+            payload["quantization_config"] = QUANTIZATION_CONFIGS[quantization]
+        else:
+            payload["quantization_config"] = "Disabled"
+
+        response = requests.patch(
+            f"{QDRANT_URL}/collections/{collection_name}", json=payload, timeout=TIMEOUT
+        )
+        if response.status_code == 200:
+            print(
+                f"✓ Collection '{collection_name}' migrated "
+                f"(quantization={quantization}, on_disk={on_disk})"
+            )
+            return True
+        print(f"✗ Failed to migrate '{collection_name}': {response.status_code}")
+        print(f"  Response: {response.text}")
+        return False
+    except Exception as e:
+        print(f"✗ Error migrating collection '{collection_name}': {e}")
+        return False
+
+
+def create_payload_indexes(collection_name: str, indexes: Dict[str, Any]) -> bool:
+    """Create payload indexes (idempotent: existing indexes are kept)"""
+    success = True
+    for field_name, field_schema in indexes.items():
+        try:
+            response = requests.put(
+                f"{QDRANT_URL}/collections/{collection_name}/index",
+                params={"wait": "true"},
+                json={"field_name": field_name, "field_schema": field_schema},
+                timeout=TIMEOUT,
+            )
+            if response.status_code in [200, 201]:
+                print(f"✓ Payload index '{collection_name}.{field_name}' ready")
+            else:
+                print(f"✗ Failed to index '{collection_name}.{field_name}': {response.status_code}")
+                print(f"  Response: {response.text}")
+                success = False
+        except Exception as e:
+            print(f"✗ Error indexing '{collection_name}.{field_name}': {e}")
+            success = False
+    return success
+
+
 def list_collections() -> Dict[str, Any]:
     """List all collections"""
     try:
@@ -103,8 +226,30 @@ def list_collections() -> Dict[str, Any]:
         return {}
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create Qdrant collections")
+    parser.add_argument(
+        "--quantization",
+        choices=sorted(QUANTIZATION_CONFIGS),
+        default="none",
+        help="Quantize vectors in RAM (searches rescore against the originals)",
+    )
+    parser.add_argument(
+        "--on-disk",
+        action="store_true",
+        help="Keep original float32 vectors on disk (mmap) instead of RAM",
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Apply --quantization/--on-disk to collections that already exist",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main setup function"""
+    args = parse_args()
     print("=" * 60)
     print("Qdrant Collections Setup")
     print("=" * 60)
@@ -123,9 +268,14 @@ def main():
         print(f"    Description: {config['description']}")
         print(f"    Vector size: {config['vectors_config']['size']}")
         print(f"    Distance metric: {config['vectors_config']['distance']}")
+        print(f"    Quantization: {args.quantization} (originals on disk: {args.on_disk})")
 
-        if create_collection(collection_name, config):
+        if create_collection(
+            collection_name, config, args.quantization, args.on_disk, args.migrate
+        ):
             created_count += 1
+            if config.get("payload_indexes"):
+                create_payload_indexes(collection_name, config["payload_indexes"])
 
         # Small delay between creations
         time.sleep(0.5)